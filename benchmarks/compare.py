@@ -0,0 +1,49 @@
+"""
+Compares two JSON files written by the benchmark suite using ``--benchmark-output``.
+
+Usage::
+
+    python -m benchmarks.compare before.json after.json
+"""
+
+import json
+import sys
+
+
+def load_results(path):
+    """
+    Returns the median timing (milliseconds) or retained memory (KiB) per benchmark.
+    """
+    with open(path) as fp:
+        benchmarks = json.load(fp)["benchmarks"]
+
+    return {
+        benchmark["name"]: (
+            benchmark["stats"]["current"] / 1024
+            if benchmark.get("kind") == "memory"
+            else benchmark["stats"]["median"] * 1000
+        )
+        for benchmark in benchmarks
+    }
+
+
+def compare(before_path, after_path):
+    before = load_results(before_path)
+    after = load_results(after_path)
+    names = [name for name in after if name in before]
+    if not names:
+        print("No common benchmarks found.")
+        return
+
+    width = max(len(name) for name in names)
+    print(f"{'name':<{width}} {'before':>10} {'after':>10} {'change':>8}")
+    for name in names:
+        change = (after[name] - before[name]) / before[name] * 100
+        print(f"{name:<{width}} {before[name]:>10.3f} {after[name]:>10.3f} {change:>+7.1f}%")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit(__doc__)
+
+    compare(sys.argv[1], sys.argv[2])
@@ -0,0 +1,202 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import django
+import pytest
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("tapeforms benchmarks")
+    group.addoption(
+        "--benchmark-rounds",
+        type=int,
+        default=5,
+        help="Number of timed rounds per benchmark (default: 5).",
+    )
+    group.addoption(
+        "--benchmark-output",
+        metavar="PATH",
+        default=None,
+        help="Save the benchmark results as JSON to PATH.",
+    )
+
+
+class Benchmark:
+    """
+    Times a callable over a number of rounds, after one untimed warmup round.
+    """
+
+    kind = "time"
+
+    def __init__(self, name, params, rounds):
+        self.name = name
+        self.params = params
+        self.rounds = rounds
+        self.timings = []
+
+    def has_results(self):
+        return bool(self.timings)
+
+    def __call__(self, func, setup=None):
+        """
+        Runs the benchmark.
+
+        :param func: Callable to time, receives the return value of `setup` as
+                     positional arguments.
+        :param setup: Optional callable which is called before every round, not
+                      included in the timings. Returns a tuple of arguments.
+        :return: The return value of the last call of `func`.
+        """
+        args = setup() if setup else ()
+        result = func(*args)
+
+        for _ in range(self.rounds):
+            args = setup() if setup else ()
+            start = time.perf_counter()
+            result = func(*args)
+            self.timings.append(time.perf_counter() - start)
+
+        return result
+
+    def get_stats(self):
+        return {
+            "rounds": len(self.timings),
+            "min": min(self.timings),
+            "max": max(self.timings),
+            "mean": statistics.mean(self.timings),
+            "median": statistics.median(self.timings),
+            "stddev": statistics.stdev(self.timings) if len(self.timings) > 1 else 0.0,
+        }
+
+
+class MemoryBenchmark:
+    """
+    Measures the memory allocated by a callable using ``tracemalloc``.
+    """
+
+    kind = "memory"
+
+    def __init__(self, name, params):
+        self.name = name
+        self.params = params
+        self.stats = None
+
+    def has_results(self):
+        return self.stats is not None
+
+    def __call__(self, func, setup=None):
+        """
+        Runs the benchmark. The memory still allocated when `func` returns is
+        reported as ``current``, the highest allocation during the call as ``peak``.
+
+        :param func: Callable to measure, receives the return value of `setup` as
+                     positional arguments.
+        :param setup: Optional callable which is called before the measurement.
+                      Returns a tuple of arguments.
+        :return: The return value of `func`.
+        """
+        args = setup() if setup else ()
+        tracemalloc.start()
+        try:
+            start, _peak = tracemalloc.get_traced_memory()
+            result = func(*args)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.stats = {"current": current - start, "peak": peak - start}
+        return result
+
+    def get_stats(self):
+        return self.stats
+
+
+def pytest_configure(config):
+    config._tapeforms_benchmarks = []
+
+
+@pytest.fixture
+def bench(request):
+    params = getattr(request.node, "callspec", None)
+    benchmark = Benchmark(
+        request.node.nodeid,
+        dict(params.params) if params else {},
+        request.config.getoption("--benchmark-rounds"),
+    )
+    yield benchmark
+    if benchmark.has_results():
+        request.config._tapeforms_benchmarks.append(benchmark)
+
+
+@pytest.fixture
+def memory(request):
+    params = getattr(request.node, "callspec", None)
+    benchmark = MemoryBenchmark(request.node.nodeid, dict(params.params) if params else {})
+    yield benchmark
+    if benchmark.has_results():
+        request.config._tapeforms_benchmarks.append(benchmark)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    benchmarks = [
+        benchmark for benchmark in config._tapeforms_benchmarks if benchmark.kind == "time"
+    ]
+    if benchmarks:
+        terminalreporter.section("benchmarks (milliseconds)")
+        width = max(len(benchmark.name) for benchmark in benchmarks)
+        terminalreporter.write_line(f"{'name':<{width}} {'min':>10} {'median':>10} {'max':>10}")
+        for benchmark in benchmarks:
+            stats = benchmark.get_stats()
+            terminalreporter.write_line(
+                f"{benchmark.name:<{width}} {stats['min'] * 1000:>10.3f}"
+                f" {stats['median'] * 1000:>10.3f} {stats['max'] * 1000:>10.3f}"
+            )
+
+    benchmarks = [
+        benchmark for benchmark in config._tapeforms_benchmarks if benchmark.kind == "memory"
+    ]
+    if benchmarks:
+        terminalreporter.section("memory benchmarks (KiB)")
+        width = max(len(benchmark.name) for benchmark in benchmarks)
+        terminalreporter.write_line(f"{'name':<{width}} {'current':>10} {'peak':>10}")
+        for benchmark in benchmarks:
+            stats = benchmark.get_stats()
+            terminalreporter.write_line(
+                f"{benchmark.name:<{width}} {stats['current'] / 1024:>10.1f}"
+                f" {stats['peak'] / 1024:>10.1f}"
+            )
+
+
+def pytest_sessionfinish(session):
+    path = session.config.getoption("--benchmark-output")
+    benchmarks = getattr(session.config, "_tapeforms_benchmarks", [])
+    if not path or not benchmarks:
+        return
+
+    with open(path, "w") as fp:
+        json.dump(
+            {
+                "datetime": datetime.now(timezone.utc).isoformat(),
+                "machine_info": {
+                    "python": platform.python_version(),
+                    "implementation": platform.python_implementation(),
+                    "django": django.get_version(),
+                    "platform": platform.platform(),
+                },
+                "benchmarks": [
+                    {
+                        "name": benchmark.name,
+                        "kind": benchmark.kind,
+                        "params": benchmark.params,
+                        "stats": benchmark.get_stats(),
+                    }
+                    for benchmark in benchmarks
+                ],
+            },
+            fp,
+            indent=2,
+        )
@@ -0,0 +1,83 @@
+import functools
+import itertools
+
+from django import forms
+from tapeforms.contrib.bootstrap import Bootstrap4TapeformMixin, Bootstrap5TapeformMixin
+from tapeforms.contrib.foundation import FoundationTapeformMixin
+from tapeforms.fieldsets import TapeformFieldsetsMixin
+from tapeforms.mixins import TapeformMixin
+
+#: Tapeforms mixins of the benchmarked themes.
+THEMES = {
+    "default": TapeformMixin,
+    "bootstrap4": Bootstrap4TapeformMixin,
+    "bootstrap5": Bootstrap5TapeformMixin,
+    "foundation": FoundationTapeformMixin,
+}
+
+#: Number of fields of the benchmarked forms.
+SIZES = (10, 100, 1000)
+
+#: Number of fieldsets the fields of the benchmarked forms are split into.
+FIELDSETS = 5
+
+CHOICES = (("foo", "Foo"), ("bar", "Bar"), ("baz", "Baz"))
+
+#: Field factories and invalid values, the fields of the forms cycle through them.
+FIELD_TYPES = (
+    (forms.CharField, "", {}),
+    (forms.IntegerField, "abc", {}),
+    (forms.EmailField, "invalid", {}),
+    (forms.DateField, "invalid", {}),
+    (forms.BooleanField, "", {}),
+    (forms.ChoiceField, "invalid", {"choices": CHOICES}),
+    (forms.MultipleChoiceField, "invalid", {"choices": CHOICES}),
+    (forms.CharField, "", {"widget": forms.Textarea}),
+    (forms.ChoiceField, "invalid", {"choices": CHOICES, "widget": forms.RadioSelect}),
+    (forms.SplitDateTimeField, "invalid", {}),
+)
+
+
+def field_types(size):
+    return itertools.islice(itertools.cycle(FIELD_TYPES), size)
+
+
+@functools.lru_cache(maxsize=None)
+def get_form_class(theme, size):
+    """
+    Returns a form class of the theme with the given number of fields, which are
+    split into fieldsets with two fields per row.
+    """
+    attrs = {
+        f"field_{index}": field_class(**kwargs)
+        for index, (field_class, _value, kwargs) in enumerate(field_types(size))
+    }
+
+    names = list(attrs)
+    chunk = max(size // FIELDSETS, 1)
+    attrs["fieldsets"] = [
+        {
+            "fields": [tuple(names[row : row + 2]) for row in range(start, start + chunk, 2)],
+            "title": f"Fieldset {start // chunk}",
+        }
+        for start in range(0, size, chunk)
+    ]
+
+    return type(
+        f"{theme.title()}{size}Form",
+        (TapeformFieldsetsMixin, THEMES[theme], forms.Form),
+        attrs,
+    )
+
+
+def get_invalid_data(size):
+    """
+    Returns form data which makes every field of a form of the given size invalid.
+    """
+    data = {}
+    for index, (field_class, value, _kwargs) in enumerate(field_types(size)):
+        if field_class is forms.SplitDateTimeField:
+            data[f"field_{index}_0"] = data[f"field_{index}_1"] = value
+        else:
+            data[f"field_{index}"] = value
+    return data
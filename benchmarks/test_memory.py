@@ -0,0 +1,49 @@
+import pytest
+from tapeforms.fieldsets import TapeformFieldset
+from tapeforms.mixins import TapeformLayoutMixin
+
+from .forms import SIZES, get_form_class
+
+
+def make_dict_fieldset_class():
+    """
+    Returns a copy of `TapeformFieldset` which stores its attributes in a
+    ``__dict__`` like fieldsets did before using ``__slots__``. A subclass of the
+    slotted class would still store the attributes in slots.
+    """
+    excluded = {"__slots__", "__dict__", "__weakref__", *TapeformFieldset.__slots__}
+    namespace = {
+        name: value for name, value in vars(TapeformFieldset).items() if name not in excluded
+    }
+    namespace["__qualname__"] = "DictTapeformFieldset"
+    return type("DictTapeformFieldset", (TapeformLayoutMixin,), namespace)
+
+
+DictTapeformFieldset = make_dict_fieldset_class()
+
+
+FIELDSET_CLASSES = {"slots": TapeformFieldset, "dict": DictTapeformFieldset}
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("fieldset_class", FIELDSET_CLASSES)
+def test_fieldsets(memory, fieldset_class, size):
+    """
+    Memory retained by fieldsets (and their resolved rows), one fieldset per 10 fields.
+    """
+    form = get_form_class("default", size)()
+    names = list(form.fields)
+
+    def create_fieldsets():
+        fieldsets = [
+            FIELDSET_CLASSES[fieldset_class](form, fields=names[start : start + 10])
+            for start in range(0, size, 10)
+        ]
+        for fieldset in fieldsets:
+            fieldset.visible_fields()
+        return fieldsets
+
+    # Resolve the layouts and bound fields first, they are shared/cached.
+    create_fieldsets()
+    fieldsets = memory(create_fieldsets)
+    assert len(fieldsets) == size // 10
@@ -0,0 +1,52 @@
+import pytest
+from django.template import Context
+from tapeforms.templatetags.tapeforms import formfield
+
+from .forms import SIZES, THEMES, get_form_class, get_invalid_data
+
+pytestmark = [
+    pytest.mark.parametrize("size", SIZES),
+    pytest.mark.parametrize("theme", THEMES),
+]
+
+
+def test_init(bench, theme, size):
+    form_class = get_form_class(theme, size)
+    form = bench(form_class)
+    assert len(form.fields) == size
+
+
+def test_full_clean_invalid(bench, theme, size):
+    form_class = get_form_class(theme, size)
+    data = get_invalid_data(size)
+    form = bench(lambda form: form.full_clean() or form, setup=lambda: (form_class(data),))
+    assert len(form.errors) == size
+
+
+def test_as_tapeform(bench, theme, size):
+    form_class = get_form_class(theme, size)
+    html = bench(lambda form: form.as_tapeform(), setup=lambda: (form_class(),))
+    assert 'name="field_0"' in html
+
+
+def test_as_tapeform_invalid(bench, theme, size):
+    form_class = get_form_class(theme, size)
+    data = get_invalid_data(size)
+    html = bench(lambda form: form.as_tapeform(), setup=lambda: (form_class(data),))
+    assert 'name="field_0"' in html
+
+
+def test_formfield_tag(bench, theme, size):
+    form = get_form_class(theme, size)()
+    fields = [form[name] for name in form.fields]
+    html = bench(lambda: [formfield(Context(), field) for field in fields])
+    assert len(html) == size
+
+
+def test_get_fieldsets(bench, theme, size):
+    form_class = get_form_class(theme, size)
+    rows = bench(
+        lambda form: [fieldset.visible_fields() for fieldset in form.get_fieldsets()],
+        setup=lambda: (form_class(),),
+    )
+    assert sum(len(row) for fieldset in rows for row in fieldset) == size
@@ -0,0 +1,29 @@
+import pytest
+from django import forms
+from tapeforms import widgets
+
+#: Number of options and selected values of the benchmarked widgets.
+OPTIONS = 5000
+SELECTED = 500
+
+WIDGETS = {
+    "django-select": forms.SelectMultiple,
+    "tapeforms-select": widgets.SelectMultiple,
+    "django-checkbox": forms.CheckboxSelectMultiple,
+    "tapeforms-checkbox": widgets.CheckboxSelectMultiple,
+}
+
+
+@pytest.mark.parametrize("widget", WIDGETS)
+def test_render_choices(bench, widget):
+    choices = [(str(index), f"Option {index}") for index in range(OPTIONS)]
+    value = [str(index) for index in range(0, OPTIONS, OPTIONS // SELECTED)]
+    html = bench(WIDGETS[widget](choices=choices).render, setup=lambda: ("field", value))
+    assert html.count("selected" if "select" in widget else "checked") == SELECTED
+
+
+@pytest.mark.parametrize("widget", ["django-select", "tapeforms-select"])
+def test_render_static_choices(bench, widget):
+    choices = [(f"C{index}", f"Country {index}") for index in range(250)]
+    html = bench(lambda: WIDGETS[widget](choices=list(choices)).render("country", "C42"))
+    assert html.count("selected") == 1
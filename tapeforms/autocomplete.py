@@ -0,0 +1,304 @@
+import copy
+import threading
+from bisect import bisect_left
+
+from django import forms
+from django.core.exceptions import PermissionDenied
+from django.db.models import QuerySet
+from django.http import Http404, JsonResponse
+from django.urls import reverse
+from django.utils.translation import get_language
+from django.views import View
+
+from . import defaults
+from .choices import get_queryset_version
+from .widgets import IndexedChoiceWidgetMixin
+
+#: Registered autocomplete sources by name, see `register_autocomplete_source`.
+autocomplete_sources = {}
+
+
+def normalize_search(text):
+    """
+    Returns the normalized version of a label or search query used for matching.
+    """
+    return " ".join(str(text).casefold().split())
+
+
+def flatten_choices(choices):
+    """
+    Yields the value and label of all choices, including the choices of groups.
+    Choices with an empty value are skipped.
+    """
+    for value, label in choices:
+        if isinstance(label, (list, tuple)):
+            yield from flatten_choices(label)
+        elif value not in (None, ""):
+            yield value, label
+
+
+class PrefixIndex:
+    """
+    In-memory index of choices to answer prefix queries. The labels of the choices
+    are stored in a sorted array once for every word of the label, a query is
+    answered using binary search. This way, "kingdom" matches "United Kingdom".
+    """
+
+    __slots__ = ("keys", "entries", "labels")
+
+    def __init__(self, choices):
+        entries = []
+        #: Labels of the choices by their value (as ``str``).
+        self.labels = {}
+        for value, label in flatten_choices(choices):
+            value, label = str(value), str(label)
+            self.labels[value] = label
+
+            words = normalize_search(label).split(" ")
+            for index in range(len(words)):
+                entries.append((" ".join(words[index:]), value, label))
+
+        entries.sort()
+        self.keys = [entry[0] for entry in entries]
+        self.entries = entries
+
+    def __len__(self):
+        return len(self.labels)
+
+    def search(self, query, limit=None):
+        """
+        Returns the choices with a label (or a word of the label) starting with the
+        query. The choices are ordered by the matched part of the label (starting at
+        the matching word, e.g. "kingdom" for "United Kingdom"), not by the label.
+
+        :param query: The search query.
+        :param limit: Maximum number of choices to return, `None` for all.
+        :return: List of ``(value, label)`` tuples.
+        """
+        query = normalize_search(query)
+        if not query:
+            return []
+
+        results = {}
+        for index in range(bisect_left(self.keys, query), len(self.keys)):
+            key, value, label = self.entries[index]
+            if not key.startswith(query):
+                break
+
+            results.setdefault(value, label)
+            if limit is not None and len(results) >= limit:
+                break
+
+        return list(results.items())
+
+
+class AutocompleteSource:
+    """
+    A named source of choices for autocomplete widgets. The choices are a ``list``,
+    a callable returning the choices or a queryset (using the primary key as value
+    and ``str`` of the object as label).
+
+    The prefix index is built on first use (per language) and rebuilt after
+    `invalidate` is called. Indexes of querysets are rebuilt when an instance of
+    a model used in the queryset is saved or deleted.
+
+    The `AutocompleteView` only answers requests which pass `has_permission`, see
+    the ``permission`` and ``allow_anonymous`` arguments. Without either, every
+    request is denied.
+    """
+
+    def __init__(self, name, choices, permission=None, allow_anonymous=False):
+        self.name = name
+        self.choices = choices
+        self.permission = permission
+        self.allow_anonymous = allow_anonymous
+        self.version = 0
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def get_version(self):
+        if isinstance(self.choices, QuerySet):
+            return self.version, get_queryset_version(self.choices)
+        return self.version
+
+    def get_choices(self):
+        if isinstance(self.choices, QuerySet):
+            return [(obj.pk, str(obj)) for obj in self.choices.all()]
+        if callable(self.choices):
+            return self.choices()
+        return self.choices
+
+    def get_index(self):
+        """
+        Returns the `PrefixIndex` of the choices for the active language.
+        """
+        language = get_language()
+        version = self.get_version()
+        cached = self._indexes.get(language)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        with self._lock:
+            index = PrefixIndex(self.get_choices())
+            self._indexes[language] = (version, index)
+
+        return index
+
+    def invalidate(self):
+        """
+        Rebuilds the prefix index on next use, e.g. after the choices changed.
+        """
+        with self._lock:
+            self.version += 1
+            self._indexes.clear()
+
+    def search(self, query, limit=None):
+        return self.get_index().search(query, limit)
+
+    def has_permission(self, request):
+        """
+        Returns `True` if the request may query the source. If ``allow_anonymous``
+        is set, every request may query it. Otherwise, a permission as ``str`` is
+        checked using ``request.user.has_perm``, a callable is called with the
+        request. Without a ``permission``, every request is denied.
+        """
+        if self.allow_anonymous:
+            return True
+
+        if self.permission is None:
+            return False
+
+        if isinstance(self.permission, str):
+            user = getattr(request, "user", None)
+            return user is not None and user.has_perm(self.permission)
+
+        return self.permission(request)
+
+
+def register_autocomplete_source(name, choices, permission=None, allow_anonymous=False):
+    """
+    Registers the choices for autocomplete widgets and the `AutocompleteView`
+    under the passed name.
+
+    :param name: Name of the source, used in the URL of the `AutocompleteView`.
+    :param choices: Choices as ``list``, a callable returning the choices or a queryset.
+    :param permission: Permission name (like ``"app.view_model"``) the user needs or
+                       a callable which takes the request and returns `True` if the
+                       request may query the source.
+    :param allow_anonymous: If `True`, every request (including anonymous users) may
+                            query the source. Either ``permission`` or
+                            ``allow_anonymous`` is required, otherwise every request
+                            is denied.
+    :return: `AutocompleteSource` instance.
+    """
+    source = autocomplete_sources[name] = AutocompleteSource(
+        name, choices, permission, allow_anonymous
+    )
+    return source
+
+
+def get_autocomplete_source(name):
+    """
+    Returns the `AutocompleteSource` registered under the passed name.
+
+    :raises KeyError: If no source is registered under the name.
+    """
+    return autocomplete_sources[name]
+
+
+class AutocompleteSelect(IndexedChoiceWidgetMixin, forms.Select):
+    """
+    Select widget which only renders the selected options. Other options are loaded
+    from the `AutocompleteView` while typing into a search input (see
+    ``tapeforms/autocomplete.js``). The labels of the selected options are taken
+    from the prefix index of the autocomplete source.
+    """
+
+    template_name = "tapeforms/widgets/autocomplete.html"
+
+    #: Minimum length of the search query before the choices are loaded.
+    min_length = 1
+
+    class Media:
+        js = ("tapeforms/autocomplete.js",)
+
+    def __init__(self, source, url=None, attrs=None, choices=()):
+        super().__init__(attrs=attrs, choices=choices)
+        self.source = source
+        self.url = url
+
+    def get_source(self):
+        return get_autocomplete_source(self.source)
+
+    def get_url(self):
+        """
+        Returns the URL of the `AutocompleteView` serving the choices, the URL named
+        `defaults.AUTOCOMPLETE_URL_NAME` is used if no URL is passed to the widget.
+        """
+        if self.url:
+            return self.url
+
+        return reverse(defaults.AUTOCOMPLETE_URL_NAME, kwargs={"source": self.source})
+
+    def optgroups(self, name, value, attrs=None):
+        labels = self.get_source().get_index().labels
+        widget = copy.copy(self)
+        widget.choices = [(option, labels[option]) for option in value if option in labels]
+        if not self.is_required and not self.allow_multiple_selected:
+            widget.choices.insert(0, ("", ""))
+
+        return super(AutocompleteSelect, widget).optgroups(name, value, attrs)
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"]["autocomplete_url"] = self.get_url()
+        context["widget"]["min_length"] = self.min_length
+        return context
+
+
+class AutocompleteSelectMultiple(AutocompleteSelect, forms.SelectMultiple):
+    """
+    Multiple select version of the `AutocompleteSelect` widget.
+    """
+
+
+class AutocompleteView(View):
+    """
+    View which answers prefix queries of autocomplete widgets using the prefix
+    index of an `AutocompleteSource`. The name of the source is taken from the
+    ``source`` URL argument (or the `source` property), the query from the ``q``
+    GET parameter.
+
+    The response is JSON: ``{"results": [{"id": "<value>", "text": "<label>"}]}``
+
+    Requests which don't pass `has_permission` are denied (status 403).
+    """
+
+    #: Name of the source to query if the URL doesn't contain a source.
+    source = None
+    #: Maximum number of returned choices.
+    limit = 20
+
+    def get(self, request, source=None):
+        try:
+            source = get_autocomplete_source(source or self.source)
+        except KeyError:
+            raise Http404("Unknown autocomplete source.") from None
+
+        if not self.has_permission(request, source):
+            raise PermissionDenied
+
+        results = source.search(request.GET.get("q", ""), self.limit)
+        return JsonResponse(
+            {"results": [{"id": value, "text": label} for value, label in results]}
+        )
+
+    def has_permission(self, request, source):
+        """
+        Returns `True` if the request may query the source. By default, the
+        permission of the source is checked (see `AutocompleteSource.has_permission`).
+
+        :param request: The current request.
+        :param source: `AutocompleteSource` instance.
+        """
+        return source.has_permission(request)
@@ -0,0 +1,64 @@
+from functools import lru_cache
+
+from django.forms.boundfield import BoundField
+from django.utils.functional import cached_property
+
+
+class TapeformBoundFieldMixin:
+    """
+    Mixin for bound fields used by forms using `TapeformMixin`. The attributes
+    returned by `get_widget_invalid_attrs` are added when rendering the widget of an
+    invalid field. If `lazy_init_tapeforms` is enabled, widget options, templates
+    and CSS classes are applied to the field the first time the widget is rendered.
+    """
+
+    def as_widget(self, *args, **kwargs):
+        self.form.ensure_tapeforms_field(self.name)
+        return super().as_widget(*args, **kwargs)
+
+    @cached_property
+    def subwidgets(self):
+        self.form.ensure_tapeforms_field(self.name)
+        return super().subwidgets
+
+    def build_widget_attrs(self, attrs, widget=None):
+        attrs = super().build_widget_attrs(attrs, widget)
+        # Like Django's aria-describedby, the invalid attributes are only added to
+        # the visible widget of the field (e.g. not to the hidden initial input).
+        if (widget is None or widget is self.field.widget) and not self.field.widget.is_hidden:
+            if self.errors:
+                widget_attrs = {**self.field.widget.attrs, **attrs}
+                attrs.update(
+                    self.form.get_widget_invalid_attrs(self.name, self.field, widget_attrs)
+                )
+        return attrs
+
+
+class TapeformBoundField(TapeformBoundFieldMixin, BoundField):
+    """
+    Bound field used by forms using `TapeformMixin` for fields with the default
+    bound field class.
+    """
+
+
+@lru_cache(maxsize=None)
+def get_tapeform_bound_field_class(bound_field_class):
+    """
+    Returns the bound field class to use for fields configured with the passed
+    bound field class (e.g. using ``bound_field_class`` of the field or form). For
+    custom classes, a subclass with `TapeformBoundFieldMixin` is created once.
+
+    :param bound_field_class: The configured bound field class.
+    :return: A bound field class using `TapeformBoundFieldMixin`.
+    """
+    if bound_field_class is BoundField:
+        return TapeformBoundField
+
+    if issubclass(bound_field_class, TapeformBoundFieldMixin):
+        return bound_field_class
+
+    return type(
+        f"Tapeform{bound_field_class.__name__}",
+        (TapeformBoundFieldMixin, bound_field_class),
+        {"__module__": bound_field_class.__module__},
+    )
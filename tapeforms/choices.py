@@ -0,0 +1,282 @@
+import asyncio
+import itertools
+import threading
+import time
+
+from asgiref.local import Local
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.core.signals import request_finished, request_started, setting_changed
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.forms.models import ModelChoiceField, ModelChoiceIterator
+from django.utils.translation import get_language
+
+from . import defaults
+from .utils import LRUCache
+
+#: The in-process choice cache.
+choice_cache = LRUCache(defaults.CHOICE_CACHE_SIZE, setting="TAPEFORMS_CHOICE_CACHE_SIZE")
+
+#: Versions of the database tables, bumped when a model instance is saved or deleted.
+_table_versions = {}
+
+#: Database tables with connected receivers to bump their versions.
+_watched_tables = set()
+_watch_lock = threading.Lock()
+
+#: Generation of the current request, used to scope cached choices to a request.
+_request_state = Local()
+_request_generations = itertools.count(1)
+
+
+def bump_table_version(model):
+    """
+    Invalidates the cached choices which depend on the database table of the passed
+    model (and the tables of its parent models).
+    """
+    for klass in (model, *model._meta.get_parent_list()):
+        table = klass._meta.db_table
+        _table_versions[table] = _table_versions.get(table, 0) + 1
+
+
+def watch_tables(tables):
+    """
+    Connects the receivers which bump the table versions to the signals of the
+    models using the passed database tables (including child and proxy models).
+    Receivers are only connected for the models of cached querysets, this way other
+    models keep Django's fast delete and don't pay for a receiver on every save.
+    """
+    if _watched_tables.issuperset(tables):
+        return
+
+    with _watch_lock:
+        new_tables = set(tables) - _watched_tables
+        if not new_tables:
+            return
+
+        for model in apps.get_models(include_auto_created=True):
+            if any(
+                klass._meta.db_table in new_tables
+                for klass in (model, *model._meta.get_parent_list())
+            ):
+                post_save.connect(bump_table_version_on_change, sender=model)
+                post_delete.connect(bump_table_version_on_change, sender=model)
+                m2m_changed.connect(bump_table_version_on_m2m_change, sender=model)
+
+        _watched_tables.update(new_tables)
+
+
+def get_queryset_version(queryset):
+    """
+    Returns the versions of all database tables the passed queryset depends on.
+    From now on, the versions of the tables are bumped when an instance of a model
+    using one of the tables is saved or deleted (see `watch_tables`).
+    """
+    tables = {queryset.model._meta.db_table}
+    tables.update(join.table_name for join in queryset.query.alias_map.values())
+    watch_tables(tables)
+    return tuple(sorted((table, _table_versions.get(table, 0)) for table in tables))
+
+
+def get_choice_cache_timeout():
+    """
+    Returns the number of seconds to keep cached choices. If `None`, the choices
+    are cached until the current request is finished.
+    """
+    return getattr(settings, "TAPEFORMS_CHOICE_CACHE_TIMEOUT", defaults.CHOICE_CACHE_TIMEOUT)
+
+
+def get_choice_field_key(field):
+    """
+    Returns the values which identify the choices of a model choice field: the field
+    class, database, SQL query, table versions, ``to_field_name``, empty label and
+    active language. Returns `None` if the field has no (or an empty) queryset or
+    uses an instance specific ``label_from_instance`` function.
+
+    :param field: `ModelChoiceField` instance.
+    :return: Key as a ``tuple`` or `None`.
+    """
+    queryset = field.queryset
+    if queryset is None or "label_from_instance" in field.__dict__:
+        return None
+
+    try:
+        query = str(queryset.query)
+    except EmptyResultSet:
+        return None
+
+    return (
+        field.__class__,
+        queryset.db,
+        query,
+        get_queryset_version(queryset),
+        field.to_field_name,
+        str(field.empty_label) if field.empty_label is not None else None,
+        get_language(),
+    )
+
+
+def make_choice_key(field):
+    """
+    Returns the key to cache the choices of a model choice field or `None` if the
+    choices can't be cached. Choices are only cached during a request or if a
+    timeout is configured and if the field doesn't use an instance specific
+    ``label_from_instance`` function.
+
+    :param field: `ModelChoiceField` instance.
+    :return: Cache key as a ``tuple`` or `None`.
+    """
+    generation = None
+    if get_choice_cache_timeout() is None:
+        generation = getattr(_request_state, "generation", None)
+        if generation is None:
+            return None
+
+    field_key = get_choice_field_key(field)
+    if field_key is None:
+        return None
+
+    return (generation, *field_key)
+
+
+def get_cached_choices(cache_key, evaluate):
+    """
+    Returns the cached choices for the cache key or evaluates and caches them.
+
+    :param cache_key: Cache key of the choices, no caching happens if `None`.
+    :param evaluate: Callable without arguments which returns the choices as a list.
+    :return: List of choices.
+    """
+    if cache_key is None:
+        return evaluate()
+
+    cached = choice_cache.get(cache_key)
+    if cached is not None and (cached[0] is None or cached[0] > time.monotonic()):
+        return cached[1]
+
+    choices = evaluate()
+    set_cached_choices(cache_key, choices)
+    return choices
+
+
+def set_cached_choices(cache_key, choices):
+    """
+    Stores the choices for the cache key, using the configured timeout.
+    """
+    timeout = get_choice_cache_timeout()
+    expires = None if timeout is None else time.monotonic() + timeout
+    choice_cache.set(cache_key, (expires, choices))
+
+
+class CachedModelChoiceIterator(ModelChoiceIterator):
+    """
+    Model choice iterator which shares the evaluated choices with all fields using
+    the same queryset (e.g. the forms of a formset or repeated renders of a form).
+    See `make_choice_key` for the rules.
+    """
+
+    def get_choices(self):
+        return get_cached_choices(make_choice_key(self.field), self.evaluate)
+
+    def evaluate(self):
+        return list(super().__iter__())
+
+    def __iter__(self):
+        return iter(self.get_choices())
+
+    def __len__(self):
+        return len(self.get_choices())
+
+    def __bool__(self):
+        return bool(self.get_choices())
+
+
+def apply_choice_cache(field):
+    """
+    Makes the passed model choice field use the `CachedModelChoiceIterator` and
+    updates the choices of the widget. Fields with a custom iterator are skipped.
+
+    :param field: `ModelChoiceField` instance.
+    """
+    if field.iterator is not ModelChoiceIterator:
+        return
+
+    field.iterator = CachedModelChoiceIterator
+    field.widget.choices = field.choices
+
+
+async def aevaluate_choices(field):
+    """
+    Evaluates the choices of a model choice field using the async ORM.
+
+    :param field: `ModelChoiceField` instance.
+    :return: List of choices, the same as returned by the iterator of the field.
+    """
+    iterator = field.iterator(field)
+    choices = []
+    if field.empty_label is not None:
+        choices.append(("", field.empty_label))
+
+    async for obj in field.queryset.all():
+        choices.append(iterator.choice(obj))
+
+    return choices
+
+
+async def aprefetch_model_choices(fields):
+    """
+    Evaluates the querysets of the passed model choice fields in a batch using the
+    async ORM and sets the evaluated choices on the widgets. This way, rendering the
+    fields doesn't run any queries. Fields with the same choices (e.g. of the forms
+    of a formset) share a single query. The choices are stored in the `choice_cache`
+    too.
+
+    The async ORM runs the queries one after another in the thread of the database
+    connection, so the queries are batched and deduplicated but not run in parallel.
+
+    Other fields are skipped.
+
+    :param fields: Iterable of form fields.
+    """
+    groups = {}
+    for field in fields:
+        if not isinstance(field, ModelChoiceField) or field.queryset is None:
+            continue
+
+        field_key = get_choice_field_key(field)
+        groups.setdefault(id(field) if field_key is None else field_key, []).append(field)
+
+    results = await asyncio.gather(*(aevaluate_choices(group[0]) for group in groups.values()))
+    for group, choices in zip(groups.values(), results):
+        for field in group:
+            field.widget.choices = choices
+
+        cache_key = make_choice_key(group[0])
+        if cache_key is not None:
+            set_cached_choices(cache_key, choices)
+
+
+@receiver(request_started)
+def start_choice_cache_generation(**kwargs):
+    _request_state.generation = next(_request_generations)
+
+
+@receiver(request_finished)
+def finish_choice_cache_generation(**kwargs):
+    _request_state.generation = None
+
+
+def bump_table_version_on_change(sender, **kwargs):
+    bump_table_version(sender)
+
+
+def bump_table_version_on_m2m_change(sender, **kwargs):
+    bump_table_version(sender)
+
+
+@receiver(setting_changed)
+def clear_choice_cache_on_setting_change(setting, **kwargs):
+    if setting in ("TAPEFORMS_CHOICE_CACHE_SIZE", "TAPEFORMS_CHOICE_CACHE_TIMEOUT"):
+        choice_cache.clear()
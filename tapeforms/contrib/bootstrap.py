@@ -1,10 +1,13 @@
 from django import forms
 
+from ..autocomplete import AutocompleteSelect
 from ..fieldsets import TapeformFieldset
 from ..mixins import TapeformMixin
 
 
 class BootstrapTapeformFieldset(TapeformFieldset):
+    __slots__ = ()
+
     layout_template = "tapeforms/fieldsets/bootstrap.html"
 
 
@@ -29,52 +32,25 @@ class Bootstrap4TapeformMixin(TapeformMixin):
     widget_template_overrides = {
         forms.SelectDateWidget: "tapeforms/widgets/bootstrap_multiwidget.html",
         forms.SplitDateTimeWidget: "tapeforms/widgets/bootstrap_multiwidget.html",
+        forms.SplitHiddenDateTimeWidget: None,
         forms.RadioSelect: "tapeforms/widgets/bootstrap_multipleinput.html",
         forms.CheckboxSelectMultiple: "tapeforms/widgets/bootstrap_multipleinput.html",
+        AutocompleteSelect: "tapeforms/widgets/bootstrap_autocomplete.html",
     }
 
-    fieldset_class = BootstrapTapeformFieldset
-
-    def get_field_container_css_class(self, bound_field):
-        """
-        Returns "form-check" if widget is CheckboxInput in addition of the
-        default value from the form property ("form-group") - which is returned
-        for all other fields.
-        """
-        class_name = super().get_field_container_css_class(bound_field)
-
-        if isinstance(bound_field.field.widget, forms.CheckboxInput):
-            class_name += " form-check"
-
-        return class_name
-
-    def get_field_label_css_class(self, bound_field):
-        """
-        Returns "form-check-label" if widget is CheckboxInput. For all other fields,
-        no CSS class is added.
-        """
-        if isinstance(bound_field.field.widget, forms.CheckboxInput):
-            return "form-check-label"
-
-        return super().get_field_label_css_class(bound_field)
-
-    def get_widget_css_class(self, field_name, field):
-        """
-        Returns "form-check-input" if input widget is checkable, or
-        "form-control-file" if widget is FileInput. For all other fields,
-        returns the default value from the form property ("form-control").
-        """
-        if field.widget.__class__ in [
-            forms.RadioSelect,
-            forms.CheckboxSelectMultiple,
-            forms.CheckboxInput,
-        ]:
-            return "form-check-input"
-
-        if isinstance(field.widget, forms.FileInput):
-            return "form-control-file"
+    #: Checkable inputs and file inputs need different CSS classes.
+    widget_theme = {
+        forms.CheckboxInput: {
+            "widget_css_class": "form-check-input",
+            "field_container_css_class": "form-check",
+            "field_label_css_class": "form-check-label",
+        },
+        forms.RadioSelect: {"widget_css_class": "form-check-input"},
+        forms.CheckboxSelectMultiple: {"widget_css_class": "form-check-input"},
+        forms.FileInput: {"widget_css_class": "form-control-file"},
+    }
 
-        return super().get_widget_css_class(field_name, field)
+    fieldset_class = BootstrapTapeformFieldset
 
 
 class Bootstrap5TapeformMixin(Bootstrap4TapeformMixin):
@@ -92,25 +68,15 @@ class Bootstrap5TapeformMixin(Bootstrap4TapeformMixin):
     widget_template_overrides = {
         forms.SelectDateWidget: "tapeforms/widgets/bootstrap5_multiwidget.html",
         forms.SplitDateTimeWidget: "tapeforms/widgets/bootstrap5_multiwidget.html",
+        forms.SplitHiddenDateTimeWidget: None,
         forms.RadioSelect: "tapeforms/widgets/bootstrap_multipleinput.html",
         forms.CheckboxSelectMultiple: "tapeforms/widgets/bootstrap_multipleinput.html",
+        AutocompleteSelect: "tapeforms/widgets/bootstrap_autocomplete.html",
     }
 
-    def get_widget_css_class(self, field_name, field):
-        """
-        Returns "form-check-input" if input widget is checkable, or
-        "form-select" if widget is Select or a subclass. For all other fields,
-        returns the default value from the form property ("form-control").
-        """
-        if field.widget.__class__ in [
-            forms.RadioSelect,
-            forms.CheckboxSelectMultiple,
-            forms.CheckboxInput,
-        ]:
-            return "form-check-input"
-
-        if isinstance(field.widget, forms.Select):
-            return "form-select"
-
-        # Don't call super to ensure we bypass the code in the Bootstrap 4 mixin.
-        return super(Bootstrap4TapeformMixin, self).get_widget_css_class(field_name, field)
+    #: Checkable inputs and selects need different CSS classes.
+    widget_theme = {
+        **Bootstrap4TapeformMixin.widget_theme,
+        forms.FileInput: {},
+        forms.Select: {"widget_css_class": "form-select"},
+    }
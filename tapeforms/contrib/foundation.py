@@ -24,16 +24,10 @@ class FoundationTapeformMixin(TapeformMixin):
         forms.CheckboxSelectMultiple: "tapeforms/widgets/foundation_multipleinput.html",
     }
 
-    def get_field_template(self, bound_field, template_name=None):
-        """
-        Uses a special field template for widget with multiple inputs. It only
-        applies if no other template than the default one has been defined.
-        """
-        template_name = super().get_field_template(bound_field, template_name)
-
-        if template_name == self.field_template and isinstance(
-            bound_field.field.widget, (forms.RadioSelect, forms.CheckboxSelectMultiple)
-        ):
-            return "tapeforms/fields/foundation_fieldset.html"
-
-        return template_name
+    #: Widgets with multiple inputs use a special field template (a fieldset).
+    widget_theme = {
+        forms.RadioSelect: {"field_template": "tapeforms/fields/foundation_fieldset.html"},
+        forms.CheckboxSelectMultiple: {
+            "field_template": "tapeforms/fields/foundation_fieldset.html"
+        },
+    }
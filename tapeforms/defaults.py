@@ -1,3 +1,42 @@
 LAYOUT_DEFAULT_TEMPLATE = "tapeforms/layouts/default.html"
+FORMSET_DEFAULT_TEMPLATE = "tapeforms/formsets/default.html"
 FIELDSET_DEFAULT_TEMPLATE = "tapeforms/fieldsets/default.html"
 FIELD_DEFAULT_TEMPLATE = "tapeforms/fields/default.html"
+
+#: Number of compiled templates to keep in the tapeforms template cache.
+#: Can be overridden using the setting `TAPEFORMS_TEMPLATE_CACHE_SIZE`.
+TEMPLATE_CACHE_SIZE = 256
+
+#: Alias of the Django cache to store rendered forms in, see `fragment_cache`.
+#: Can be overridden using the setting `TAPEFORMS_FRAGMENT_CACHE`. If `None`,
+#: an in-process LRU cache is used.
+FRAGMENT_CACHE = None
+
+#: Number of rendered forms to keep in the in-process fragment cache.
+#: Can be overridden using the setting `TAPEFORMS_FRAGMENT_CACHE_SIZE`.
+FRAGMENT_CACHE_SIZE = 128
+
+#: Timeout in seconds for rendered forms in the fragment cache (Django caches only).
+#: Can be overridden using the setting `TAPEFORMS_FRAGMENT_CACHE_TIMEOUT`.
+FRAGMENT_CACHE_TIMEOUT = 300
+
+#: Share the evaluated choices of model choice fields between forms, see `choice_cache`.
+#: Can be overridden using the setting `TAPEFORMS_CHOICE_CACHE`.
+CHOICE_CACHE = True
+
+#: Number of evaluated querysets to keep in the choice cache.
+#: Can be overridden using the setting `TAPEFORMS_CHOICE_CACHE_SIZE`.
+CHOICE_CACHE_SIZE = 256
+
+#: Timeout in seconds for cached choices. If `None`, the choices are cached until
+#: the current request is finished. Can be overridden using the setting
+#: `TAPEFORMS_CHOICE_CACHE_TIMEOUT`.
+CHOICE_CACHE_TIMEOUT = None
+
+#: Number of compiled option lists of select widgets to keep in the option cache.
+#: Can be overridden using the setting `TAPEFORMS_OPTION_CACHE_SIZE`.
+OPTION_CACHE_SIZE = 64
+
+#: Name of the URL of the `AutocompleteView` used by autocomplete widgets without
+#: an explicit URL, see `tapeforms.urls`.
+AUTOCOMPLETE_URL_NAME = "tapeforms-autocomplete"
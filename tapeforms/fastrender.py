@@ -0,0 +1,245 @@
+from pathlib import Path
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template.backends.django import Template as DjangoTemplate
+from django.utils.autoreload import file_changed
+from django.utils.formats import localize
+from django.utils.html import conditional_escape
+from django.utils.safestring import SafeString
+
+from .loader import get_template
+from .mixins import TapeformMixin
+
+#: Directory of the templates shipped with tapeforms.
+STOCK_TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+
+LABEL_TAG_TEMPLATE = "tapeforms/includes/label_tag.html"
+ERRORLIST_TEMPLATE = "tapeforms/includes/errorlist.html"
+
+
+def render_value(value):
+    """
+    Renders a variable the same way the Django template engine does for ``{{ value }}``.
+    """
+    return conditional_escape(localize(value))
+
+
+def render_label_tag(values):
+    """
+    Python version of ``tapeforms/includes/label_tag.html``.
+    """
+    output = ["<label"]
+    if values["label_css_class"]:
+        output.append(f' class="{render_value(values["label_css_class"])}"')
+    if values["field_id"]:
+        output.append(f' for="{render_value(values["field_id"])}"')
+    output.append(f">\n\t\n\t{render_value(values['label'])}\n\t\n\t")
+    if values["required"]:
+        output.append(' <span class="required">*</span>')
+    output.append("\n</label>\n")
+    return "".join(output)
+
+
+def render_errorlist(values):
+    """
+    Python version of ``tapeforms/includes/errorlist.html``.
+    """
+    if not values["errors"]:
+        return "\n"
+
+    items = "".join(f"<li>{render_value(error)}</li>" for error in values["errors"])
+    return f'\n\t<ul class="errorlist">\n\t\t{items}\n\t</ul>\n\n'
+
+
+def render_error_elements(values, element, css_class):
+    """
+    Renders the errors of a field as a sequence of elements, like the ``errors``
+    block of the Bootstrap and Foundation field templates.
+    """
+    items = "".join(
+        f'\n\t\t<{element} class="{css_class}">{render_value(error)}</{element}>\n\t'
+        for error in values["errors"]
+    )
+    return f"\n\t{items}\n"
+
+
+class FieldBuilder:
+    """
+    Python version of ``tapeforms/fields/default.html``. Every template block is
+    a method which can be overridden, just like extending the template.
+    """
+
+    #: Names of all stock templates the field template depends on.
+    templates = ("tapeforms/fields/default.html", LABEL_TAG_TEMPLATE, ERRORLIST_TEMPLATE)
+
+    def render(self, values):
+        field = values["field"]
+        output = [
+            f'<div class="{render_value(values["container_css_class"])}'
+            f" form-field-{render_value(values['field_name'])}"
+            f" form-widget-{render_value(values['widget_class_name'])}"
+        ]
+        if values["required"]:
+            output.append(" is-required")
+        if values["errors"]:
+            output.append(" has-errors")
+        css_classes = field.css_classes()
+        if css_classes:
+            output.append(f" {render_value(css_classes)}")
+        output.append(f'">\n\t{self.label(values)}\n\n\t{self.field(values)}\n</div>\n')
+        return "".join(output)
+
+    def label(self, values):
+        return f"\n\t\t{render_label_tag(values)}\n\t"
+
+    def field(self, values):
+        return (
+            f"\n\t\t{self.widget(values)}\n\n\t\t{self.errors(values)}"
+            f"\n\n\t\t{self.help_text(values)}\n\t"
+        )
+
+    def widget(self, values):
+        return f"\n\t\t\t{render_value(values['field'])}\n\t\t"
+
+    def errors(self, values):
+        return f"\n\t\t\t{render_errorlist(values)}\n\t\t"
+
+    def help_text(self, values):
+        help_text = ""
+        if values["help_text"]:
+            help_text = f'\n\t\t\t\t<div class="help-text">{render_value(values["help_text"])}</div>\n\t\t\t'
+        return f"\n\t\t\t{help_text}\n\t\t"
+
+
+class SwappedCheckboxLabelFieldBuilder(FieldBuilder):
+    """
+    Base for the field templates which render the label of a checkbox after the
+    input (``tapeforms/fields/bootstrap.html`` and ``tapeforms/fields/foundation.html``).
+    """
+
+    #: Element and CSS class used to render the errors of a field.
+    error_element = None
+    error_css_class = None
+
+    def label(self, values):
+        label = ""
+        if values["widget_class_name"] != "checkboxinput":
+            label = f"\n\t\t\n\t\t{super().label(values)}\n\t"
+        return f"\n\t{label}\n"
+
+    def widget(self, values):
+        label = ""
+        if values["widget_class_name"] == "checkboxinput":
+            label = f"\n\t\t\n\t\t{render_label_tag(values)}\n\t"
+        return f"\n    {super().widget(values)}\n\t{label}\n"
+
+    def errors(self, values):
+        return render_error_elements(values, self.error_element, self.error_css_class)
+
+
+class BootstrapFieldBuilder(SwappedCheckboxLabelFieldBuilder):
+    """
+    Python version of ``tapeforms/fields/bootstrap.html``.
+    """
+
+    templates = ("tapeforms/fields/bootstrap.html", *FieldBuilder.templates[:2])
+    error_element = "div"
+    error_css_class = "invalid-feedback"
+
+    def help_text(self, values):
+        help_text = ""
+        if values["help_text"]:
+            help_text = (
+                f'\n\t\t<div class="form-text">{render_value(values["help_text"])}</div>\n\t'
+            )
+        return f"\n\t{help_text}\n"
+
+
+class FoundationFieldBuilder(SwappedCheckboxLabelFieldBuilder):
+    """
+    Python version of ``tapeforms/fields/foundation.html``.
+    """
+
+    templates = ("tapeforms/fields/foundation.html", *FieldBuilder.templates[:2])
+    error_element = "span"
+    error_css_class = "form-error is-visible"
+
+
+#: Builders for the field templates shipped with tapeforms.
+FIELD_BUILDERS = {
+    "tapeforms/fields/default.html": FieldBuilder(),
+    "tapeforms/fields/bootstrap.html": BootstrapFieldBuilder(),
+    "tapeforms/fields/foundation.html": FoundationFieldBuilder(),
+}
+
+_stock_templates = {}
+
+
+def is_stock_template(template_name):
+    """
+    Returns `True` if the template name resolves to the unmodified template shipped
+    with tapeforms, using the Django template engine with default options.
+    """
+    try:
+        return _stock_templates[template_name]
+    except KeyError:
+        pass
+
+    template = get_template(template_name)
+    is_stock = (
+        isinstance(template, DjangoTemplate)
+        and not template.template.engine.string_if_invalid
+        and template.origin.name is not None
+        and Path(template.origin.name).resolve() == STOCK_TEMPLATES_DIR / template_name
+    )
+    _stock_templates[template_name] = is_stock
+    return is_stock
+
+
+def get_field_builder(form, template_name):
+    """
+    Returns the builder to render a field using the passed template name without
+    the template engine. Returns `None` if the template engine is required: the
+    template is unknown or overridden in the project or the form overrides the
+    `get_field_context` method.
+    """
+    builder = FIELD_BUILDERS.get(template_name)
+    if builder is None:
+        return None
+
+    if type(form).get_field_context is not TapeformMixin.get_field_context:
+        return None
+
+    if not all(is_stock_template(name) for name in builder.templates):
+        return None
+
+    return builder
+
+
+def render_field(form, template_name, values):
+    """
+    Renders a field using the Python version of the stock field template.
+
+    :param form: The form instance the field belongs to.
+    :param template_name: Name of the field template to render.
+    :param values: Field context as returned by `get_field_context`.
+    :return: Rendered field as HTML or `None` if the template engine is required.
+    """
+    builder = get_field_builder(form, template_name)
+    if builder is None:
+        return None
+
+    return SafeString(builder.render(values))
+
+
+@receiver(setting_changed)
+def clear_stock_templates_on_setting_change(setting, **kwargs):
+    if setting == "TEMPLATES":
+        _stock_templates.clear()
+
+
+@receiver(file_changed)
+def clear_stock_templates_on_file_change(**kwargs):
+    # Don't return anything, returning True would prevent the autoreload.
+    _stock_templates.clear()
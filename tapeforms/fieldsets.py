@@ -1,20 +1,90 @@
-import copy
-import itertools
-
+import asyncio
+import functools
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured
+from django.forms.models import ModelChoiceField
 from django.forms.utils import ErrorList
 
 from . import defaults
 from .mixins import TapeformLayoutMixin
 
 
+@functools.lru_cache(maxsize=256)
+def compile_layout(fields, exclude, visible_names=None):
+    """
+    Resolves the layout of a fieldset into rows of field names. The result is
+    memoized, fieldsets with the same configuration share the resolved layout.
+
+    :param fields: Tuple of rows, every row is a tuple of field names.
+    :param exclude: ``frozenset`` of field names to exclude.
+    :param visible_names: Tuple with the names of all visible fields of the form,
+                          used to build the rows if no ``fields`` are provided.
+    :return: Tuple of rows without the excluded fields, empty rows are removed.
+    """
+    if not fields:
+        fields = tuple((field_name,) for field_name in visible_names)
+
+    rows = (
+        tuple(field_name for field_name in row if field_name not in exclude) for row in fields
+    )
+    return tuple(row for row in rows if row)
+
+
+class LayoutTemplateDescriptor:
+    """
+    Descriptor for the `layout_template` of fieldsets. Returns the template set on
+    the fieldset instance, falling back to the default template of the class.
+    """
+
+    def __init__(self, default=None):
+        self.default = default
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self.default
+
+        return instance._layout_template or self.default
+
+    def __set__(self, instance, value):
+        instance._layout_template = value
+
+
 class TapeformFieldset(TapeformLayoutMixin):
     """
     Class to render a subset of a form's fields. From a template perspective,
     a fieldset looks quite similar to a form (and can use the same template tag
     to render: ``form``.
+
+    Fieldsets use ``__slots__`` to keep the memory footprint low. Subclasses may
+    define ``__slots__`` for their own attributes too (otherwise, their instances
+    get a ``__dict__``). A ``layout_template`` class property of a subclass is
+    turned into a `LayoutTemplateDescriptor` automatically.
     """
 
-    layout_template = defaults.FIELDSET_DEFAULT_TEMPLATE
+    __slots__ = (
+        "form",
+        "render_fields",
+        "exclude_fields",
+        "primary_fieldset",
+        "fieldset_title",
+        "extra",
+        "_layout_template",
+        "_visible_field_rows",
+        "_tapeforms_layout_context",
+    )
+
+    layout_template = LayoutTemplateDescriptor(defaults.FIELDSET_DEFAULT_TEMPLATE)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        if "layout_template" in cls.__dict__ and not isinstance(
+            cls.__dict__["layout_template"], LayoutTemplateDescriptor
+        ):
+            cls.layout_template = LayoutTemplateDescriptor(cls.__dict__["layout_template"])
 
     def __init__(
         self,
@@ -51,9 +121,8 @@ class TapeformFieldset(TapeformLayoutMixin):
         self.primary_fieldset = primary
         self.fieldset_title = title
         self.extra = extra or {}
-
-        if template:
-            self.layout_template = template
+        self._layout_template = template
+        self._visible_field_rows = None
 
     def __repr__(self):
         return "<{cls} form={form}, primary={primary}, title={title}, fields=({fields})/({exclude})>".format(
@@ -65,6 +134,27 @@ class TapeformFieldset(TapeformLayoutMixin):
             exclude=";".join(self.exclude_fields),
         )
 
+    @property
+    def single_pass_rendering(self):
+        """
+        Fieldsets use the rendering mode of their form.
+        """
+        return getattr(self.form, "single_pass_rendering", False)
+
+    @property
+    def errors(self):
+        """
+        Returns the errors of the form.
+        """
+        return self.form.errors
+
+    @property
+    def fields(self):
+        """
+        Returns the fields of the form.
+        """
+        return self.form.fields
+
     def hidden_fields(self):
         """
         Returns the hidden fields of the form for rendering of the fieldset is
@@ -74,6 +164,15 @@ class TapeformFieldset(TapeformLayoutMixin):
         """
         return self.form.hidden_fields() if self.primary_fieldset else ()
 
+    def get_token_placeholders(self):
+        """
+        Returns the token placeholders of the form for rendering if the fieldset is
+        marked as the primary fieldset.
+
+        :return: List or tuple of hidden inputs as HTML.
+        """
+        return self.form.get_token_placeholders() if self.primary_fieldset else ()
+
     def non_field_errors(self):
         """
         Returns all non-field errors of the form for rendering of the fieldset is
@@ -84,6 +183,24 @@ class TapeformFieldset(TapeformLayoutMixin):
 
         return self.form.non_field_errors() if self.primary_fieldset else ErrorList()
 
+    def get_layout(self):
+        """
+        Returns the resolved layout of the fieldset as rows of field names, see
+        `compile_layout`. The layout is shared by all fieldsets with the same
+        ``fields`` and ``exclude`` configuration.
+
+        :return: Tuple of rows, every row is a tuple of field names.
+        """
+        fields = tuple(
+            tuple(field) if isinstance(field, (tuple, list)) else (field,)
+            for field in self.render_fields
+        )
+        visible_names = None
+        if not fields:
+            visible_names = tuple(field.name for field in self.form.visible_fields())
+
+        return compile_layout(fields, frozenset(self.exclude_fields), visible_names)
+
     def visible_fields(self):
         """
         Returns the reduced set of visible fields to output from the form.
@@ -94,43 +211,130 @@ class TapeformFieldset(TapeformLayoutMixin):
         If no ``fields`` where provided when configuring this fieldset, all visible
         fields minus the excluded fields will be returned.
 
-        :return: List of bound field instances or empty tuple.
+        The rows are resolved once per fieldset instance and again when fields are
+        added to or removed from the form.
+
+        :return: Tuple of rows (tuples of bound field instances).
+        """
+        field_names = tuple(self.form.fields)
+        if self._visible_field_rows is None or self._visible_field_rows[0] != field_names:
+            form_visible_fields_map = {
+                field.name: field for field in self.form.visible_fields()
+            }
+            self._visible_field_rows = (
+                field_names,
+                tuple(
+                    tuple(form_visible_fields_map[field_name] for field_name in row)
+                    for row in self.get_layout()
+                ),
+            )
+
+        return self._visible_field_rows[1]
+
+    def get_choice_fields(self):
         """
+        Returns the fields rendered by the fieldset to prefetch the choices for in
+        `aprefetch_choices`: the visible fields and, if the fieldset is marked as the
+        primary fieldset, the hidden fields of the form.
 
-        form_visible_fields = self.form.visible_fields()
-        form_visible_fields_map = {field.name: field for field in form_visible_fields}
+        :return: List of form fields.
+        """
+        bound_fields = [bound_field for row in self.visible_fields() for bound_field in row]
+        bound_fields.extend(self.hidden_fields())
+        return [bound_field.field for bound_field in bound_fields]
 
-        if self.render_fields:
-            fields = [
-                (field,) if not isinstance(field, (tuple, list)) else field
-                for field in self.render_fields
-            ]
-        else:
-            fields = [(field.name,) for field in form_visible_fields]
+    def uses_database(self):
+        """
+        Returns `True` if rendering the fieldset might query the database because
+        one of the visible fields is a model choice field.
+        """
+        return any(
+            isinstance(bound_field.field, ModelChoiceField)
+            for row in self.visible_fields()
+            for bound_field in row
+        )
+
+
+def compile_fieldsets(fieldsets, owner=None):
+    """
+    Validates a fieldsets configuration and compiles it into immutable fieldset
+    specs. Every spec is a read-only mapping with the kwargs of a fieldset. The
+    rows of ``fields`` and ``exclude`` are converted to tuples, ``extra`` is
+    wrapped in a read-only mapping and the primary fieldset is resolved: if no
+    fieldset is marked as primary, the first one is.
+
+    :param fieldsets: List/tuple of kwargs as ``dict`` to generate fieldsets for.
+    :param owner: Optional name of the form class, used in error messages.
+    :return: Tuple of read-only mappings.
+    :raises ImproperlyConfigured: If the fieldsets configuration is invalid.
+    """
+
+    def error(message):
+        prefix = f"Invalid fieldsets of {owner}" if owner else "Invalid fieldsets"
+        return ImproperlyConfigured(f"{prefix}: {message}")
+
+    if not isinstance(fieldsets, (list, tuple)):
+        raise error(f"expected a list or tuple, got {fieldsets.__class__.__name__}.")
+
+    for index, fieldset_kwargs in enumerate(fieldsets):
+        if not isinstance(fieldset_kwargs, Mapping):
+            raise error(f"fieldset {index} should be a dict.")
+
+    # Search for primary marker in at least one of the fieldset kwargs.
+    has_primary = any(fieldset_kwargs.get("primary") for fieldset_kwargs in fieldsets)
+
+    specs = []
+    for index, fieldset_kwargs in enumerate(fieldsets):
+        spec = dict(fieldset_kwargs)
+
+        fields = spec.get("fields") or ()
+        if not isinstance(fields, (list, tuple)):
+            raise error(f"fields of fieldset {index} should be a list or tuple.")
+        if not all(
+            isinstance(field, str)
+            or (
+                isinstance(field, (list, tuple))
+                and all(isinstance(column, str) for column in field)
+            )
+            for field in fields
+        ):
+            raise error(f"fields of fieldset {index} should be field names or rows of them.")
+        spec["fields"] = tuple(
+            field if isinstance(field, str) else tuple(field) for field in fields
+        )
+
+        exclude = spec.get("exclude") or ()
+        if not isinstance(exclude, (list, tuple)) or not all(
+            isinstance(field, str) for field in exclude
+        ):
+            raise error(f"exclude of fieldset {index} should be a list of field names.")
+        spec["exclude"] = tuple(exclude)
+
+        if spec.get("extra") is not None:
+            if not isinstance(spec["extra"], Mapping):
+                raise error(f"extra of fieldset {index} should be a dict.")
+            spec["extra"] = MappingProxyType(dict(spec["extra"]))
 
-        filtered_fields = [
-            field
-            for field in itertools.chain.from_iterable(fields)
-            if field not in self.exclude_fields
-        ]
+        if not has_primary:
+            spec["primary"] = True
+            has_primary = True
 
-        visible_field_rows = []
+        specs.append(MappingProxyType(spec))
 
-        for field_names in fields:
-            field_row = []
-            for field_name in field_names:
-                if field_name in filtered_fields:
-                    field_row.append(form_visible_fields_map[field_name])
-            if field_row:
-                visible_field_rows.append(field_row)
+    return tuple(specs)
 
-        return visible_field_rows
+
+#: Specs of the default fieldset containing all fields.
+DEFAULT_FIELDSET_SPECS = compile_fieldsets([{}])
 
 
 class TapeformFieldsetsMixin:
     """
     Mixin to generate fieldsets based on the `fieldsets` property of a
     ``TapeformFieldsetsMixin`` enabled form.
+
+    The `fieldsets` property is validated and compiled to fieldset specs when the
+    form class is created (see `compile_fieldsets`).
     """
 
     #: Default fieldset class to use when instantiating a fieldset.
@@ -139,6 +343,35 @@ class TapeformFieldsetsMixin:
     #: List/tuple of kwargs as `dict`` to generate fieldsets for.
     fieldsets = None
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        fieldsets = cls.__dict__.get("fieldsets")
+        if fieldsets is not None:
+            cls._fieldset_specs = (fieldsets, compile_fieldsets(fieldsets, cls.__name__))
+
+    def get_fieldset_specs(self, fieldsets=None):
+        """
+        Returns the compiled fieldset specs for the passed fieldsets or the
+        ``fieldsets`` property. The specs of the ``fieldsets`` property are compiled
+        once per form class.
+
+        :param fieldsets: Alternative set of fieldset kwargs.
+        :return: Tuple of fieldset specs, see `compile_fieldsets`.
+        """
+        owner = self.__class__.__name__
+        if fieldsets:
+            return compile_fieldsets(fieldsets, owner)
+
+        if not self.fieldsets:
+            return DEFAULT_FIELDSET_SPECS
+
+        compiled = getattr(self, "_fieldset_specs", None)
+        if compiled is not None and compiled[0] is self.fieldsets:
+            return compiled[1]
+
+        return compile_fieldsets(self.fieldsets, owner)
+
     def get_fieldset_class(self, **fieldset_kwargs):
         """
         Returns the fieldset class to use when generating the fieldset using
@@ -161,30 +394,58 @@ class TapeformFieldsetsMixin:
 
     def get_fieldsets(self, fieldsets=None):
         """
-        This method returns a generator which yields fieldset instances.
+        This method returns an iterator which yields fieldset instances.
 
         The method uses the optional fieldsets argument to generate fieldsets for.
         If no fieldsets argument is passed, the class property ``fieldsets`` is used.
+        In this case, the fieldset instances are created once per form instance.
 
-        When generating the fieldsets, the method ensures that at least one fielset
-        will be the primary fieldset which is responsible for rendering the non field
-        errors and hidden fields.
+        The method ensures that at least one fielset will be the primary fieldset
+        which is responsible for rendering the non field errors and hidden fields.
 
         :param fieldsets: Alternative set of fieldset kwargs. If passed this set is
                           prevered of the ``fieldsets`` property of the form.
-        :return: generator which yields fieldset instances.
+        :return: iterator which yields fieldset instances.
         """
-        fieldsets = fieldsets or self.fieldsets or [{}]
+        if fieldsets:
+            return (
+                self.get_fieldset(**{**spec, "form": self})
+                for spec in self.get_fieldset_specs(fieldsets)
+            )
+
+        instances = self.__dict__.get("_fieldset_instances")
+        if instances is None:
+            instances = self._fieldset_instances = [
+                self.get_fieldset(**{**spec, "form": self})
+                for spec in self.get_fieldset_specs()
+            ]
 
-        # Search for primary marker in at least one of the fieldset kwargs.
-        has_primary = any(fieldset.get("primary") for fieldset in fieldsets)
+        return iter(instances)
 
-        for fieldset_kwargs in fieldsets:
-            fieldset_kwargs = copy.deepcopy(fieldset_kwargs)
-            fieldset_kwargs["form"] = self
+    async def arender_fieldsets(self, fieldsets=None):
+        """
+        Renders all fieldsets to HTML without blocking the event loop.
 
-            if not has_primary:
-                fieldset_kwargs["primary"] = True
-                has_primary = True
+        The form is cleaned before the fieldsets are rendered. Fieldsets which might
+        query the database are rendered in the thread used for synchronous code (one
+        after another), all other fieldsets are rendered concurrently.
 
-            yield self.get_fieldset(**fieldset_kwargs)
+        :param fieldsets: Alternative set of fieldset kwargs, see `get_fieldsets`.
+        :return: List with the rendered HTML of every fieldset.
+        """
+
+        def prepare_fieldsets():
+            # Clean the form once, before rendering the fieldsets in multiple threads.
+            self.errors
+            return [
+                (fieldset, fieldset.uses_database())
+                for fieldset in self.get_fieldsets(fieldsets)
+            ]
+
+        fieldsets = await sync_to_async(prepare_fieldsets)()
+        return await asyncio.gather(
+            *(
+                sync_to_async(fieldset.as_tapeform, thread_sensitive=uses_database)()
+                for fieldset, uses_database in fieldsets
+            )
+        )
@@ -0,0 +1,93 @@
+from . import defaults
+from .mixins import TapeformLayoutMixin
+from .plan import get_class_render_plan
+
+
+class TapeformFormsetMixin(TapeformLayoutMixin):
+    """
+    Mixin to render a formset of tapeforms enabled forms as HTML. The forms of
+    the formset are rendered using their own layout and field templates.
+    """
+
+    #: Configure the widgets of the form class once (see
+    #: `TapeformMixin.preconfigure_tapeforms`) instead of once per form of the formset.
+    #: Only enable this if the widget configuration doesn't depend on the form
+    #: instance (e.g. its prefix or initial data).
+    preconfigure_forms = False
+
+    #: Render the `empty_form` in a ``<template>`` element, e.g. to add forms
+    #: using JavaScript.
+    render_empty_form = False
+
+    def __init__(self, *args, **kwargs):
+        """
+        The init method is overwritten to preconfigure the form class if
+        `preconfigure_forms` is enabled.
+        """
+        super().__init__(*args, **kwargs)
+        if self.preconfigure_forms and hasattr(self.form, "preconfigure_tapeforms"):
+            self.form.preconfigure_tapeforms()
+
+    def get_layout_template(self, template_name=None):
+        """
+        Returns the layout template to use when rendering the formset to HTML.
+
+        Preference of template selection:
+
+        1. Provided method argument `template_name`
+        2. Formset class property `layout_template`
+        3. Globally defined default template from `defaults.FORMSET_DEFAULT_TEMPLATE`
+
+        :param template_name: Optional template to use instead of other configurations.
+        :return: Template name to use when rendering the formset.
+        """
+        if template_name:
+            return template_name
+
+        if self.layout_template:
+            return self.layout_template
+
+        return defaults.FORMSET_DEFAULT_TEMPLATE
+
+    def get_layout_context(self):
+        """
+        Returns the context which is used when rendering the formset to HTML.
+
+        The generated template context will contain the following variables:
+
+        * formset: `BaseFormSet` instance
+        * errors: `ErrorList` instance with non form errors
+        * management_form: The management form of the formset
+        * forms: All forms of the formset to render.
+        * empty_form: The `empty_form` if `render_empty_form` is enabled, otherwise
+          `None`.
+
+        :return: Template context for formset rendering.
+        """
+        return {
+            "formset": self,
+            "errors": self.non_form_errors(),
+            "management_form": self.management_form,
+            "forms": self.forms,
+            "empty_form": self.empty_form if self.render_empty_form else None,
+        }
+
+    def get_render_plan(self):
+        """
+        Returns the render plan of the form class of the formset. The plan is
+        shared by all forms of the formset (including `empty_form`), so template
+        and CSS class lookups only happen once for all rows.
+
+        :return: `RenderPlan` instance.
+        """
+        return get_class_render_plan(self.form)
+
+    def get_choice_fields(self):
+        """
+        Returns the fields of all forms of the formset to prefetch the choices for
+        in `aprefetch_choices`. Forms with the same choices share a single query.
+        The `empty_form` is skipped, it's created again on every access.
+
+        :return: Iterable of form fields.
+        """
+        return [field for form in self.forms for field in form.fields.values()]
@@ -0,0 +1,102 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import Promise
+
+from . import defaults
+from .utils import LRUCache
+
+#: Prefix of all cache keys of rendered form fragments.
+FRAGMENT_KEY_PREFIX = "tapeforms.fragment"
+
+
+#: The in-process fragment cache, used if no Django cache is configured using the
+#: `TAPEFORMS_FRAGMENT_CACHE` setting.
+fragment_cache = LRUCache(defaults.FRAGMENT_CACHE_SIZE, setting="TAPEFORMS_FRAGMENT_CACHE_SIZE")
+
+
+def get_fragment_cache():
+    """
+    Returns the cache to store rendered form fragments in. This is the Django cache
+    with the alias from the `TAPEFORMS_FRAGMENT_CACHE` setting or the in-process
+    `fragment_cache` if the setting is not defined.
+    """
+    alias = getattr(settings, "TAPEFORMS_FRAGMENT_CACHE", defaults.FRAGMENT_CACHE)
+    if alias is None:
+        return fragment_cache
+
+    return caches[alias]
+
+
+def freeze_fragment_value(value):
+    """
+    Returns the value with a stable ``repr`` to use as part of a fragment cache key.
+    Lazy strings are resolved, dicts are sorted by key and lists become tuples.
+    The type of other values is kept, this way ``1`` and ``True`` don't share a key.
+    """
+    if isinstance(value, Promise):
+        return str(value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze_fragment_value(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_fragment_value(item) for item in value)
+    return value
+
+
+def freeze_widget(widget):
+    """
+    Returns the per-instance state of a widget which changes its output (class,
+    template, input type and attributes, including the sub widgets of multi
+    widgets) with a stable ``repr`` to use as part of a fragment cache key.
+    """
+    return (
+        widget.__class__,
+        widget.template_name,
+        getattr(widget, "input_type", None),
+        freeze_fragment_value(widget.attrs),
+        tuple(freeze_widget(subwidget) for subwidget in getattr(widget, "widgets", ())),
+    )
+
+
+def make_fragment_key(*parts):
+    """
+    Returns a cache key for a rendered fragment, derived from the passed parts.
+    All parts need a stable ``repr``.
+    """
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()
+    return f"{FRAGMENT_KEY_PREFIX}.{digest}"
+
+
+def render_fragment(cache_key, render):
+    """
+    Returns the cached fragment for the cache key or renders and caches it.
+
+    :param cache_key: Cache key of the fragment, no caching happens if `None`.
+    :param render: Callable without arguments which renders the fragment.
+    :return: Rendered fragment.
+    """
+    if cache_key is None:
+        return render()
+
+    cache = get_fragment_cache()
+    content = cache.get(cache_key)
+    if content is None:
+        content = render()
+        cache.set(
+            cache_key,
+            content,
+            getattr(
+                settings, "TAPEFORMS_FRAGMENT_CACHE_TIMEOUT", defaults.FRAGMENT_CACHE_TIMEOUT
+            ),
+        )
+
+    return content
+
+
+@receiver(setting_changed)
+def clear_fragment_cache_on_setting_change(setting, **kwargs):
+    if setting in ("TEMPLATES", "TAPEFORMS_FRAGMENT_CACHE_SIZE"):
+        fragment_cache.clear()
@@ -0,0 +1,92 @@
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template import loader
+from django.template.backends.django import Template as DjangoTemplate
+from django.utils.autoreload import file_changed
+
+from . import defaults
+from .utils import LRUCache
+
+
+class TemplateCache(LRUCache):
+    """
+    LRU cache of compiled templates, keyed by template engine and template name.
+
+    The size of the cache is taken from the `TAPEFORMS_TEMPLATE_CACHE_SIZE` setting,
+    falling back to `defaults.TEMPLATE_CACHE_SIZE`. Set it to 0 to disable the cache.
+    """
+
+    def __init__(self):
+        super().__init__(defaults.TEMPLATE_CACHE_SIZE, setting="TAPEFORMS_TEMPLATE_CACHE_SIZE")
+
+    def get_template(self, template_name, using=None):
+        """
+        Returns the compiled template for the passed template name. A list of
+        template names is supported as well, the first existing template is used.
+
+        :param template_name: Template name or list of template names.
+        :param using: Optional alias of the template engine to use.
+        :return: Template instance of the template engine.
+        """
+        is_list = isinstance(template_name, (list, tuple))
+        key = (using, tuple(template_name) if is_list else template_name)
+
+        template = self.get(key)
+        if template is None:
+            if is_list:
+                template = loader.select_template(template_name, using=using)
+            else:
+                template = loader.get_template(template_name, using=using)
+            self.set(key, template)
+
+        return template
+
+
+#: The template cache used when rendering forms and fields.
+template_cache = TemplateCache()
+
+
+def get_template(template_name, using=None):
+    """
+    Returns the compiled template using the tapeforms template cache.
+    """
+    return template_cache.get_template(template_name, using=using)
+
+
+def render_to_string(template_name, context=None, request=None, using=None):
+    """
+    Renders a template to a string, just like Django's `render_to_string` but
+    using the tapeforms template cache to look up the template.
+    """
+    return get_template(template_name, using=using).render(context, request)
+
+
+def render_in_context(template_name, values, context):
+    """
+    Renders a template by pushing the values onto an existing template `Context`
+    instead of creating a new context. Templates of other template engines than
+    Django's are rendered using a new context.
+
+    :param template_name: Template name or list of template names.
+    :param values: ``dict`` with the values to push onto the context.
+    :param context: The `Context` instance of the template currently rendered.
+    :return: Rendered template as string.
+    """
+    template = get_template(template_name)
+    if not isinstance(template, DjangoTemplate):
+        return template.render(values)
+
+    with context.push(values):
+        return template.template.render(context)
+
+
+@receiver(setting_changed)
+def clear_template_cache_on_setting_change(setting, **kwargs):
+    if setting in ("TEMPLATES", "TAPEFORMS_TEMPLATE_CACHE_SIZE"):
+        template_cache.clear()
+
+
+@receiver(file_changed)
+def clear_template_cache_on_file_change(**kwargs):
+    # Don't return anything, returning True would prevent the autoreload.
+    template_cache.clear()
@@ -0,0 +1,51 @@
+from django.utils.deprecation import MiddlewareMixin
+
+from .tokens import (
+    aiter_fill_placeholders,
+    fill_placeholders,
+    get_token_value,
+    iter_fill_placeholders,
+    token_registry,
+)
+
+
+class TokenPlaceholderMiddleware(MiddlewareMixin):
+    """
+    Replaces the placeholders of per-request tokens (like the CSRF token) in HTML
+    responses with the token values of the current request.
+
+    Add the middleware after ``django.middleware.csrf.CsrfViewMiddleware`` to make
+    sure the CSRF cookie is set when the CSRF token is used.
+
+    Streaming responses are only handled if they are marked using
+    `tapeforms.tokens.stream_token_placeholders`.
+    """
+
+    def process_response(self, request, response):
+        if not response.get("Content-Type", "").startswith("text/html"):
+            return response
+
+        if response.streaming:
+            if not getattr(response, "tapeforms_token_placeholders", False):
+                return response
+
+            # The content is streamed after all middlewares are done, the token
+            # values have to be computed in advance (e.g. to set the CSRF cookie).
+            for name in token_registry:
+                get_token_value(name, request)
+
+            if response.is_async:
+                response.streaming_content = aiter_fill_placeholders(
+                    response.streaming_content, request
+                )
+            else:
+                response.streaming_content = iter_fill_placeholders(
+                    response.streaming_content, request
+                )
+            return response
+
+        response.content = fill_placeholders(response.content, request)
+        if response.has_header("Content-Length"):
+            response.headers["Content-Length"] = str(len(response.content))
+
+        return response
@@ -1,20 +1,56 @@
+import copy
+
+from asgiref.sync import sync_to_async
 from django import forms
+from django.conf import settings
 from django.core.exceptions import NON_FIELD_ERRORS
-from django.template.loader import render_to_string
+from django.forms.boundfield import BoundField
+from django.forms.models import ModelChoiceField
 from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
 
 from . import defaults
+from .boundfield import get_tapeform_bound_field_class
+from .choices import apply_choice_cache, aprefetch_model_choices
+from .fragments import (
+    freeze_fragment_value,
+    freeze_widget,
+    make_fragment_key,
+    render_fragment,
+)
+from .loader import render_to_string
+from .plan import get_plan_signature, get_render_plan, plan_cached
+from .streaming import iter_layout
+from .tokens import csrf_input_placeholder
 from .utils import join_css_class
 
 
+def uses_tapeform_bound_field(field):
+    """
+    Returns `True` if the form returns a `TapeformBoundField` for the passed field,
+    which is the case for fields which don't override ``get_bound_field``. Fields
+    configured with a ``bound_field_class`` get a subclass of it using
+    `TapeformBoundFieldMixin`.
+    """
+    return type(field).get_bound_field is forms.Field.get_bound_field
+
+
 class TapeformLayoutMixin:
     """
     Mixin to render a form of fieldset as HTML.
     """
 
+    __slots__ = ()
+
     #: Layout template to use when rendering the form. Optional.
     layout_template = None
 
+    #: Render the layout and all fields in a single template render. Instead of
+    #: rendering every field template with a new context, the field contexts are
+    #: pushed onto the context of the surrounding template. Note that the variables
+    #: of the surrounding template are visible in the field templates.
+    single_pass_rendering = False
+
     def get_layout_template(self, template_name=None):
         """
         Returns the layout template to use when rendering the form to HTML.
@@ -44,28 +80,119 @@ class TapeformLayoutMixin:
 
         * form: `Form` instance
         * errors: `ErrorList` instance with non field errors and hidden field errors
-        * hidden_fields: All hidden fields to render.
+        * hidden_fields: All hidden fields to render (including token placeholders).
         * visible_fields: All visible fields to render.
 
+        The context is computed once and reused until the errors or the fields of
+        the form change, either by cleaning the form again (which replaces the
+        ``errors``), by adding errors using ``add_error`` or by adding or removing
+        fields. A shallow copy is returned.
+
         :return: Template context for form rendering.
         """
-        errors = self.non_field_errors()
-        for field in self.hidden_fields():
-            errors.extend(field.errors)
+        form_errors = self.errors
+        error_count = sum(len(field_errors) for field_errors in form_errors.values())
+        field_names = tuple(self.fields)
+        cached = getattr(self, "_tapeforms_layout_context", None)
+        if (
+            cached is None
+            or cached[0] is not form_errors
+            or cached[1] != error_count
+            or cached[2] != field_names
+        ):
+            hidden_fields = self.hidden_fields()
+
+            # Copy the non field errors to not modify the errors of the form.
+            errors = self.non_field_errors().copy()
+            for field in hidden_fields:
+                errors.extend(field.errors)
+
+            token_placeholders = self.get_token_placeholders()
+            if token_placeholders:
+                hidden_fields = [*hidden_fields, *token_placeholders]
+
+            cached = self._tapeforms_layout_context = (
+                form_errors,
+                error_count,
+                field_names,
+                {
+                    "form": self,
+                    "errors": errors,
+                    "hidden_fields": hidden_fields,
+                    "visible_fields": self.visible_fields(),
+                },
+            )
 
-        return {
-            "form": self,
-            "errors": errors,
-            "hidden_fields": self.hidden_fields(),
-            "visible_fields": self.visible_fields(),
-        }
+        return cached[3].copy()
+
+    def get_token_placeholders(self):
+        """
+        Returns hidden inputs with placeholders for per-request tokens, rendered
+        together with the hidden fields. See `tapeforms.tokens`.
+
+        By default, returns an empty tuple.
+
+        :return: List or tuple of hidden inputs as HTML.
+        """
+        return ()
+
+    def get_fragment_cache_key(self, template_name):
+        """
+        Returns the key to store the rendered HTML in the fragment cache.
+
+        By default, returns `None` which means "don't cache the rendered HTML".
+
+        :param template_name: Layout template used to render the form.
+        :return: Cache key or `None`
+        """
+        return None
 
     def as_tapeform(self):
         """
         Shortcut to render the form as a "tapeform" without including the tapeforms
         templatetags. Behaves similar to `as_p` and `as_table`.
         """
-        return render_to_string(self.get_layout_template(), self.get_layout_context())
+        template_name = self.get_layout_template()
+        return render_fragment(
+            self.get_fragment_cache_key(template_name),
+            lambda: render_to_string(template_name, self.get_layout_context()),
+        )
+
+    async def aas_tapeform(self):
+        """
+        Async version of `as_tapeform`. The form is rendered using ``sync_to_async``
+        to not block the event loop, this includes database queries to evaluate
+        the choices of model choice fields.
+        """
+        return await sync_to_async(self.as_tapeform)()
+
+    async def aprefetch_choices(self):
+        """
+        Evaluates the choices of all model choice fields in a batch using the async
+        ORM, fields with the same choices share a single query (see
+        `tapeforms.choices.aprefetch_model_choices`). Rendering the form afterwards
+        doesn't run any queries for the choices.
+        """
+        await aprefetch_model_choices(self.get_choice_fields())
+
+    def get_choice_fields(self):
+        """
+        Returns the fields to prefetch the choices for in `aprefetch_choices`.
+
+        By default, returns an empty tuple.
+
+        :return: Iterable of form fields.
+        """
+        return ()
+
+    def iter_tapeform(self):
+        """
+        Renders the form just like `as_tapeform` but returns a generator which
+        yields the HTML in chunks, one for every field and for the layout parts
+        between the fields. Fields are rendered when their chunk is requested.
+        Useful together with ``StreamingHttpResponse``.
+        """
+        return iter_layout(self.get_layout_template(), self.get_layout_context())
 
 
 class TapeformMixin(TapeformLayoutMixin):
@@ -100,39 +227,315 @@ class TapeformMixin(TapeformLayoutMixin):
     #: CSS class to append to the widget attributes. Optional.
     widget_css_class = None
 
+    #: A dictionary of widget classes to theme options, used by themes to style
+    #: certain widgets in a special way. The entry of the widget class (or the
+    #: closest base class) is used. Every entry is a dictionary with the optional
+    #: keys:
+    #:
+    #: * ``widget_css_class``: Replaces the `widget_css_class` of the form.
+    #: * ``field_template``: Replaces the `field_template` of the form.
+    #: * ``field_container_css_class``: Appended to `field_container_css_class`.
+    #: * ``field_label_css_class``: Replaces the `field_label_css_class` of the form.
+    #:
+    #: Optional.
+    widget_theme = None
+
     #: An additional CSS class to append to the widget attributes when the field
     #: has errors. Optional.
     widget_invalid_css_class = None
 
+    #: Render fields using the stock field templates with a Python implementation of
+    #: these templates instead of the template engine. Falls back to the template
+    #: engine if a template is overridden in the project or `get_field_context` is
+    #: overridden in the form.
+    fast_field_rendering = False
+
+    #: Cache the rendered HTML of unbound forms in the fragment cache. Only enable
+    #: this for forms which render the same for every visitor (e.g. search forms).
+    cache_tapeform = False
+
+    #: Render a hidden input with a placeholder for the CSRF token together with the
+    #: hidden fields. The placeholder is replaced by `TokenPlaceholderMiddleware`.
+    #: This way, the rendered HTML is the same for every visitor and can be cached.
+    csrf_token_placeholder = False
+
     #: Defer the tapeforms initialization. There are situation where you want to
     #: control when widget options and templates are applied. Use with care!
     defer_init_tapeforms = False
 
+    #: Apply widget options, templates and CSS classes once to the `base_fields` of
+    #: the form class instead of every form instance. Instances get the configured
+    #: widgets when Django copies the `base_fields`. Only fields which are added or
+    #: replaced when creating the form are configured per instance. Only enable this
+    #: if the widget configuration only depends on the form class (and not on
+    #: instance attributes like the prefix or initial data).
+    preconfigure_base_fields = False
+
+    #: Apply widget options, templates and CSS classes to a field the first time it
+    #: is rendered instead of when creating the form. Fields which are only validated
+    #: (or not rendered at all) are never configured.
+    lazy_init_tapeforms = False
+
+    #: Share the evaluated choices of model choice fields with other forms using the
+    #: same queryset (e.g. the forms of a formset), see `tapeforms.choices`. Can be
+    #: disabled globally using the `TAPEFORMS_CHOICE_CACHE` setting.
+    cache_model_choices = True
+
+    #: Names of the fields which are configured when `lazy_init_tapeforms` is enabled.
+    _tapeforms_lazy_fields = None
+
     def __init__(self, *args, **kwargs):
         """
         The init method is overwritten to apply widget templates and CSS classes.
         """
+        if self.preconfigure_base_fields:
+            self.preconfigure_tapeforms()
+
         super().__init__(*args, **kwargs)
 
-        if not self.defer_init_tapeforms:
+        if self.defer_init_tapeforms:
+            return
+
+        if self.lazy_init_tapeforms:
+            self._tapeforms_lazy_fields = set()
+            self.init_choice_cache()
+            # Rendering fields with their own bound field can't be intercepted.
+            for field_name, field in self.fields.items():
+                if not uses_tapeform_bound_field(field):
+                    self.ensure_tapeforms_field(field_name)
+        else:
             self.init_tapeforms(*args, **kwargs)
 
+    def __getitem__(self, name):
+        """
+        Returns a `TapeformBoundField` for fields with the default bound field class.
+        This way, the invalid attributes are added when rendering the widget and the
+        field is configured on first render if `lazy_init_tapeforms` is enabled.
+
+        The ``bound_field_class`` of the field or the form (Django 6.0+) is respected,
+        a subclass of it using `TapeformBoundFieldMixin` is returned.
+        """
+        if name not in self._bound_fields_cache:
+            field = self.fields.get(name)
+            if field is not None and uses_tapeform_bound_field(field):
+                bound_field_class = get_tapeform_bound_field_class(
+                    getattr(field, "bound_field_class", None)
+                    or getattr(self, "bound_field_class", None)
+                    or BoundField
+                )
+                self._bound_fields_cache[name] = bound_field_class(self, field, name)
+
+        return super().__getitem__(name)
+
+    @classmethod
+    def preconfigure_tapeforms(cls):
+        """
+        Applies widget options, templates and CSS classes to a copy of the
+        `base_fields` of the form class, which replaces the `base_fields`. The
+        original fields are kept to configure them again if the class properties
+        change (e.g. in tests).
+        """
+        signature = get_plan_signature(cls)
+        if cls.__dict__.get("_tapeforms_preconfigured") == signature:
+            return
+
+        base_fields = cls.__dict__.get("_tapeforms_base_fields")
+        if base_fields is None:
+            base_fields = cls._tapeforms_base_fields = cls.base_fields
+
+        # Use an instance without initialization to call the (instance) methods.
+        form = cls.__new__(cls)
+        form.fields = copy.deepcopy(base_fields)
+        for field_name in form.fields:
+            form.init_tapeforms_field(field_name)
+            form.fields[field_name].widget._tapeforms_initialized = cls
+
+        cls.base_fields = form.fields
+        cls._tapeforms_preconfigured = signature
+
     def init_tapeforms(self, *args, **kwargs):
-        for field_name in self.fields:
-            self.apply_widget_options(field_name)
-            self.apply_widget_template(field_name)
-            self.apply_widget_css_class(field_name)
+        """
+        Applies widget options, templates and CSS classes to all fields of the form.
+        Fields which have been configured by `preconfigure_tapeforms` are skipped.
+        """
+        self.init_choice_cache()
+
+        for field_name, field in self.fields.items():
+            if getattr(field.widget, "_tapeforms_initialized", None) is not self.__class__:
+                self.init_tapeforms_field(field_name)
+
+        if self._tapeforms_lazy_fields is not None:
+            self._tapeforms_lazy_fields.update(self.fields)
+
+    def init_choice_cache(self):
+        """
+        Makes the model choice fields of the form use the shared choice cache if
+        `cache_model_choices` is enabled.
+        """
+        if not self.cache_model_choices or not getattr(
+            settings, "TAPEFORMS_CHOICE_CACHE", defaults.CHOICE_CACHE
+        ):
+            return
+
+        for field in self.fields.values():
+            if isinstance(field, ModelChoiceField):
+                apply_choice_cache(field)
+
+    def get_choice_fields(self):
+        """
+        Returns the fields of the form to prefetch the choices for in
+        `aprefetch_choices`.
+
+        :return: Iterable of form fields.
+        """
+        return self.fields.values()
+
+    def ensure_tapeforms_field(self, field_name):
+        """
+        Applies widget options, templates and CSS classes to a field which has not
+        been configured yet if `lazy_init_tapeforms` is enabled. If the form has
+        been cleaned already, an overridden `apply_widget_invalid_options` method
+        is called too.
+
+        :param field_name: A field name of the form.
+        """
+        lazy_fields = self._tapeforms_lazy_fields
+        if lazy_fields is None or field_name in lazy_fields:
+            return
+
+        lazy_fields.add(field_name)
+        widget = self.fields[field_name].widget
+        if getattr(widget, "_tapeforms_initialized", None) is not self.__class__:
+            self.init_tapeforms_field(field_name)
+
+        if self._errors and field_name in self._errors and self.has_widget_invalid_options():
+            self.apply_widget_invalid_options(field_name)
+
+    def init_tapeforms_field(self, field_name):
+        """
+        Applies widget options, templates and CSS classes to a field of the form.
+
+        :param field_name: A field name of the form.
+        """
+        self.apply_widget_options(field_name)
+        self.apply_widget_template(field_name)
+        self.apply_widget_css_class(field_name)
 
     def full_clean(self, *args, **kwargs):
         """
-        The full_clean method is hijacked to apply special treatment to invalid
-        field inputs. For example adding extra options/classes to widgets.
+        The full_clean method is hijacked to call `apply_widget_invalid_options` for
+        invalid field inputs if the method is overridden or the field returns its
+        own bound field. Otherwise, the widgets are not changed, the invalid
+        attributes are added when rendering (see `get_widget_invalid_attrs`).
         """
         super().full_clean(*args, **kwargs)
-        for field in self.errors:
-            if field != NON_FIELD_ERRORS:
+        if not self._errors:
+            return
+
+        apply_all = self.has_widget_invalid_options()
+        lazy_fields = self._tapeforms_lazy_fields
+        for field in self._errors:
+            if field == NON_FIELD_ERRORS or field not in self.fields:
+                continue
+
+            if not apply_all and uses_tapeform_bound_field(self.fields[field]):
+                continue
+
+            # Fields which are configured lazily get the invalid options later.
+            if lazy_fields is None or field in lazy_fields:
                 self.apply_widget_invalid_options(field)
 
+    def has_widget_invalid_options(self):
+        """
+        Returns `True` if `apply_widget_invalid_options` is overridden and has to be
+        called for invalid fields after cleaning the form.
+        """
+        return (
+            type(self).apply_widget_invalid_options
+            is not TapeformMixin.apply_widget_invalid_options
+        )
+
+    def get_render_plan(self):
+        """
+        Returns the render plan of the form class. The render plan memoizes the
+        results of the template and CSS class lookup methods per field name, field
+        class and widget class. It is shared by all instances of the form class.
+
+        :return: `RenderPlan` instance.
+        """
+        return get_render_plan(self)
+
+    def get_fragment_cache_key(self, template_name):
+        """
+        Returns the key to store the rendered HTML in the fragment cache.
+
+        Only unbound forms with `cache_tapeform` enabled are cached. The key is built
+        from the form class, prefix, initial data, active language, the used templates
+        and the fields of the form, including the values which are commonly changed
+        per instance (label, help text, widget template, input type and attributes,
+        choices and disabled state) and ``use_required_attribute``.
+        Forms with callable initial values or choices or with model choice fields are
+        never cached because their HTML might change at any time.
+
+        :param template_name: Layout template used to render the form.
+        :return: Cache key or `None` if the form should not be cached.
+        """
+        if not self.cache_tapeform or self.is_bound:
+            return None
+
+        plan = self.get_render_plan()
+        fields = []
+        for field_name, field in self.fields.items():
+            initial = self.initial.get(field_name, field.initial)
+            if callable(initial) or isinstance(field, ModelChoiceField):
+                return None
+
+            choices = getattr(field.widget, "choices", None)
+            if choices is not None and not isinstance(choices, (list, tuple)):
+                return None
+
+            fields.append(
+                (
+                    field_name,
+                    field.__class__,
+                    freeze_widget(field.widget),
+                    field.required,
+                    field.disabled,
+                    freeze_fragment_value(field.label),
+                    freeze_fragment_value(field.help_text),
+                    freeze_fragment_value(choices),
+                    freeze_fragment_value(initial),
+                    plan.get_field_template(self, self[field_name]),
+                )
+            )
+
+        return make_fragment_key(
+            self.__class__.__module__,
+            self.__class__.__qualname__,
+            self.prefix,
+            self.auto_id,
+            self.use_required_attribute,
+            get_language(),
+            template_name,
+            fields,
+        )
+
+    def get_token_placeholders(self):
+        """
+        Returns hidden inputs with placeholders for per-request tokens, rendered
+        together with the hidden fields.
+
+        By default, returns the CSRF token placeholder if `csrf_token_placeholder`
+        is enabled.
+
+        :return: List or tuple of hidden inputs as HTML.
+        """
+        if self.csrf_token_placeholder:
+            return (csrf_input_placeholder(),)
+
+        return ()
+
+    @plan_cached
     def get_field_template(self, bound_field, template_name=None):
         """
         Returns the field template to use when rendering a form field to HTML.
@@ -142,8 +545,10 @@ class TapeformMixin(TapeformLayoutMixin):
         1. Provided method argument `template_name`
         2. Template from `field_template_overrides` selected by field name
         3. Template from `field_template_overrides` selected by field class
-        4. Form class property `field_template`
-        5. Globally defined default template from `defaults.LAYOUT_FIELD_TEMPLATE`
+           (or the closest base class of the field class)
+        4. Template from `widget_theme` selected by widget class
+        5. Form class property `field_template`
+        6. Globally defined default template from `defaults.LAYOUT_FIELD_TEMPLATE`
 
         :param bound_field: `BoundField` instance to select a template for.
         :param template_name: Optional template to use instead of other configurations.
@@ -158,7 +563,13 @@ class TapeformMixin(TapeformLayoutMixin):
         if template_name:
             return template_name
 
-        template_name = templates.get(bound_field.field.__class__, None)
+        template_name = self.get_render_plan().get_class_override(
+            self, "field_template_overrides", bound_field.field.__class__
+        )
+        if template_name:
+            return template_name
+
+        template_name = self.get_widget_theme(bound_field.field.widget).get("field_template")
         if template_name:
             return template_name
 
@@ -167,35 +578,61 @@ class TapeformMixin(TapeformLayoutMixin):
 
         return defaults.FIELD_DEFAULT_TEMPLATE
 
+    @plan_cached
     def get_field_container_css_class(self, bound_field):
         """
         Returns the container CSS class to use when rendering a field template.
 
-        By default, returns the Form class property `field_container_css_class`.
+        By default, returns the Form class property `field_container_css_class`,
+        extended by the ``field_container_css_class`` of the `widget_theme` entry.
 
         :param bound_field: `BoundField` instance to return CSS class for.
         :return: A CSS class string.
         """
-        return self.field_container_css_class or None
+        class_name = self.field_container_css_class
+
+        theme_class_name = self.get_widget_theme(bound_field.field.widget).get(
+            "field_container_css_class"
+        )
+        if theme_class_name:
+            class_name = join_css_class(class_name, theme_class_name)
+
+        return class_name or None
 
+    @plan_cached
     def get_field_label_css_class(self, bound_field):
         """
         Returns the optional label CSS class to use when rendering a field template.
 
-        By default, returns the Form class property `field_label_css_class`. If the
-        field has errors and the Form class property `field_label_invalid_css_class`
-        is defined, its value is appended to the CSS class.
+        By default, returns the Form class property `field_label_css_class` (or the
+        ``field_label_css_class`` of the `widget_theme` entry). If the field has
+        errors and the Form class property `field_label_invalid_css_class` is
+        defined, its value is appended to the CSS class.
 
         :param bound_field: `BoundField` instance to return CSS class for.
         :return: A CSS class string or `None`
         """
-        class_name = self.field_label_css_class
+        theme = self.get_widget_theme(bound_field.field.widget)
+        class_name = theme.get("field_label_css_class", self.field_label_css_class)
 
         if bound_field.errors and self.field_label_invalid_css_class:
             class_name = join_css_class(class_name, self.field_label_invalid_css_class)
 
         return class_name or None
 
+    def get_widget_theme(self, widget):
+        """
+        Returns the `widget_theme` entry for the passed widget. The entry of the
+        widget class is used, falling back to the entry of the closest base class.
+
+        :param widget: `Widget` instance to return the theme options for.
+        :return: ``dict`` with theme options, might be empty.
+        """
+        theme = self.get_render_plan().get_class_override(
+            self, "widget_theme", widget.__class__
+        )
+        return theme or {}
+
     def get_field_context(self, bound_field):
         """
         Returns the context which is used when rendering a form field to HTML.
@@ -218,6 +655,9 @@ class TapeformMixin(TapeformLayoutMixin):
 
         :return: Template context for field rendering.
         """
+        self.ensure_tapeforms_field(bound_field.name)
+
+        plan = self.get_render_plan()
         widget = bound_field.field.widget
         widget_class_name = widget.__class__.__name__.lower()
 
@@ -235,9 +675,9 @@ class TapeformMixin(TapeformLayoutMixin):
             "errors": bound_field.errors,
             "required": bound_field.field.required,
             "label": bound_field.label,
-            "label_css_class": self.get_field_label_css_class(bound_field),
+            "label_css_class": plan.get_field_label_css_class(self, bound_field),
             "help_text": mark_safe(bound_field.help_text) if bound_field.help_text else None,
-            "container_css_class": self.get_field_container_css_class(bound_field),
+            "container_css_class": plan.get_field_container_css_class(self, bound_field),
             "widget_class_name": widget_class_name,
             "widget_input_type": getattr(widget, "input_type", None) or widget_class_name,
         }
@@ -271,11 +711,12 @@ class TapeformMixin(TapeformLayoutMixin):
         :param field_name: A field name of the form.
         """
         field = self.fields[field_name]
-        template_name = self.get_widget_template(field_name, field)
+        template_name = self.get_render_plan().get_widget_template(self, field_name, field)
 
         if template_name:
             field.widget.template_name = template_name
 
+    @plan_cached
     def get_widget_template(self, field_name, field):
         """
         Returns the optional widget template to use when rendering the widget
@@ -284,6 +725,7 @@ class TapeformMixin(TapeformLayoutMixin):
         Preference of template selection:
             1. Template from `widget_template_overrides` selected by field name
             2. Template from `widget_template_overrides` selected by widget class
+               (or the closest base class of the widget class)
 
         By default, returns `None` which means "use Django's default widget template".
 
@@ -297,7 +739,9 @@ class TapeformMixin(TapeformLayoutMixin):
         if template_name:
             return template_name
 
-        template_name = templates.get(field.widget.__class__, None)
+        template_name = self.get_render_plan().get_class_override(
+            self, "widget_template_overrides", field.widget.__class__
+        )
         if template_name:
             return template_name
 
@@ -314,32 +758,63 @@ class TapeformMixin(TapeformLayoutMixin):
         :param field_name: A field name of the form.
         """
         field = self.fields[field_name]
-        class_name = self.get_widget_css_class(field_name, field)
+        class_name = self.get_render_plan().get_widget_css_class(self, field_name, field)
 
         if class_name:
             field.widget.attrs["class"] = join_css_class(
                 field.widget.attrs.get("class", None), class_name
             )
 
+    @plan_cached
     def get_widget_css_class(self, field_name, field):
         """
         Returns the optional widget CSS class to use when rendering the
         form's field widget.
 
-        By default, returns `None` which means "no CSS class / no change".
+        By default, returns the Form class property `widget_css_class` (or the
+        ``widget_css_class`` of the `widget_theme` entry).
 
         :param field_name: The field name of the corresponding field for the widget.
         :param field: `Field` instance to return CSS class for.
         :return: A CSS class string or `None`
         """
-        return self.widget_css_class or None
+        theme = self.get_widget_theme(field.widget)
+        return theme.get("widget_css_class", self.widget_css_class) or None
+
+    def get_widget_invalid_attrs(self, field_name, field, attrs):
+        """
+        Returns the attributes to add when rendering the widget of an invalid field.
+        The attributes are passed to the widget when rendering, the widget itself is
+        not changed. This way, cleaning a form multiple times (or not rendering it
+        at all) doesn't touch the widgets.
+
+        By default, returns the ``aria-invalid`` attribute for accessibility and the
+        ``class`` attribute extended by the CSS class returned by
+        `get_widget_invalid_css_class` (if any).
+
+        :param field_name: The field name of the corresponding field for the widget.
+        :param field: `Field` instance to return the attributes for.
+        :param attrs: Attributes of the widget merged with the attributes passed to
+                      the widget when rendering.
+        :return: A ``dict`` of attributes.
+        """
+        invalid_attrs = {"aria-invalid": "true"}
+
+        class_name = self.get_widget_invalid_css_class(field_name, field)
+        if class_name:
+            invalid_attrs["class"] = join_css_class(attrs.get("class", None), class_name)
+
+        return invalid_attrs
 
     def apply_widget_invalid_options(self, field_name):
         """
         Applies additional widget options for an invalid field.
 
-        This method is called when there is some error on a field to apply
-        additional options on its widget. It does the following:
+        By default, the invalid attributes are added when rendering the field (see
+        `get_widget_invalid_attrs`) and this method is only called for fields which
+        return their own bound field. If you override this method, it is called for
+        every invalid field after cleaning the form. The default implementation does
+        the following:
 
         * Sets the aria-invalid property of the widget for accessibility.
         * Adds an invalid CSS class, which is determined by the returned value
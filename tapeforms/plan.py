@@ -0,0 +1,172 @@
+#: Form class properties which influence the results memoized in a render plan.
+#: If one of them changes, the render plan of the form class is rebuilt.
+PLAN_PROPERTIES = (
+    "field_template",
+    "field_template_overrides",
+    "field_container_css_class",
+    "field_label_css_class",
+    "field_label_invalid_css_class",
+    "widget_template_overrides",
+    "widget_css_class",
+    "widget_theme",
+)
+
+
+def plan_cached(func):
+    """
+    Marks a template or CSS class lookup method of a form as cacheable in the
+    render plan of the form class.
+
+    Only use this decorator if the returned value depends on nothing else than
+    the form class, the field name, the field class, the widget class and (for
+    bound fields) the fact whether the field has errors. Overridden methods
+    without this marker are called on every lookup.
+    """
+    func.plan_cached = True
+    return func
+
+
+def get_plan_signature(obj):
+    """
+    Returns the values of all properties which influence the render plan.
+    """
+    return tuple(getattr(obj, name, None) for name in PLAN_PROPERTIES)
+
+
+class RenderPlan:
+    """
+    Memoizes the results of the template and CSS class lookups of a form class.
+
+    The results are stored per field name, field class and widget class. This way,
+    most forms only pay for the lookups once per form class instead of once per
+    form instance. Lookup methods which are overridden without the ``plan_cached``
+    marker are called every time to make sure dynamic overrides still win.
+    """
+
+    def __init__(self, form_class, signature):
+        self.form_class = form_class
+        self.signature = signature
+        self.entries = {}
+
+    def lookup(self, form, method_name, key, *args):
+        """
+        Returns the memoized result of the lookup method `method_name` for the
+        given key. Calls the method on the form if no result is available yet.
+        """
+        method = getattr(form, method_name)
+        if not getattr(method, "plan_cached", False):
+            return method(*args)
+
+        key = (method_name, *key)
+        try:
+            return self.entries[key]
+        except KeyError:
+            value = self.entries[key] = method(*args)
+            return value
+
+    def get_class_override(self, form, property_name, klass):
+        """
+        Returns the value of the overrides ``dict`` in the form property
+        `property_name` for the passed class. If the class itself has no entry,
+        the bases of the class are checked in method resolution order. This way,
+        subclasses of a field or widget class use the override of the base class.
+        An entry with the value `None` stops the lookup for the class (and its
+        subclasses).
+
+        The result is memoized per class.
+
+        :param form: The form instance to take the overrides from.
+        :param property_name: Name of the form property with the overrides.
+        :param klass: The field or widget class to look up.
+        :return: The override value or `None`
+        """
+        key = ("get_class_override", property_name, klass)
+        try:
+            return self.entries[key]
+        except KeyError:
+            pass
+
+        overrides = getattr(form, property_name, None) or {}
+        value = next((overrides[base] for base in klass.__mro__ if base in overrides), None)
+        self.entries[key] = value
+        return value
+
+    def get_field_template(self, form, bound_field):
+        field = bound_field.field
+        return self.lookup(
+            form,
+            "get_field_template",
+            (bound_field.name, field.__class__, field.widget.__class__),
+            bound_field,
+        )
+
+    def get_field_container_css_class(self, form, bound_field):
+        field = bound_field.field
+        return self.lookup(
+            form,
+            "get_field_container_css_class",
+            (bound_field.name, field.__class__, field.widget.__class__),
+            bound_field,
+        )
+
+    def get_field_label_css_class(self, form, bound_field):
+        field = bound_field.field
+        return self.lookup(
+            form,
+            "get_field_label_css_class",
+            (
+                bound_field.name,
+                field.__class__,
+                field.widget.__class__,
+                bool(bound_field.errors),
+            ),
+            bound_field,
+        )
+
+    def get_widget_template(self, form, field_name, field):
+        return self.lookup(
+            form,
+            "get_widget_template",
+            (field_name, field.__class__, field.widget.__class__),
+            field_name,
+            field,
+        )
+
+    def get_widget_css_class(self, form, field_name, field):
+        return self.lookup(
+            form,
+            "get_widget_css_class",
+            (field_name, field.__class__, field.widget.__class__),
+            field_name,
+            field,
+        )
+
+
+def get_class_render_plan(form_class):
+    """
+    Returns the render plan shared by all instances of the passed form class.
+
+    The plan is created on first use and stored on the form class. It is rebuilt
+    when one of the `PLAN_PROPERTIES` of the class changes.
+    """
+    signature = get_plan_signature(form_class)
+
+    plan = form_class.__dict__.get("_tapeforms_render_plan")
+    if plan is not None and plan.signature == signature:
+        return plan
+
+    plan = form_class._tapeforms_render_plan = RenderPlan(form_class, signature)
+    return plan
+
+
+def get_render_plan(form):
+    """
+    Returns the render plan for the class of the passed form instance.
+
+    See `get_class_render_plan`. Forms which override one of the `PLAN_PROPERTIES`
+    on the instance get a private plan.
+    """
+    if any(name in form.__dict__ for name in PLAN_PROPERTIES):
+        return RenderPlan(form.__class__, get_plan_signature(form))
+
+    return get_class_render_plan(form.__class__)
@@ -0,0 +1,38 @@
+(function () {
+	'use strict';
+
+	// Loads the choices of autocomplete widgets (see tapeforms.autocomplete) while
+	// typing into the search input. Selected options are kept.
+	function search(input) {
+		var container = input.closest('[data-autocomplete-url]');
+		var select = container.querySelector('select');
+		var minLength = parseInt(container.dataset.autocompleteMinLength || '1', 10);
+		if (input.value.trim().length < minLength) {
+			return;
+		}
+
+		var url = new URL(container.dataset.autocompleteUrl, window.location.href);
+		url.searchParams.set('q', input.value);
+
+		fetch(url, {headers: {Accept: 'application/json'}})
+			.then(function (response) { return response.json(); })
+			.then(function (data) {
+				var options = Array.prototype.filter.call(select.options, function (option) {
+					return option.selected || option.value === '';
+				});
+				var values = options.map(function (option) { return option.value; });
+				data.results.forEach(function (result) {
+					if (values.indexOf(result.id) === -1) {
+						options.push(new Option(result.text, result.id));
+					}
+				});
+				select.replaceChildren.apply(select, options);
+			});
+	}
+
+	document.addEventListener('input', function (event) {
+		if (event.target.matches('.tapeforms-autocomplete-search')) {
+			search(event.target);
+		}
+	});
+})();
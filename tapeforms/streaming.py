@@ -0,0 +1,40 @@
+from .loader import render_to_string
+
+#: Name of the template context variable which collects the deferred fields and
+#: forms when a layout is rendered for streaming.
+STREAM_CONTEXT_KEY = "tapeforms_stream"
+
+#: Placeholder which is rendered in place of a deferred field or form.
+FIELD_MARKER = "\x00tapeforms-field\x00"
+
+
+def iter_layout(template_name, context):
+    """
+    Renders a layout template and yields the output in chunks.
+
+    The layout is rendered without its fields, the ``formfield`` template tag only
+    collects the fields to render. Afterwards, the parts of the layout are yielded
+    and every field is rendered right before it is yielded. Nested forms and
+    fieldsets (rendered using the ``form`` template tag, e.g. the forms of a
+    formset) are deferred the same way and streamed in chunks too.
+
+    :param template_name: The layout template to render.
+    :param context: Template context for the layout rendering.
+    :return: Generator which yields HTML chunks.
+    """
+    deferred = []
+    output = render_to_string(template_name, {**context, STREAM_CONTEXT_KEY: deferred})
+
+    parts = output.split(FIELD_MARKER)
+    for part, render in zip(parts, deferred):
+        if part:
+            yield part
+
+        rendered = render()
+        if isinstance(rendered, str):
+            yield rendered
+        else:
+            yield from rendered
+
+    if parts[-1]:
+        yield parts[-1]
@@ -1,7 +1,15 @@
+from functools import partial
+
+from asgiref.sync import sync_to_async
 from django import forms, template
-from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
 
+from ..fastrender import render_field
 from ..fieldsets import TapeformFieldset
+from ..fragments import render_fragment
+from ..loader import render_in_context, render_to_string
+from ..streaming import FIELD_MARKER, STREAM_CONTEXT_KEY, iter_layout
+from ..widgets import render_attrs, render_widget_options
 
 register = template.Library()
 
@@ -23,21 +31,51 @@ def form(context, form, **kwargs):
         {% load tapeforms %}
         {% form my_form using='other_form_layout_template.html' %}
 
+    The tag also renders formsets using the `TapeformFormsetMixin`::
+
+        {% load tapeforms %}
+        {% form my_formset %}
+
     :param form: The Django form to render.
     :return: Rendered form (errors + hidden fields + fields) as HTML.
     """
 
-    if not isinstance(form, (forms.BaseForm, TapeformFieldset)):
+    if not isinstance(form, (forms.BaseForm, forms.BaseFormSet, TapeformFieldset)):
         raise template.TemplateSyntaxError(
             f"Provided form should be a `Form` instance, actual type: {form.__class__.__name__}"
         )
 
-    return render_to_string(
-        form.get_layout_template(kwargs.get("using", None)),
-        form.get_layout_context(),
+    template_name = form.get_layout_template(kwargs.get("using", None))
+
+    # When streaming a layout, the form is streamed later on (see `iter_layout`).
+    deferred = context.get(STREAM_CONTEXT_KEY)
+    if deferred is not None:
+        deferred.append(partial(stream_form, form, template_name))
+        return mark_safe(FIELD_MARKER)
+
+    if form.single_pass_rendering:
+        return render_in_context(template_name, form.get_layout_context(), context)
+
+    return render_fragment(
+        form.get_fragment_cache_key(template_name),
+        lambda: render_to_string(template_name, form.get_layout_context()),
     )
 
 
+def stream_form(form, template_name):
+    """
+    Returns the cached fragment of the form or a generator which yields the HTML
+    of the form in chunks, used when a nested form is streamed.
+    """
+    cache_key = form.get_fragment_cache_key(template_name)
+    if cache_key is not None:
+        return render_fragment(
+            cache_key, lambda: render_to_string(template_name, form.get_layout_context())
+        )
+
+    return iter_layout(template_name, form.get_layout_context())
+
+
 @register.simple_tag(takes_context=True)
 def formfield(context, bound_field, **kwargs):
     """
@@ -64,7 +102,84 @@ def formfield(context, bound_field, **kwargs):
             f"Provided field should be a `BoundField` instance, actual type: {bound_field.__class__.__name__}"
         )
 
-    return render_to_string(
-        bound_field.form.get_field_template(bound_field, kwargs.get("using", None)),
-        bound_field.form.get_field_context(bound_field),
-    )
+    # When streaming a layout, the field is rendered later on (see `iter_layout`).
+    deferred_fields = context.get(STREAM_CONTEXT_KEY)
+    if deferred_fields is not None:
+        deferred_fields.append(partial(formfield, template.Context(), bound_field, **kwargs))
+        return mark_safe(FIELD_MARKER)
+
+    form = bound_field.form
+    template_name = kwargs.get("using", None)
+    if template_name:
+        template_name = form.get_field_template(bound_field, template_name)
+    else:
+        template_name = form.get_render_plan().get_field_template(form, bound_field)
+
+    field_context = form.get_field_context(bound_field)
+    if form.fast_field_rendering:
+        output = render_field(form, template_name, field_context)
+        if output is not None:
+            return output
+
+    if form.single_pass_rendering:
+        return render_in_context(template_name, field_context, context)
+
+    return render_to_string(template_name, field_context)
+
+
+@register.simple_tag
+def widget_attrs(attrs):
+    """
+    The `widget_attrs` template tag renders the attributes of a widget or an option
+    the same way as ``django/forms/widgets/attrs.html`` without including a template.
+
+    Usage::
+
+        {% load tapeforms %}
+        <input type="{{ option.type }}"{% widget_attrs option.attrs %}>
+
+    :param attrs: The attributes ``dict`` of the widget or option.
+    :return: Rendered attributes as HTML.
+    """
+    return mark_safe(render_attrs(attrs))
+
+
+@register.simple_tag
+def widget_options(widget):
+    """
+    The `widget_options` template tag renders all options of a choice widget in
+    Python, without including a template per option. Used in the templates of the
+    widgets in `tapeforms.widgets`.
+
+    Usage::
+
+        {% load tapeforms %}
+        <select name="{{ widget.name }}"{% widget_attrs widget.attrs %}>{% widget_options widget %}
+        </select>
+
+    :param widget: The widget context.
+    :return: Rendered options as HTML.
+    """
+    return render_widget_options(widget)
+
+
+async def aform(form_or_fieldset, **kwargs):
+    """
+    Async counterpart of the `form` template tag to render a form or fieldset
+    from async code (e.g. an async view) without blocking the event loop.
+
+    :param form_or_fieldset: The Django form or fieldset to render.
+    :return: Rendered form (errors + hidden fields + fields) as HTML.
+    """
+    return await sync_to_async(form)(template.Context(), form_or_fieldset, **kwargs)
+
+
+async def aformfield(bound_field, **kwargs):
+    """
+    Async counterpart of the `formfield` template tag to render a form field
+    from async code (e.g. an async view) without blocking the event loop.
+
+    :param bound_field: The `BoundField` from a Django form to render.
+    :return: Rendered field (label + widget + other stuff) as HTML.
+    """
+    return await sync_to_async(formfield)(template.Context(), bound_field, **kwargs)
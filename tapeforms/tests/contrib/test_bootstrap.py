@@ -1,5 +1,6 @@
 from django import VERSION as django_version
 from django import forms
+from django.forms.boundfield import BoundField
 
 from tapeforms.contrib.bootstrap import (
     Bootstrap4TapeformMixin,
@@ -28,6 +29,22 @@ class Dummy5Form(Bootstrap5TapeformMixin, DummyBaseForm):
     select_multiple = forms.MultipleChoiceField(choices=CHOICES)
 
 
+class Dummy4SinglePassForm(Dummy4Form):
+    single_pass_rendering = True
+
+
+class Dummy5SinglePassForm(Dummy5Form):
+    single_pass_rendering = True
+
+
+class Dummy4FastForm(Dummy4Form):
+    fast_field_rendering = True
+
+
+class Dummy5FastForm(Dummy5Form):
+    fast_field_rendering = True
+
+
 class TestBootstrap4TapeformMixin(FormFieldsSnapshotTestMixin):
     form_class = Dummy4Form
     snapshot_dir = "bootstrap4" if django_version[0] < 4 else "bootstrap4_django4"
@@ -35,8 +52,9 @@ class TestBootstrap4TapeformMixin(FormFieldsSnapshotTestMixin):
     def test_apply_widget_invalid_options(self):
         form = self.form_class({})
         assert "text" in form.errors
-        widget = form.fields["text"].widget
-        assert sorted(widget.attrs["class"].split(" ")) == ["form-control", "is-invalid"]
+        attrs = form["text"].build_widget_attrs({})
+        assert sorted(attrs["class"].split(" ")) == ["form-control", "is-invalid"]
+        assert form.fields["text"].widget.attrs["class"] == "form-control"
 
     def test_invalid_multiwidget_render(self):
         output = self.render_formfield(self.form_class({})["splitdatetime"])
@@ -50,3 +68,29 @@ class TestBootstrap5TapeformMixin(FormFieldsSnapshotTestMixin):
     def test_invalid_multiwidget_render(self):
         output = self.render_formfield(self.form_class({})["splitdatetime"])
         self.assertSnapshotMatch(output, "field_splitdatetime__invalid.html")
+
+    def test_invalid_custom_bound_field(self):
+        class DummyBoundFieldCharField(forms.CharField):
+            def get_bound_field(self, form, field_name):
+                return BoundField(form, self, field_name)
+
+        class DummyBoundFieldForm(self.form_class):
+            text = DummyBoundFieldCharField()
+
+        assert 'class="form-control is-invalid"' in str(DummyBoundFieldForm({})["text"])
+
+
+class TestBootstrap4SinglePassRendering(TestBootstrap4TapeformMixin):
+    form_class = Dummy4SinglePassForm
+
+
+class TestBootstrap5SinglePassRendering(TestBootstrap5TapeformMixin):
+    form_class = Dummy5SinglePassForm
+
+
+class TestBootstrap4FastFieldRendering(TestBootstrap4TapeformMixin):
+    form_class = Dummy4FastForm
+
+
+class TestBootstrap5FastFieldRendering(TestBootstrap5TapeformMixin):
+    form_class = Dummy5FastForm
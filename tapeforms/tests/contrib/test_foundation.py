@@ -19,6 +19,14 @@ class DummyFormWithProperties(DummyForm):
     field_template = "form-wide-field-template.html"
 
 
+class DummySinglePassForm(DummyForm):
+    single_pass_rendering = True
+
+
+class DummyFastForm(DummyForm):
+    fast_field_rendering = True
+
+
 class TestFoundationTapeformMixin(FormFieldsSnapshotTestMixin):
     form_class = DummyForm
     snapshot_dir = "foundation"
@@ -43,5 +51,15 @@ class TestFoundationTapeformMixin(FormFieldsSnapshotTestMixin):
         form = DummyForm({})
         assert "text" in form.errors
         assert form.get_field_label_css_class(form["text"]) == "is-invalid-label"
-        widget = form.fields["text"].widget
-        assert widget.attrs["class"] == "is-invalid-input"
+        assert form["text"].build_widget_attrs({})["class"] == "is-invalid-input"
+        assert "class" not in form.fields["text"].widget.attrs
+
+
+class TestFoundationSinglePassRendering(FormFieldsSnapshotTestMixin):
+    form_class = DummySinglePassForm
+    snapshot_dir = "foundation"
+
+
+class TestFoundationFastFieldRendering(FormFieldsSnapshotTestMixin):
+    form_class = DummyFastForm
+    snapshot_dir = "foundation"
@@ -0,0 +1,66 @@
+from asgiref.sync import async_to_sync
+from django import forms
+
+from tapeforms.fieldsets import TapeformFieldset, TapeformFieldsetsMixin
+from tapeforms.mixins import TapeformMixin
+from tapeforms.templatetags.tapeforms import aform, aformfield, form, formfield
+
+
+class DummyForm(TapeformFieldsetsMixin, TapeformMixin, forms.Form):
+    my_field1 = forms.CharField()
+    my_field2 = forms.CharField()
+    my_field3 = forms.CharField(widget=forms.HiddenInput)
+
+    fieldsets = [
+        {"fields": ("my_field1",), "title": "First"},
+        {"exclude": ("my_field1",)},
+    ]
+
+    def clean(self):
+        raise forms.ValidationError("Non field error!")
+
+
+class DummyModelChoiceForm(TapeformMixin, forms.Form):
+    my_field1 = forms.CharField()
+    my_field2 = forms.ModelChoiceField(queryset=None)
+
+
+class TestAsyncRendering:
+    def test_aas_tapeform(self):
+        assert async_to_sync(DummyForm({}).aas_tapeform)() == DummyForm({}).as_tapeform()
+
+    def test_fieldset_aas_tapeform(self):
+        fieldset = next(DummyForm({}).get_fieldsets())
+        other_fieldset = next(DummyForm({}).get_fieldsets())
+        assert async_to_sync(fieldset.aas_tapeform)() == other_fieldset.as_tapeform()
+
+    def test_arender_fieldsets(self):
+        rendered = async_to_sync(DummyForm({}).arender_fieldsets)()
+        assert rendered == [
+            fieldset.as_tapeform() for fieldset in DummyForm({}).get_fieldsets()
+        ]
+        assert "Non field error!" in rendered[0]
+        assert "Non field error!" not in rendered[1]
+
+    def test_arender_fieldsets_explicit(self):
+        rendered = async_to_sync(DummyForm().arender_fieldsets)([{"fields": ("my_field2",)}])
+        assert len(rendered) == 1
+        assert 'name="my_field2"' in rendered[0]
+        assert 'name="my_field1"' not in rendered[0]
+
+    def test_aform(self):
+        assert async_to_sync(aform)(DummyForm()) == form({}, DummyForm())
+
+    def test_aformfield(self):
+        bound_field = DummyForm()["my_field1"]
+        assert async_to_sync(aformfield)(bound_field) == formfield({}, bound_field)
+
+
+class TestUsesDatabase:
+    def test_without_model_choice_field(self):
+        fieldset = TapeformFieldset(DummyModelChoiceForm(), fields=("my_field1",))
+        assert fieldset.uses_database() is False
+
+    def test_with_model_choice_field(self):
+        fieldset = TapeformFieldset(DummyModelChoiceForm(), fields=("my_field2",))
+        assert fieldset.uses_database() is True
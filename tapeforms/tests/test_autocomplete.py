@@ -0,0 +1,217 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from django import forms
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.test import RequestFactory
+from django.utils import translation
+from django.utils.translation import gettext_lazy
+
+from tapeforms.autocomplete import (
+    AutocompleteSelect,
+    AutocompleteSelectMultiple,
+    AutocompleteView,
+    PrefixIndex,
+    autocomplete_sources,
+    get_autocomplete_source,
+    register_autocomplete_source,
+)
+from tapeforms.contrib.bootstrap import Bootstrap5TapeformMixin
+from tapeforms.mixins import TapeformMixin
+
+COUNTRIES = [
+    ("", "---"),
+    ("de", "Germany"),
+    ("gb", "United Kingdom"),
+    ("us", "United States"),
+    ("Other", [("ug", "Uganda"), ("ua", "Ukraine")]),
+]
+
+
+@pytest.fixture(autouse=True)
+def countries():
+    source = register_autocomplete_source("countries", COUNTRIES, allow_anonymous=True)
+    yield source
+    autocomplete_sources.clear()
+
+
+class DummyForm(TapeformMixin, forms.Form):
+    country = forms.ChoiceField(
+        choices=COUNTRIES, required=False, widget=AutocompleteSelect("countries", url="/ac/")
+    )
+    countries = forms.MultipleChoiceField(
+        choices=COUNTRIES, widget=AutocompleteSelectMultiple("countries", url="/ac/")
+    )
+
+
+class DummyBootstrapForm(Bootstrap5TapeformMixin, DummyForm):
+    pass
+
+
+def get_results(query, **kwargs):
+    request = RequestFactory().get("/", {"q": query})
+    response = AutocompleteView.as_view(**kwargs)(request, source="countries")
+    return json.loads(response.content)["results"]
+
+
+class TestPrefixIndex:
+    def test_search(self):
+        index = PrefixIndex(COUNTRIES)
+        assert index.search("u") == [
+            ("ug", "Uganda"),
+            ("ua", "Ukraine"),
+            ("gb", "United Kingdom"),
+            ("us", "United States"),
+        ]
+
+    def test_search_words(self):
+        index = PrefixIndex(COUNTRIES)
+        assert index.search("KING") == [("gb", "United Kingdom")]
+        assert index.search("united  st") == [("us", "United States")]
+
+    def test_search_ordered_by_matched_word(self):
+        index = PrefixIndex([("b", "Alpha Beta"), ("z", "Zeta Alpha")])
+        assert index.search("alpha") == [("z", "Zeta Alpha"), ("b", "Alpha Beta")]
+
+    def test_search_limit(self):
+        assert len(PrefixIndex(COUNTRIES).search("u", limit=2)) == 2
+
+    def test_search_empty(self):
+        index = PrefixIndex(COUNTRIES)
+        assert index.search("") == []
+        assert index.search("x") == []
+
+    def test_labels(self):
+        index = PrefixIndex(COUNTRIES)
+        assert len(index) == 5
+        assert index.labels["ua"] == "Ukraine"
+        assert "" not in index.labels
+
+    def test_large(self):
+        index = PrefixIndex([(i, f"Entry {i:05d}") for i in range(20000)])
+        assert index.search("entry 1999", limit=3) == [
+            ("19990", "Entry 19990"),
+            ("19991", "Entry 19991"),
+            ("19992", "Entry 19992"),
+        ]
+
+
+class TestAutocompleteSource:
+    def test_index_memoized(self, countries):
+        assert countries.get_index() is countries.get_index()
+
+    def test_invalidate(self, countries):
+        index = countries.get_index()
+        countries.invalidate()
+        assert countries.get_index() is not index
+
+    def test_callable(self):
+        choices = [("a", "Alpha")]
+        source = register_autocomplete_source("callable", lambda: choices, allow_anonymous=True)
+        assert source.search("al") == [("a", "Alpha")]
+        choices.append(("b", "Alpine"))
+        assert len(source.search("al")) == 1
+        source.invalidate()
+        assert len(source.search("al")) == 2
+
+    def test_per_language(self):
+        source = register_autocomplete_source(
+            "lazy", [("1", gettext_lazy("Yes"))], allow_anonymous=True
+        )
+        with translation.override("de"):
+            assert source.search("ja") == [("1", "Ja")]
+        with translation.override("en"):
+            assert source.search("ja") == []
+
+    def test_unknown(self):
+        with pytest.raises(KeyError):
+            get_autocomplete_source("unknown")
+
+
+class TestAutocompleteView:
+    def test_results(self):
+        assert get_results("uk") == [{"id": "ua", "text": "Ukraine"}]
+
+    def test_limit(self):
+        assert len(get_results("u", limit=3)) == 3
+
+    def test_unknown_source(self):
+        with pytest.raises(Http404):
+            AutocompleteView.as_view()(RequestFactory().get("/"), source="unknown")
+
+    def test_source_property(self):
+        request = RequestFactory().get("/", {"q": "ger"})
+        response = AutocompleteView.as_view(source="countries")(request)
+        assert json.loads(response.content) == {"results": [{"id": "de", "text": "Germany"}]}
+
+    def test_denied_by_default(self):
+        register_autocomplete_source("secret", COUNTRIES)
+        request = RequestFactory().get("/", {"q": "ger"})
+        request.user = SimpleNamespace(has_perm=lambda perm: True)
+        with pytest.raises(PermissionDenied):
+            AutocompleteView.as_view()(request, source="secret")
+
+    def test_permission_name(self):
+        register_autocomplete_source("secret", COUNTRIES, permission="app.view_secret")
+        request = RequestFactory().get("/", {"q": "ger"})
+        request.user = SimpleNamespace(has_perm=lambda perm: perm == "app.view_other")
+        with pytest.raises(PermissionDenied):
+            AutocompleteView.as_view()(request, source="secret")
+        request.user = SimpleNamespace(has_perm=lambda perm: perm == "app.view_secret")
+        assert AutocompleteView.as_view()(request, source="secret").status_code == 200
+
+    def test_permission_callable(self):
+        register_autocomplete_source("secret", COUNTRIES, permission=lambda request: False)
+        with pytest.raises(PermissionDenied):
+            AutocompleteView.as_view()(RequestFactory().get("/"), source="secret")
+
+    def test_permission_no_user(self):
+        register_autocomplete_source("secret", COUNTRIES, permission="app.view_secret")
+        with pytest.raises(PermissionDenied):
+            AutocompleteView.as_view()(RequestFactory().get("/"), source="secret")
+
+    def test_has_permission_overridden(self):
+        class DummyView(AutocompleteView):
+            def has_permission(self, request, source):
+                return source.name != "countries"
+
+        with pytest.raises(PermissionDenied):
+            DummyView.as_view()(RequestFactory().get("/"), source="countries")
+
+
+class TestAutocompleteSelect:
+    def test_only_selected_options(self):
+        output = str(DummyForm({"country": "gb", "countries": ["us", "ua"]})["country"])
+        assert '<option value="gb" selected>United Kingdom</option>' in output
+        assert '<option value=""></option>' in output
+        assert "Germany" not in output
+        assert 'data-autocomplete-url="/ac/"' in output
+
+    def test_multiple(self):
+        output = str(DummyForm({"countries": ["us", "ua"]})["countries"])
+        assert output.count("<option") == 2
+        assert 'value="us" selected' in output
+        assert 'value="ua" selected' in output
+        assert "multiple" in output
+
+    def test_unknown_value(self):
+        output = str(DummyForm({"country": "xx"})["country"])
+        assert "xx" not in output
+
+    def test_url(self, settings):
+        settings.ROOT_URLCONF = "tapeforms.urls"
+        assert AutocompleteSelect("countries").get_url() == "/countries/"
+
+    def test_media(self):
+        assert "tapeforms/autocomplete.js" in str(DummyForm().media)
+
+    def test_bootstrap_template(self):
+        form = DummyBootstrapForm()
+        assert form.fields["country"].widget.template_name == (
+            "tapeforms/widgets/bootstrap_autocomplete.html"
+        )
+        output = str(form["country"])
+        assert 'class="tapeforms-autocomplete-search form-control mb-1"' in output
+        assert 'class="form-select"' in output
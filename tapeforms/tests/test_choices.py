@@ -0,0 +1,242 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django import forms
+from django.core.signals import request_finished, request_started
+from django.db import connection, models
+from django.db.models.deletion import Collector
+from django.forms.models import ModelChoiceIterator
+from django.test import override_settings
+
+from tapeforms.choices import (
+    CachedModelChoiceIterator,
+    aprefetch_model_choices,
+    choice_cache,
+    get_queryset_version,
+    make_choice_key,
+)
+from tapeforms.fieldsets import TapeformFieldset
+from tapeforms.formsets import TapeformFormsetMixin
+from tapeforms.mixins import TapeformMixin
+
+
+class DummyCategory(models.Model):
+    name = models.CharField(max_length=32)
+
+    class Meta:
+        app_label = "tapeforms"
+        ordering = ("name",)
+
+    def __str__(self):
+        return self.name
+
+
+class DummyProxyCategory(DummyCategory):
+    class Meta:
+        app_label = "tapeforms"
+        proxy = True
+
+
+class DummyTag(models.Model):
+    name = models.CharField(max_length=32)
+
+    class Meta:
+        app_label = "tapeforms"
+
+
+class DummyChoiceForm(TapeformMixin, forms.Form):
+    category = forms.ModelChoiceField(queryset=DummyCategory.objects.all())
+    categories = forms.ModelMultipleChoiceField(queryset=DummyCategory.objects.all())
+
+
+class DummyUncachedChoiceForm(DummyChoiceForm):
+    cache_model_choices = False
+
+
+class DummyChoiceFormset(TapeformFormsetMixin, forms.BaseFormSet):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def clear_choice_cache():
+    choice_cache.clear()
+    yield
+    choice_cache.clear()
+
+
+@pytest.fixture
+def request_scope(db):
+    request_started.send(sender=None)
+    yield
+    request_finished.send(sender=None)
+
+
+@pytest.fixture(scope="module")
+def category_table(django_db_setup, django_db_blocker):
+    # The tapeforms app has no models module, the table isn't created by Django.
+    with django_db_blocker.unblock():
+        with connection.schema_editor() as schema_editor:
+            schema_editor.create_model(DummyCategory)
+        yield
+        with connection.schema_editor() as schema_editor:
+            schema_editor.delete_model(DummyCategory)
+
+
+@pytest.fixture
+def categories(category_table, db):
+    return [DummyCategory.objects.create(name=name) for name in ("a", "b")]
+
+
+def render_choices(form):
+    return [str(form["category"]), str(form["categories"])]
+
+
+class TestChoiceCache:
+    def test_iterator_applied(self):
+        form = DummyChoiceForm()
+        assert form.fields["category"].iterator is CachedModelChoiceIterator
+        assert form.fields["categories"].iterator is CachedModelChoiceIterator
+        assert DummyUncachedChoiceForm().fields["category"].iterator is ModelChoiceIterator
+
+    @override_settings(TAPEFORMS_CHOICE_CACHE=False)
+    def test_disabled_by_setting(self):
+        assert DummyChoiceForm().fields["category"].iterator is ModelChoiceIterator
+
+    def test_not_cached_outside_request(self, categories, django_assert_num_queries):
+        # The required select iterates the choices twice (see use_required_attribute).
+        with django_assert_num_queries(6):
+            render_choices(DummyChoiceForm())
+            render_choices(DummyChoiceForm())
+
+    def test_cached_in_request(self, categories, request_scope, django_assert_num_queries):
+        with django_assert_num_queries(2):
+            output = render_choices(DummyChoiceForm())
+            assert render_choices(DummyChoiceForm()) == output
+        assert '<option value="1">a</option>' in output[0]
+
+    def test_same_output_as_uncached(self, categories, request_scope):
+        form = DummyChoiceForm({"category": categories[1].pk})
+        uncached_form = DummyUncachedChoiceForm({"category": categories[1].pk})
+        assert render_choices(form) == render_choices(uncached_form)
+        assert form.fields["category"].clean(categories[1].pk) == categories[1]
+
+    def test_shared_by_formset(self, categories, request_scope, django_assert_num_queries):
+        formset_class = forms.formset_factory(
+            DummyChoiceForm, formset=DummyChoiceFormset, extra=10
+        )
+        with django_assert_num_queries(2):
+            formset_class().as_tapeform()
+
+    def test_new_request(self, categories, django_assert_num_queries):
+        with django_assert_num_queries(4):
+            for _ in range(2):
+                request_started.send(sender=None)
+                render_choices(DummyChoiceForm())
+                render_choices(DummyChoiceForm())
+                request_finished.send(sender=None)
+
+    def test_invalidated_on_save(self, categories, request_scope):
+        assert ">c<" not in render_choices(DummyChoiceForm())[0]
+        DummyCategory.objects.create(name="c")
+        assert ">c<" in render_choices(DummyChoiceForm())[0]
+
+    def test_invalidated_on_delete(self, categories, request_scope):
+        assert ">b<" in render_choices(DummyChoiceForm())[0]
+        categories[1].delete()
+        assert ">b<" not in render_choices(DummyChoiceForm())[0]
+
+    @override_settings(TAPEFORMS_CHOICE_CACHE_TIMEOUT=60)
+    def test_timeout(self, categories, django_assert_num_queries):
+        with django_assert_num_queries(2):
+            render_choices(DummyChoiceForm())
+            render_choices(DummyChoiceForm())
+
+    @override_settings(TAPEFORMS_CHOICE_CACHE_TIMEOUT=0)
+    def test_timeout_expired(self, categories, django_assert_num_queries):
+        with django_assert_num_queries(6):
+            render_choices(DummyChoiceForm())
+            render_choices(DummyChoiceForm())
+
+    def test_changed_queryset(self, categories, request_scope):
+        form = DummyChoiceForm()
+        form.fields["category"].queryset = DummyCategory.objects.filter(name="b")
+        output = str(form["category"])
+        assert ">b<" in output
+        assert ">a<" not in output
+        assert ">a<" in str(DummyChoiceForm()["category"])
+
+
+class TestMakeChoiceKey:
+    def test_no_request(self):
+        assert make_choice_key(DummyChoiceForm().fields["category"]) is None
+
+    def test_empty_queryset(self, request_scope):
+        field = DummyChoiceForm().fields["category"]
+        field.queryset = DummyCategory.objects.none()
+        assert make_choice_key(field) is None
+
+    def test_label_from_instance(self, request_scope):
+        field = DummyChoiceForm().fields["category"]
+        assert make_choice_key(field) is not None
+        field.label_from_instance = lambda obj: obj.pk
+        assert make_choice_key(field) is None
+
+    def test_empty_label(self, request_scope):
+        form = DummyChoiceForm()
+        assert make_choice_key(form.fields["category"]) != make_choice_key(
+            form.fields["categories"]
+        )
+
+    def test_version(self, categories):
+        version = get_queryset_version(DummyCategory.objects.all())
+        categories[0].save()
+        assert get_queryset_version(DummyCategory.objects.all()) != version
+
+
+class TestAprefetchChoices:
+    def test_no_queries_when_rendering(self, categories, django_assert_num_queries):
+        form = DummyChoiceForm({"category": categories[1].pk})
+        # Validation queries the selected category, it's not part of the prefetch.
+        form.full_clean()
+        async_to_sync(form.aprefetch_choices)()
+        with django_assert_num_queries(0):
+            output = render_choices(form)
+        assert output == render_choices(DummyUncachedChoiceForm({"category": categories[1].pk}))
+
+    def test_formset_shares_queries(self, categories, django_assert_num_queries):
+        formset = forms.formset_factory(DummyChoiceForm, formset=DummyChoiceFormset, extra=5)()
+        # One query per distinct choices (with and without empty label).
+        with django_assert_num_queries(2):
+            async_to_sync(formset.aprefetch_choices)()
+        with django_assert_num_queries(0):
+            for form in formset.forms:
+                render_choices(form)
+
+    def test_fieldset(self, categories, django_assert_num_queries):
+        form = DummyChoiceForm()
+        fieldset = TapeformFieldset(form, fields=("category",), primary=True)
+        with django_assert_num_queries(1):
+            async_to_sync(fieldset.aprefetch_choices)()
+        with django_assert_num_queries(0):
+            str(form["category"])
+        assert not isinstance(form.fields["categories"].widget.choices, list)
+
+    def test_stored_in_cache(self, categories, request_scope, django_assert_num_queries):
+        async_to_sync(DummyChoiceForm().aprefetch_choices)()
+        with django_assert_num_queries(0):
+            render_choices(DummyChoiceForm())
+
+    def test_label_from_instance(self, categories):
+        field = forms.ModelChoiceField(queryset=DummyCategory.objects.all())
+        field.label_from_instance = lambda obj: obj.name.upper()
+        async_to_sync(aprefetch_model_choices)([field, forms.CharField()])
+        assert [str(label) for _value, label in field.widget.choices] == ["---------", "A", "B"]
+
+    def test_version_proxy_model(self, categories):
+        version = get_queryset_version(DummyCategory.objects.all())
+        DummyProxyCategory.objects.create(name="c")
+        assert get_queryset_version(DummyCategory.objects.all()) != version
+
+    def test_receivers_only_for_cached_models(self):
+        get_queryset_version(DummyCategory.objects.all())
+        assert not Collector(using="default").can_fast_delete(DummyCategory.objects.all())
+        assert Collector(using="default").can_fast_delete(DummyTag.objects.all())
@@ -0,0 +1,111 @@
+import pytest
+from django import forms
+from django.template import Context, Template
+from django.test import override_settings
+
+from tapeforms.contrib.bootstrap import Bootstrap4TapeformMixin, Bootstrap5TapeformMixin
+from tapeforms.contrib.foundation import FoundationTapeformMixin
+from tapeforms.fastrender import get_field_builder, render_field
+from tapeforms.loader import template_cache
+from tapeforms.mixins import TapeformMixin
+
+
+class DummyBaseForm(forms.Form):
+    required_css_class = "required-row"
+    error_css_class = "error-row"
+
+    text = forms.CharField(label="Text <&>", help_text="Some <b>help</b>")
+    checkbox = forms.BooleanField()
+    number = forms.IntegerField(
+        required=False, widget=forms.NumberInput(attrs={"id": "custom"})
+    )
+    choice = forms.ChoiceField(choices=(("foo", "Foo"), ("bar", "Bar")))
+    multiple = forms.MultipleChoiceField(
+        choices=(("foo", "Foo"), ("bar", "Bar")), widget=forms.CheckboxSelectMultiple
+    )
+    splitdatetime = forms.SplitDateTimeField(required=False)
+
+    def clean_text(self):
+        raise forms.ValidationError("Invalid <text> & more")
+
+
+class DummyForm(TapeformMixin, DummyBaseForm):
+    fast_field_rendering = True
+
+
+class DummyBootstrap4Form(Bootstrap4TapeformMixin, DummyBaseForm):
+    fast_field_rendering = True
+
+
+class DummyBootstrap5Form(Bootstrap5TapeformMixin, DummyBaseForm):
+    fast_field_rendering = True
+
+
+class DummyFoundationForm(FoundationTapeformMixin, DummyBaseForm):
+    fast_field_rendering = True
+    field_label_css_class = "custom-label"
+
+
+class DummyContextForm(DummyForm):
+    def get_field_context(self, bound_field):
+        context = super().get_field_context(bound_field)
+        context["pre_label"] = "Pre"
+        return context
+
+
+FORM_CLASSES = [DummyForm, DummyBootstrap4Form, DummyBootstrap5Form, DummyFoundationForm]
+
+
+def render_formfield(field):
+    return Template("{% load tapeforms %}{% formfield field %}").render(
+        Context({"field": field})
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_template_cache():
+    template_cache.clear()
+
+
+class TestFastRender:
+    @pytest.mark.parametrize("form_class", FORM_CLASSES)
+    @pytest.mark.parametrize("data", [None, {"number": "foo", "text": "<bar>"}])
+    def test_output_identical(self, form_class, data):
+        form = form_class(data)
+        engine_form = type("EngineForm", (form_class,), {"fast_field_rendering": False})(data)
+
+        for field_name in form.fields:
+            output = render_formfield(form[field_name])
+            assert output == render_formfield(engine_form[field_name])
+
+    @pytest.mark.parametrize("form_class", FORM_CLASSES)
+    def test_builder_used(self, form_class):
+        form = form_class()
+        template_name = form.get_field_template(form["text"])
+        assert get_field_builder(form, template_name) is not None
+
+    def test_unknown_template(self):
+        form = DummyForm()
+        assert render_field(form, "other.html", form.get_field_context(form["text"])) is None
+
+    def test_foundation_fieldset_uses_engine(self):
+        form = DummyFoundationForm()
+        assert get_field_builder(form, form.get_field_template(form["multiple"])) is None
+        assert "<fieldset" in render_formfield(form["multiple"])
+
+    def test_overridden_field_context_uses_engine(self):
+        form = DummyContextForm()
+        assert get_field_builder(form, "tapeforms/fields/default.html") is None
+        assert "\tPre\n" in render_formfield(form["text"])
+
+    def test_overridden_template_uses_engine(self, tmp_path, settings):
+        template_dir = tmp_path / "tapeforms" / "includes"
+        template_dir.mkdir(parents=True)
+        (template_dir / "label_tag.html").write_text("<label>Custom {{ label }}</label>")
+
+        with override_settings(TEMPLATES=[{**settings.TEMPLATES[0], "DIRS": [str(tmp_path)]}]):
+            form = DummyForm()
+            assert get_field_builder(form, "tapeforms/fields/default.html") is None
+            assert "<label>Custom Text &lt;&amp;&gt;</label>" in render_formfield(form["text"])
+
+        assert get_field_builder(form, "tapeforms/fields/default.html") is not None
@@ -1,6 +1,15 @@
+from unittest import mock
+
+import pytest
 from django import forms
+from django.core.exceptions import ImproperlyConfigured
 
-from tapeforms.fieldsets import TapeformFieldset, TapeformFieldsetsMixin
+from tapeforms.fieldsets import (
+    TapeformFieldset,
+    TapeformFieldsetsMixin,
+    compile_fieldsets,
+    compile_layout,
+)
 from tapeforms.mixins import TapeformMixin
 
 
@@ -46,6 +55,30 @@ class TestTapeformFieldset:
         fieldset = TapeformFieldset(form, fields=("my_field1",), template="fieldset.html")
         assert fieldset.layout_template == "fieldset.html"
 
+    def test_slots(self):
+        fieldset = TapeformFieldset(DummyForm(), fields=("my_field1",))
+        assert not hasattr(fieldset, "__dict__")
+        assert isinstance(fieldset.visible_fields(), tuple)
+        assert isinstance(fieldset.visible_fields()[0], tuple)
+
+    def test_subclass_layout_template(self):
+        class DummyFieldset(TapeformFieldset):
+            layout_template = "subclass-fieldset.html"
+
+        assert DummyFieldset.layout_template == "subclass-fieldset.html"
+        fieldset = DummyFieldset(DummyForm(), fields=("my_field1",))
+        assert fieldset.layout_template == "subclass-fieldset.html"
+        fieldset = DummyFieldset(DummyForm(), fields=("my_field1",), template="fieldset.html")
+        assert fieldset.layout_template == "fieldset.html"
+
+    def test_subclass_attributes(self):
+        class DummyFieldset(TapeformFieldset):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.custom = "foo"
+
+        assert DummyFieldset(DummyForm(), fields=("my_field1",)).custom == "foo"
+
     def test_repr(self):
         form = DummyForm()
         fieldset = TapeformFieldset(form, exclude=("my_field3",))
@@ -71,6 +104,13 @@ class TestTapeformFieldset:
         fieldset = TapeformFieldset(form, fields=("my_field1",), primary=True)
         assert len(fieldset.non_field_errors()) == 1
 
+    def test_layout_context_add_error(self):
+        form = DummyForm(data={})
+        fieldset = TapeformFieldset(form, fields=("my_field1",), primary=True)
+        assert len(fieldset.get_layout_context()["errors"]) == 2
+        form.add_error(None, "Late error")
+        assert len(fieldset.get_layout_context()["errors"]) == 3
+
     def test_non_field_errors_not_primary(self):
         form = DummyForm(data={})
         fieldset = TapeformFieldset(form, fields=("my_field1",), primary=False)
@@ -101,6 +141,45 @@ class TestTapeformFieldset:
         assert [f.name for f in fieldset.visible_fields()[0]] == ["my_field1"]
         assert [f.name for f in fieldset.visible_fields()[1]] == ["my_field2", "my_field4"]
 
+    def test_visible_fields_memoized(self):
+        form = DummyForm()
+        fieldset = TapeformFieldset(form, exclude=("my_field1",))
+        rows = fieldset.visible_fields()
+        with mock.patch.object(form, "visible_fields") as visible_fields_mock:
+            assert fieldset.visible_fields() == rows
+        assert visible_fields_mock.call_count == 0
+        assert fieldset.visible_fields() is rows
+
+    def test_visible_fields_field_added(self):
+        form = DummyForm()
+        fieldset = TapeformFieldset(form, exclude=("my_field1",), primary=True)
+        fieldset.get_layout_context()
+        form.fields["my_field5"] = forms.CharField()
+        assert [f.name for f in fieldset.visible_fields()[-1]] == ["my_field5"]
+        assert 'name="my_field5"' in fieldset.as_tapeform()
+
+    def test_get_layout(self):
+        fieldset = TapeformFieldset(
+            DummyForm(), fields=["my_field1", ["my_field2", "my_field4"]], exclude=["my_field4"]
+        )
+        assert fieldset.get_layout() == (("my_field1",), ("my_field2",))
+
+    def test_get_layout_shared(self):
+        layout = TapeformFieldset(DummyForm(), exclude=("my_field1",)).get_layout()
+        assert layout == (("my_field2",), ("my_field4",))
+        assert TapeformFieldset(DummyForm(), exclude=("my_field1",)).get_layout() is layout
+
+
+class TestCompileLayout:
+    def test_fields(self):
+        assert compile_layout((("a",), ("b", "c")), frozenset()) == (("a",), ("b", "c"))
+
+    def test_exclude(self):
+        assert compile_layout((("a",), ("b", "c")), frozenset(("a", "c"))) == (("b",),)
+
+    def test_visible_names(self):
+        assert compile_layout((), frozenset(("b",)), ("a", "b", "c")) == (("a",), ("c",))
+
 
 class TestTapeformFieldsetsMixin:
     def test_get_fieldset_class(self):
@@ -138,3 +217,106 @@ class TestTapeformFieldsetsMixin:
         assert len(fieldsets) == 2
         assert fieldsets[0].primary_fieldset is False
         assert fieldsets[1].primary_fieldset is True
+
+    def test_get_fieldsets_cached(self):
+        form = DummyFormWithFieldsets()
+        fieldsets = list(form.get_fieldsets())
+        assert list(form.get_fieldsets()) == fieldsets
+        assert list(DummyFormWithFieldsets().get_fieldsets()) != fieldsets
+
+    def test_get_fieldsets_argument(self):
+        form = DummyFormWithFieldsets()
+        fieldsets = list(form.get_fieldsets([{"fields": ("my_field2",)}]))
+        assert len(fieldsets) == 1
+        assert fieldsets[0].primary_fieldset is True
+        assert fieldsets[0].render_fields == ("my_field2",)
+        assert list(form.get_fieldsets([{"fields": ("my_field2",)}])) != fieldsets
+
+    def test_get_fieldset_specs_compiled_once(self):
+        form = DummyFormWithFieldsets()
+        specs = form.get_fieldset_specs()
+        assert DummyFormWithFieldsets().get_fieldset_specs() is specs
+        assert specs[0]["primary"] is True
+
+    def test_get_fieldset_specs_instance_override(self):
+        form = DummyFormWithFieldsets()
+        form.fieldsets = [{"fields": ("my_field2",)}]
+        assert form.get_fieldset_specs()[0]["fields"] == ("my_field2",)
+
+    def test_get_fieldsets_extra(self):
+        extra = {"headline": "Foo"}
+
+        class DummyFormWithExtra(TapeformFieldsetsMixin, DummyForm):
+            fieldsets = [{"fields": ("my_field1",), "extra": extra}]
+
+        fieldset = next(DummyFormWithExtra().get_fieldsets())
+        extra["headline"] = "Changed"
+        assert fieldset.extra["headline"] == "Foo"
+        with pytest.raises(TypeError):
+            fieldset.extra["headline"] = "Bar"
+
+    def test_invalid_fieldsets(self):
+        with pytest.raises(ImproperlyConfigured, match="DummyInvalidForm"):
+
+            class DummyInvalidForm(TapeformFieldsetsMixin, DummyForm):
+                fieldsets = [{"fields": "my_field1"}]
+
+    def test_invalid_fieldsets_type(self):
+        with pytest.raises(ImproperlyConfigured, match="expected a list or tuple, got dict"):
+
+            class DummyInvalidForm(TapeformFieldsetsMixin, DummyForm):
+                fieldsets = {"fields": ["my_field1"]}
+
+
+class TestCompileFieldsets:
+    def test_compile(self):
+        specs = compile_fieldsets(
+            [{"fields": ["my_field1", ["my_field2", "my_field4"]]}, {"exclude": ["my_field1"]}]
+        )
+        assert dict(specs[0]) == {
+            "fields": ("my_field1", ("my_field2", "my_field4")),
+            "exclude": (),
+            "primary": True,
+        }
+        assert dict(specs[1]) == {"fields": (), "exclude": ("my_field1",)}
+
+    def test_explicit_primary(self):
+        specs = compile_fieldsets([{}, {"primary": True}])
+        assert "primary" not in specs[0]
+        assert specs[1]["primary"] is True
+
+    def test_read_only(self):
+        spec = compile_fieldsets([{"extra": {"foo": "bar"}}])[0]
+        with pytest.raises(TypeError):
+            spec["primary"] = False
+        with pytest.raises(TypeError):
+            spec["extra"]["foo"] = "baz"
+
+    @pytest.mark.parametrize(
+        "fieldsets",
+        [
+            {"fields": ("my_field1",)},
+            ["my_field1"],
+            [{"fields": "my_field1"}],
+            [{"fields": (("my_field1", 1),)}],
+            [{"exclude": "my_field1"}],
+            [{"extra": "foo"}],
+        ],
+    )
+    def test_invalid(self, fieldsets):
+        with pytest.raises(ImproperlyConfigured):
+            compile_fieldsets(fieldsets)
+
+
+class TestLazyInitFieldsets:
+    def test_only_rendered_fields_configured(self):
+        class DummyLazyFieldsetsForm(DummyFormWithFieldsets):
+            lazy_init_tapeforms = True
+            widget_css_class = "widget"
+
+        form = DummyLazyFieldsetsForm()
+        fieldset = next(form.get_fieldsets())
+        fieldset.as_tapeform()
+        assert form.fields["my_field1"].widget.attrs["class"] == "widget"
+        assert form.fields["my_field2"].widget.attrs.get("class") is None
+        assert form.fields["my_field4"].widget.attrs.get("class") is None
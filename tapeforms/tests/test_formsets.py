@@ -0,0 +1,136 @@
+from unittest import mock
+
+import pytest
+from django import forms
+from django.template import Context, Template
+
+from tapeforms.formsets import TapeformFormsetMixin
+from tapeforms.mixins import TapeformMixin
+
+
+class DummyForm(TapeformMixin, forms.Form):
+    my_field1 = forms.CharField()
+    my_field2 = forms.IntegerField(required=False)
+
+
+class DummyBaseFormSet(TapeformFormsetMixin, forms.BaseFormSet):
+    def clean(self):
+        raise forms.ValidationError("Non form error!")
+
+
+DummyFormSet = forms.formset_factory(DummyForm, formset=DummyBaseFormSet, extra=2)
+
+
+class TestTapeformFormsetMixin:
+    def test_get_layout_template(self):
+        formset = DummyFormSet()
+        assert formset.get_layout_template() == "tapeforms/formsets/default.html"
+
+    def test_get_layout_template_property(self):
+        formset = DummyFormSet()
+        formset.layout_template = "formset.html"
+        assert formset.get_layout_template() == "formset.html"
+
+    def test_get_layout_template_argument(self):
+        formset = DummyFormSet()
+        assert formset.get_layout_template("other.html") == "other.html"
+
+    def test_get_layout_context(self):
+        formset = DummyFormSet()
+        context = formset.get_layout_context()
+        assert context["formset"] is formset
+        assert context["errors"] == []
+        assert context["management_form"].prefix == "form"
+        assert len(context["forms"]) == 2
+
+    def test_get_render_plan_shared(self):
+        formset = DummyFormSet()
+        plan = formset.get_render_plan()
+        assert all(form.get_render_plan() is plan for form in formset.forms)
+        assert formset.empty_form.get_render_plan() is plan
+
+    def test_forms_configured_once(self):
+        class DummyOnceForm(DummyForm):
+            widget_css_class = "widget"
+
+        class DummyPreconfiguredFormSet(DummyBaseFormSet):
+            preconfigure_forms = True
+
+        formset_class = forms.formset_factory(
+            DummyOnceForm, formset=DummyPreconfiguredFormSet, extra=5
+        )
+        with mock.patch.object(
+            DummyOnceForm,
+            "init_tapeforms_field",
+            autospec=True,
+            side_effect=DummyOnceForm.init_tapeforms_field,
+        ) as init_mock:
+            formset = formset_class()
+            formset.as_tapeform()
+        assert init_mock.call_count == 2
+        assert all(
+            form.fields["my_field1"].widget.attrs["class"] == "widget" for form in formset.forms
+        )
+        assert formset.forms[0].fields["my_field1"] is not formset.forms[1].fields["my_field1"]
+
+    def test_preconfigure_forms_disabled(self):
+        class DummyEagerForm(DummyForm):
+            pass
+
+        formset_class = forms.formset_factory(DummyEagerForm, formset=DummyBaseFormSet, extra=5)
+        with mock.patch.object(
+            DummyEagerForm, "init_tapeforms_field", autospec=True
+        ) as init_mock:
+            formset_class().as_tapeform()
+        assert init_mock.call_count == 10
+
+    def test_instance_dependent_widget_options(self):
+        class DummyInstanceForm(DummyForm):
+            def apply_widget_options(self, field_name):
+                super().apply_widget_options(field_name)
+                initial = self.initial.get(field_name, "x")
+                self.fields[field_name].widget.attrs["data-row"] = f"{self.prefix}-{initial}"
+
+        formset_class = forms.formset_factory(
+            DummyInstanceForm, formset=DummyBaseFormSet, extra=2
+        )
+        formset = formset_class(initial=[{"my_field1": "a"}])
+        assert formset.forms[0].fields["my_field1"].widget.attrs["data-row"] == "form-0-a"
+        assert formset.forms[1].fields["my_field1"].widget.attrs["data-row"] == "form-1-x"
+        standalone = DummyInstanceForm(prefix="p")
+        assert standalone.fields["my_field1"].widget.attrs["data-row"] == "p-x"
+        assert "_tapeforms_preconfigured" not in DummyInstanceForm.__dict__
+
+    def test_render_empty_form(self):
+        formset = DummyFormSet()
+        assert "__prefix__" not in formset.as_tapeform()
+        formset.render_empty_form = True
+        html = formset.as_tapeform()
+        assert '<template class="formset-empty-form" data-prefix="form">' in html
+        assert 'name="form-__prefix__-my_field1"' in html
+
+    def test_as_tapeform(self):
+        html = DummyFormSet().as_tapeform()
+        assert 'name="form-TOTAL_FORMS"' in html
+        assert html.count('name="form-0-my_field1"') == 1
+        assert html.count('name="form-1-my_field1"') == 1
+        assert html.count('class="form-field form-field-my_field1') == 2
+
+    def test_as_tapeform_errors(self):
+        formset = DummyFormSet(
+            {
+                "form-TOTAL_FORMS": "1",
+                "form-INITIAL_FORMS": "0",
+                "form-0-my_field2": "foo",
+            }
+        )
+        html = formset.as_tapeform()
+        assert "<li>Non form error!</li>" in html
+        assert "<li>Enter a whole number.</li>" in html
+
+    @pytest.mark.parametrize("single_pass_rendering", [False, True])
+    def test_form_tag(self, single_pass_rendering):
+        formset = DummyFormSet()
+        formset.single_pass_rendering = single_pass_rendering
+        template = Template("{% load tapeforms %}{% form formset %}")
+        assert template.render(Context({"formset": formset})) == DummyFormSet().as_tapeform()
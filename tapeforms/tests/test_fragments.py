@@ -0,0 +1,199 @@
+from unittest import mock
+
+import pytest
+from django import forms
+from django.core.cache import caches
+from django.template import Context, Template
+from django.test import override_settings
+from django.utils import translation
+
+from tapeforms.fragments import fragment_cache, get_fragment_cache, render_fragment
+from tapeforms.mixins import TapeformMixin
+
+
+@pytest.fixture(autouse=True)
+def clear_fragment_cache():
+    fragment_cache.clear()
+    yield
+    fragment_cache.clear()
+
+
+class DummyForm(TapeformMixin, forms.Form):
+    cache_tapeform = True
+
+    my_field1 = forms.CharField()
+    my_field2 = forms.IntegerField(required=False)
+
+
+class DummyUncachedForm(DummyForm):
+    cache_tapeform = False
+
+
+class DummyCallableInitialForm(DummyForm):
+    my_field2 = forms.IntegerField(initial=lambda: 42)
+
+
+class DummyChoiceForm(DummyForm):
+    my_field2 = forms.ChoiceField(choices=[(1, "One")])
+
+
+class DummyModelChoiceForm(DummyForm):
+    my_field2 = forms.ModelChoiceField(queryset=None)
+
+
+class TestFragmentCache:
+    def test_get_fragment_cache_default(self):
+        assert get_fragment_cache() is fragment_cache
+
+    @override_settings(TAPEFORMS_FRAGMENT_CACHE="default")
+    def test_get_fragment_cache_django(self):
+        assert get_fragment_cache() is caches["default"]
+
+    def test_render_fragment_without_key(self):
+        render = mock.Mock(return_value="html")
+        assert render_fragment(None, render) == "html"
+        assert render_fragment(None, render) == "html"
+        assert render.call_count == 2
+        assert len(fragment_cache) == 0
+
+    def test_render_fragment(self):
+        render = mock.Mock(return_value="html")
+        assert render_fragment("key", render) == "html"
+        assert render_fragment("key", render) == "html"
+        assert render.call_count == 1
+
+    @override_settings(TAPEFORMS_FRAGMENT_CACHE_SIZE=1)
+    def test_size_limit(self):
+        render_fragment("key1", lambda: "html1")
+        render_fragment("key2", lambda: "html2")
+        assert len(fragment_cache) == 1
+
+    @override_settings(TAPEFORMS_FRAGMENT_CACHE="default")
+    def test_django_cache(self):
+        caches["default"].clear()
+        render_fragment("key", lambda: "html")
+        assert caches["default"].get("key") == "html"
+        assert len(fragment_cache) == 0
+
+
+class TestGetFragmentCacheKey:
+    def test_stable(self):
+        key = DummyForm().get_fragment_cache_key("layout.html")
+        assert key.startswith("tapeforms.fragment.")
+        assert DummyForm().get_fragment_cache_key("layout.html") == key
+
+    def test_disabled(self):
+        assert DummyUncachedForm().get_fragment_cache_key("layout.html") is None
+
+    def test_bound(self):
+        assert DummyForm({}).get_fragment_cache_key("layout.html") is None
+
+    def test_callable_initial(self):
+        assert DummyCallableInitialForm().get_fragment_cache_key("layout.html") is None
+
+    def test_model_choice_field(self):
+        assert DummyModelChoiceForm().get_fragment_cache_key("layout.html") is None
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"prefix": "other"},
+            {"initial": {"my_field1": "foo"}},
+            {"auto_id": "custom_%s"},
+            {"use_required_attribute": False},
+        ],
+    )
+    def test_form_arguments(self, kwargs):
+        key = DummyForm().get_fragment_cache_key("layout.html")
+        assert DummyForm(**kwargs).get_fragment_cache_key("layout.html") != key
+
+    @pytest.mark.parametrize(
+        "attribute, value",
+        [
+            ("label", "Secret of user 1"),
+            ("help_text", "Alice"),
+            ("disabled", True),
+        ],
+    )
+    def test_field_attributes(self, attribute, value):
+        key = DummyForm().get_fragment_cache_key("layout.html")
+        form = DummyForm()
+        setattr(form.fields["my_field1"], attribute, value)
+        assert form.get_fragment_cache_key("layout.html") != key
+
+    @pytest.mark.parametrize(
+        "attribute, value",
+        [
+            ("attrs", {"placeholder": "Alice"}),
+            ("template_name", "other-widget.html"),
+            ("input_type", "email"),
+        ],
+    )
+    def test_widget_state(self, attribute, value):
+        key = DummyForm().get_fragment_cache_key("layout.html")
+        form = DummyForm()
+        setattr(form.fields["my_field1"].widget, attribute, value)
+        assert form.get_fragment_cache_key("layout.html") != key
+
+    def test_use_required_attribute_rendered(self):
+        assert " required" in DummyForm().as_tapeform()
+        assert " required" not in DummyForm(use_required_attribute=False).as_tapeform()
+
+    def test_choices(self):
+        key = DummyChoiceForm().get_fragment_cache_key("layout.html")
+        form = DummyChoiceForm()
+        form.fields["my_field2"].choices = [(True, "One")]
+        assert form.get_fragment_cache_key("layout.html") != key
+
+    def test_callable_choices(self):
+        form = DummyChoiceForm()
+        form.fields["my_field2"].choices = lambda: [(1, "One")]
+        assert form.get_fragment_cache_key("layout.html") is None
+
+    def test_lazy_label(self):
+        form = DummyForm()
+        form.fields["my_field1"].label = translation.gettext_lazy("Yes")
+        with translation.override("de"):
+            key = form.get_fragment_cache_key("layout.html")
+            other_form = DummyForm()
+            other_form.fields["my_field1"].label = translation.gettext_lazy("Yes")
+            assert other_form.get_fragment_cache_key("layout.html") == key
+
+    def test_template_name(self):
+        key = DummyForm().get_fragment_cache_key("layout.html")
+        assert DummyForm().get_fragment_cache_key("other.html") != key
+
+    def test_language(self):
+        with translation.override("en"):
+            key = DummyForm().get_fragment_cache_key("layout.html")
+        with translation.override("de"):
+            assert DummyForm().get_fragment_cache_key("layout.html") != key
+
+
+class TestCachedRendering:
+    def test_as_tapeform(self):
+        html = DummyForm().as_tapeform()
+        with mock.patch("tapeforms.mixins.render_to_string") as render_mock:
+            assert DummyForm().as_tapeform() == html
+        assert render_mock.call_count == 0
+        assert len(fragment_cache) == 1
+
+    def test_per_instance_label(self):
+        form = DummyForm()
+        form.fields["my_field1"].label = "Secret of user 1"
+        form.as_tapeform()
+        other_form = DummyForm()
+        other_form.fields["my_field1"].label = "Bob"
+        assert "Secret of user 1" not in other_form.as_tapeform()
+
+    def test_as_tapeform_bound(self):
+        DummyForm({}).as_tapeform()
+        assert len(fragment_cache) == 0
+
+    def test_form_tag(self):
+        template = Template("{% load tapeforms %}{% form form %}")
+        html = template.render(Context({"form": DummyForm()}))
+        with mock.patch("tapeforms.templatetags.tapeforms.render_to_string") as render_mock:
+            assert template.render(Context({"form": DummyForm()})) == html
+        assert render_mock.call_count == 0
+        assert html == DummyUncachedForm().as_tapeform()
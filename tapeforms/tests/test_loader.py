@@ -0,0 +1,61 @@
+import pytest
+from django.test import override_settings
+
+from tapeforms.loader import get_template, render_to_string, template_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_template_cache():
+    template_cache.clear()
+    yield
+    template_cache.clear()
+
+
+class TestTemplateCache:
+    def test_get_template_cached(self):
+        template = get_template("tapeforms/includes/errorlist.html")
+        assert template_cache.misses == 1
+        assert get_template("tapeforms/includes/errorlist.html") is template
+        assert template_cache.hits == 1
+        assert len(template_cache) == 1
+
+    def test_get_template_keyed_by_engine(self):
+        template = get_template("tapeforms/includes/errorlist.html")
+        assert get_template("tapeforms/includes/errorlist.html", using="django") is not template
+        assert len(template_cache) == 2
+
+    def test_get_template_list(self):
+        template = get_template(["missing.html", "tapeforms/includes/errorlist.html"])
+        assert template.origin.template_name == "tapeforms/includes/errorlist.html"
+        assert get_template(("missing.html", "tapeforms/includes/errorlist.html")) is template
+
+    def test_clear(self):
+        get_template("tapeforms/includes/errorlist.html")
+        template_cache.clear()
+        assert len(template_cache) == 0
+        assert template_cache.hits == 0
+        assert template_cache.misses == 0
+
+    @override_settings(TAPEFORMS_TEMPLATE_CACHE_SIZE=1)
+    def test_size_limit(self):
+        get_template("tapeforms/includes/errorlist.html")
+        get_template("tapeforms/includes/label_tag.html")
+        assert len(template_cache) == 1
+        assert "tapeforms/includes/label_tag.html" in [key[1] for key in template_cache._data]
+
+    @override_settings(TAPEFORMS_TEMPLATE_CACHE_SIZE=0)
+    def test_disabled(self):
+        template = get_template("tapeforms/includes/errorlist.html")
+        assert get_template("tapeforms/includes/errorlist.html") is not template
+        assert len(template_cache) == 0
+
+    def test_cleared_on_templates_change(self):
+        get_template("tapeforms/includes/errorlist.html")
+        with override_settings(TEMPLATES=[]):
+            assert len(template_cache) == 0
+
+    def test_render_to_string(self):
+        assert render_to_string("tapeforms/includes/errorlist.html", {"errors": []}) == "\n"
+        output = render_to_string("tapeforms/includes/errorlist.html", {"errors": ["Foo"]})
+        assert "<li>Foo</li>" in output
+        assert template_cache.hits == 1
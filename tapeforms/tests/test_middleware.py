@@ -0,0 +1,58 @@
+import re
+
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from tapeforms.middleware import TokenPlaceholderMiddleware
+from tapeforms.tokens import (
+    csrf_input_placeholder,
+    get_placeholder,
+    stream_token_placeholders,
+)
+
+
+def get_csrf_token(content):
+    return re.search(r'name="csrfmiddlewaretoken" value="(\w+)"', content).group(1)
+
+
+def get_response(response):
+    request = RequestFactory().get("/")
+    return request, TokenPlaceholderMiddleware(lambda request: response)(request)
+
+
+class TestTokenPlaceholderMiddleware:
+    def test_html(self):
+        request, response = get_response(
+            HttpResponse(f"<form>{csrf_input_placeholder()}</form>")
+        )
+        assert get_placeholder("csrf_token").encode() not in response.content
+        assert request.META["CSRF_COOKIE"]
+        assert len(get_csrf_token(response.content.decode())) == 64
+
+    def test_content_length(self):
+        response = HttpResponse(csrf_input_placeholder())
+        response.headers["Content-Length"] = str(len(response.content))
+        request, response = get_response(response)
+        assert response.headers["Content-Length"] == str(len(response.content))
+
+    def test_other_content_type(self):
+        request, response = get_response(JsonResponse({"token": get_placeholder("csrf_token")}))
+        assert get_placeholder("csrf_token").encode() in response.content
+        assert "CSRF_COOKIE" not in request.META
+
+    def test_streaming(self):
+        request, response = get_response(
+            stream_token_placeholders(
+                StreamingHttpResponse(["<form>", csrf_input_placeholder(), "</form>"])
+            )
+        )
+        assert request.META["CSRF_COOKIE"]
+        content = b"".join(response.streaming_content).decode()
+        assert content.startswith("<form><input")
+        assert len(get_csrf_token(content)) == 64
+
+    def test_streaming_not_marked(self):
+        request, response = get_response(StreamingHttpResponse(["<form>", "</form>"]))
+        assert b"".join(response.streaming_content) == b"<form></form>"
+        assert "CSRF_COOKIE" not in request.META
+        assert not response.has_header("Vary")
@@ -3,8 +3,10 @@ from unittest import mock
 from django import forms
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.forms.boundfield import BoundField
 from django.utils.safestring import SafeText
 
+from tapeforms.boundfield import TapeformBoundField, TapeformBoundFieldMixin
 from tapeforms.mixins import TapeformMixin
 
 
@@ -39,6 +41,64 @@ class DummyFormWithProperties(DummyForm):
     widget_invalid_css_class = "invalid-widget"
 
 
+class DummyIntegerField(forms.IntegerField):
+    pass
+
+
+class DummyNumberInput(forms.NumberInput):
+    pass
+
+
+class DummyBoundField(BoundField):
+    pass
+
+
+class DummyBoundFieldCharField(forms.CharField):
+    def get_bound_field(self, form, field_name):
+        return DummyBoundField(form, self, field_name)
+
+
+class DummyBoundFieldForm(DummyFormWithProperties):
+    my_field1 = DummyBoundFieldCharField(widget=forms.TextInput(attrs={"class": "my-css"}))
+
+
+class DummySubclassForm(DummyFormWithProperties):
+    my_field4 = DummyIntegerField(widget=DummyNumberInput)
+
+
+class DummyThemeForm(TapeformMixin, forms.Form):
+    field_container_css_class = "container"
+    field_label_css_class = "label"
+    field_label_invalid_css_class = "invalid-label"
+    widget_css_class = "widget"
+    widget_theme = {
+        forms.CheckboxInput: {
+            "widget_css_class": "checkbox",
+            "field_container_css_class": "container-checkbox",
+            "field_label_css_class": "label-checkbox",
+        },
+        forms.RadioSelect: {"field_template": "radio-template.html"},
+        forms.CheckboxSelectMultiple: {},
+    }
+
+    my_field1 = forms.CharField()
+    my_field2 = forms.BooleanField(widget=forms.CheckboxInput)
+    my_field3 = forms.ChoiceField(choices=(("a", "A"),), widget=forms.RadioSelect)
+    my_field4 = forms.MultipleChoiceField(
+        choices=(("a", "A"),), widget=forms.CheckboxSelectMultiple
+    )
+
+
+class DummyPreconfiguredForm(DummyForm):
+    preconfigure_base_fields = True
+    widget_css_class = "widget"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["my_dynamic"] = forms.CharField()
+        self.init_tapeforms_field("my_dynamic")
+
+
 class DateTimeDummyForm(TapeformMixin, forms.Form):
     date_field = forms.DateField(widget=forms.DateInput)
     time_field = forms.TimeField(widget=forms.TimeInput)
@@ -49,6 +109,14 @@ class DeferredDateTimeDummyForm(DateTimeDummyForm):
     defer_init_tapeforms = True
 
 
+class DummyLazyForm(DummyForm):
+    lazy_init_tapeforms = True
+    widget_css_class = "widget"
+    widget_invalid_css_class = "invalid"
+
+    my_date = forms.DateField(required=False)
+
+
 class DummyModel(models.Model):
     my_validated_field = models.PositiveIntegerField(
         blank=True, null=True, validators=[MinValueValidator(10)]
@@ -107,6 +175,51 @@ class TestLayoutMethods:
         # First non field errors, then hidden field errors.
         assert list(context["errors"]) == ["Non field error!", "This field is required."]
 
+    def test_get_layout_context_idempotent(self):
+        form = DummyForm(data={"my_field1": "foo"})
+        form.get_layout_context()
+        context = form.get_layout_context()
+        assert list(context["errors"]) == ["Non field error!", "This field is required."]
+        assert list(form.non_field_errors()) == ["Non field error!"]
+        assert form.as_tapeform() == DummyForm(data={"my_field1": "foo"}).as_tapeform()
+
+    def test_get_layout_context_memoized(self):
+        form = DummyForm()
+        context = form.get_layout_context()
+        with mock.patch.object(form, "hidden_fields") as hidden_fields_mock:
+            assert form.get_layout_context() == context
+        assert hidden_fields_mock.call_count == 0
+
+    def test_get_layout_context_copy(self):
+        form = DummyForm()
+        form.get_layout_context()["extra"] = "foo"
+        assert "extra" not in form.get_layout_context()
+
+    def test_get_layout_context_full_clean(self):
+        form = DummyForm(data={"my_field1": "foo"})
+        assert len(form.get_layout_context()["errors"]) == 2
+        form.data = {"my_field1": "foo", "my_hidden": "bar", "my_field2": "baz", "my_field3": 1}
+        form.full_clean()
+        assert len(form.get_layout_context()["errors"]) == 0
+
+    def test_get_layout_context_add_error(self):
+        form = DummyForm(data={"my_field1": "foo"})
+        form.as_tapeform()
+        form.add_error(None, "Late error")
+        assert "Late error" in form.as_tapeform()
+
+    def test_get_layout_context_field_removed(self):
+        form = DummyForm()
+        assert 'name="my_field2"' in form.as_tapeform()
+        del form.fields["my_field2"]
+        assert 'name="my_field2"' not in form.as_tapeform()
+
+    def test_get_layout_context_field_added(self):
+        form = DummyForm()
+        form.as_tapeform()
+        form.fields["my_field5"] = forms.CharField()
+        assert 'name="my_field5"' in form.as_tapeform()
+
 
 class TestFieldMethods:
     def test_get_field_template_argument(self):
@@ -124,6 +237,10 @@ class TestFieldMethods:
         form = DummyFormWithProperties()
         assert form.get_field_template(form["my_field3"]) == "integer-template.html"
 
+    def test_get_field_template_base_class_override(self):
+        form = DummySubclassForm()
+        assert form.get_field_template(form["my_field4"]) == "integer-template.html"
+
     def test_get_field_template_property(self):
         form = DummyFormWithProperties()
         assert form.get_field_template(form["my_field1"]) == "form-wide-field-template.html"
@@ -231,6 +348,10 @@ class TestWidgetMethods:
             == "integer-widget.html"
         )
 
+    def test_get_widget_template_base_class_override(self):
+        form = DummySubclassForm()
+        assert form.fields["my_field4"].widget.template_name == "integer-widget.html"
+
     def test_get_widget_template_default(self):
         form = DummyFormWithProperties()
         assert form.get_widget_template("my_field1", form.fields["my_field1"]) is None
@@ -246,25 +367,277 @@ class TestWidgetMethods:
         form = DummyForm()
         assert form.get_widget_css_class("my_field1", form.fields["my_field1"]) is None
 
-    def test_apply_widget_invalid_options_css_class(self):
+    def test_get_widget_invalid_attrs_css_class(self):
         form = DummyFormWithProperties({})
         assert "my_field1" in form.errors
-        widget = form.fields["my_field1"].widget
-        assert sorted(widget.attrs["class"].split(" ")) == [
+        attrs = form["my_field1"].build_widget_attrs({})
+        assert sorted(attrs["class"].split(" ")) == [
             "invalid-widget",
             "my-css",
             "some-widget-cssclass",
         ]
+        assert "invalid-widget" not in form.fields["my_field1"].widget.attrs["class"]
 
-    def test_apply_widget_invalid_options_default(self):
+    def test_get_widget_invalid_attrs_default(self):
         form = DummyForm({})
         assert "my_field1" in form.errors
-        widget = form.fields["my_field1"].widget
-        assert widget.attrs["aria-invalid"] == "true"
-        assert widget.attrs["class"] == "my-css"
+        attrs = form["my_field1"].build_widget_attrs({})
+        assert attrs["aria-invalid"] == "true"
+        assert "class" not in attrs
+        assert "aria-invalid" not in form.fields["my_field1"].widget.attrs
 
-    def test_apply_widget_invalid_options_model_validator(self):
+    def test_get_widget_invalid_attrs_passed_class(self):
+        form = DummyFormWithProperties({})
+        assert form.get_widget_invalid_attrs(
+            "my_field1", form.fields["my_field1"], {"class": "passed"}
+        ) == {"aria-invalid": "true", "class": "passed invalid-widget"}
+
+    def test_get_widget_invalid_attrs_show_hidden_initial(self):
+        class DummyHiddenInitialForm(TapeformMixin, forms.Form):
+            my_field1 = forms.CharField(show_hidden_initial=True)
+            my_field2 = forms.CharField(widget=forms.HiddenInput)
+
+        form = DummyHiddenInitialForm({})
+        assert "my_field1" in form.errors
+        assert "my_field2" in form.errors
+        assert 'aria-invalid="true"' in form["my_field1"].as_widget()
+        assert "aria-invalid" not in form["my_field1"].as_hidden(only_initial=True)
+        assert "aria-invalid" not in str(form["my_field2"])
+
+    def test_get_widget_invalid_attrs_model_validator(self):
         form = DummyModelForm({"my_validated_field": 1})
         assert "my_validated_field" in form.errors
-        widget = form.fields["my_validated_field"].widget
-        assert widget.attrs["class"] == "invalid-widget"
+        attrs = form["my_validated_field"].build_widget_attrs({})
+        assert attrs["class"] == "invalid-widget"
+
+    def test_get_widget_invalid_attrs_rendered(self):
+        form = DummyFormWithProperties({})
+        assert "invalid-widget" in str(form["my_field1"])
+        assert 'aria-invalid="true"' in str(form["my_field1"])
+        assert "invalid-widget" not in str(DummyFormWithProperties()["my_field1"])
+
+    def test_full_clean_idempotent(self):
+        form = DummyFormWithProperties({})
+        attrs = dict(form.fields["my_field1"].widget.attrs)
+        form.full_clean()
+        form.full_clean()
+        assert form.fields["my_field1"].widget.attrs == attrs
+
+    def test_apply_widget_invalid_options_overridden(self):
+        class DummyOverrideForm(DummyForm):
+            def apply_widget_invalid_options(self, field_name):
+                super().apply_widget_invalid_options(field_name)
+                self.fields[field_name].widget.attrs["data-invalid"] = "yes"
+
+        form = DummyOverrideForm({})
+        assert form.errors
+        assert form.fields["my_field1"].widget.attrs["data-invalid"] == "yes"
+        assert form.fields["my_field1"].widget.attrs["aria-invalid"] == "true"
+        assert "data-invalid" not in DummyForm({}).fields["my_field1"].widget.attrs
+
+    def test_field_bound_field_class(self):
+        field = forms.CharField()
+        field.bound_field_class = DummyBoundField
+        form = DummyFormWithProperties({})
+        form.fields["my_field1"] = field
+        bound_field = form["my_field1"]
+        assert isinstance(bound_field, DummyBoundField)
+        assert isinstance(bound_field, TapeformBoundFieldMixin)
+        assert 'aria-invalid="true"' in str(bound_field)
+        assert "aria-invalid" not in field.widget.attrs
+
+    def test_form_bound_field_class(self):
+        class DummyBoundFieldClassForm(DummyForm):
+            bound_field_class = DummyBoundField
+
+        form = DummyBoundFieldClassForm({})
+        assert type(form["my_field1"]) is type(form["my_field2"])
+        assert isinstance(form["my_field1"], DummyBoundField)
+        assert 'aria-invalid="true"' in str(form["my_field1"])
+        assert type(DummyBoundFieldClassForm()["my_field1"]) is type(form["my_field1"])
+
+    def test_custom_bound_field_invalid(self):
+        form = DummyBoundFieldForm({})
+        assert isinstance(form["my_field1"], DummyBoundField)
+        html = str(form["my_field1"])
+        assert 'class="my-css some-widget-cssclass invalid-widget"' in html
+        assert 'aria-invalid="true"' in html
+        assert "aria-invalid" not in form.fields["my_field2"].widget.attrs
+
+
+class TestWidgetTheme:
+    def test_get_widget_theme(self):
+        form = DummyThemeForm()
+        assert (
+            form.get_widget_theme(forms.CheckboxInput())
+            == (DummyThemeForm.widget_theme[forms.CheckboxInput])
+        )
+        assert form.get_widget_theme(forms.TextInput()) == {}
+
+    def test_get_widget_theme_base_class(self):
+        class DummyCheckboxInput(forms.CheckboxInput):
+            pass
+
+        form = DummyThemeForm()
+        assert form.get_widget_theme(DummyCheckboxInput())["widget_css_class"] == "checkbox"
+
+    def test_get_widget_theme_closest_base_class(self):
+        form = DummyThemeForm()
+        assert form.get_widget_theme(forms.CheckboxSelectMultiple()) == {}
+
+    def test_widget_css_class(self):
+        form = DummyThemeForm()
+        assert form.fields["my_field1"].widget.attrs["class"] == "widget"
+        assert form.fields["my_field2"].widget.attrs["class"] == "checkbox"
+
+    def test_field_container_css_class(self):
+        form = DummyThemeForm()
+        assert form.get_field_container_css_class(form["my_field1"]) == "container"
+        assert sorted(form.get_field_container_css_class(form["my_field2"]).split()) == [
+            "container",
+            "container-checkbox",
+        ]
+
+    def test_field_label_css_class(self):
+        form = DummyThemeForm()
+        assert form.get_field_label_css_class(form["my_field1"]) == "label"
+        assert form.get_field_label_css_class(form["my_field2"]) == "label-checkbox"
+        form = DummyThemeForm({})
+        assert sorted(form.get_field_label_css_class(form["my_field2"]).split()) == [
+            "invalid-label",
+            "label-checkbox",
+        ]
+
+    def test_field_template(self):
+        form = DummyThemeForm()
+        assert form.get_field_template(form["my_field1"]) == "tapeforms/fields/default.html"
+        assert form.get_field_template(form["my_field3"]) == "radio-template.html"
+        assert form.get_field_template(form["my_field4"]) == "tapeforms/fields/default.html"
+
+    def test_field_template_precedence(self):
+        form = DummyThemeForm()
+        form.field_template_overrides = {"my_field3": "name-template.html"}
+        assert form.get_field_template(form["my_field3"]) == "name-template.html"
+        assert form.get_field_template(form["my_field3"], "arg.html") == "arg.html"
+
+
+class TestPreconfigureBaseFields:
+    def test_base_fields_configured(self):
+        DummyPreconfiguredForm()
+        widget = DummyPreconfiguredForm.base_fields["my_field1"].widget
+        assert widget.attrs["class"] == "my-css widget"
+        assert widget._tapeforms_initialized is DummyPreconfiguredForm
+
+    def test_parent_class_unchanged(self):
+        DummyPreconfiguredForm()
+        assert DummyForm.base_fields["my_field1"].widget.attrs["class"] == "my-css"
+        assert DummyForm().fields["my_field1"].widget.attrs["class"] == "my-css"
+
+    def test_instance_fields(self):
+        form = DummyPreconfiguredForm()
+        assert form.fields["my_field1"].widget.attrs["class"] == "my-css widget"
+        assert form.fields["my_field2"].widget.attrs["class"] == "widget"
+        assert form.fields["my_field1"] is not DummyPreconfiguredForm.base_fields["my_field1"]
+
+    def test_instance_skips_configured_fields(self):
+        DummyPreconfiguredForm()
+        with mock.patch.object(
+            DummyPreconfiguredForm, "init_tapeforms_field", autospec=True
+        ) as init_mock:
+            DummyPreconfiguredForm()
+        assert [call.args[1] for call in init_mock.call_args_list] == ["my_dynamic"]
+
+    def test_dynamic_fields(self):
+        form = DummyPreconfiguredForm()
+        assert form.fields["my_dynamic"].widget.attrs["class"] == "widget"
+
+    def test_reconfigured_on_class_change(self):
+        DummyPreconfiguredForm()
+        with mock.patch.object(DummyPreconfiguredForm, "widget_css_class", "changed"):
+            form = DummyPreconfiguredForm()
+            assert form.fields["my_field1"].widget.attrs["class"] == "my-css changed"
+        form = DummyPreconfiguredForm()
+        assert form.fields["my_field1"].widget.attrs["class"] == "my-css widget"
+
+    def test_invalid_options_per_instance(self):
+        form = DummyPreconfiguredForm({})
+        assert form.errors
+        assert form["my_field1"].build_widget_attrs({})["aria-invalid"] == "true"
+        widget = DummyPreconfiguredForm.base_fields["my_field1"].widget
+        assert "aria-invalid" not in widget.attrs
+
+
+class TestLazyInitTapeforms:
+    def test_not_configured_on_init(self):
+        form = DummyLazyForm()
+        assert form.fields["my_field1"].widget.attrs["class"] == "my-css"
+        assert form.fields["my_date"].widget.input_type == "text"
+
+    def test_bound_field_class(self):
+        form = DummyLazyForm()
+        assert isinstance(form["my_field1"], TapeformBoundField)
+
+    def test_configured_on_render(self):
+        form = DummyLazyForm()
+        html = str(form["my_field1"])
+        assert 'class="my-css widget"' in html
+        assert form.fields["my_field1"].widget.attrs["class"] == "my-css widget"
+        assert form.fields["my_field2"].widget.attrs.get("class") is None
+
+    def test_configured_once(self):
+        form = DummyLazyForm()
+        with mock.patch.object(
+            DummyLazyForm, "init_tapeforms_field", autospec=True
+        ) as init_mock:
+            str(form["my_field1"])
+            str(form["my_field1"])
+        assert init_mock.call_count == 1
+
+    def test_configured_by_field_context(self):
+        form = DummyLazyForm()
+        context = form.get_field_context(form["my_date"])
+        assert context["widget_input_type"] == "date"
+
+    def test_validation_does_not_configure(self):
+        form = DummyLazyForm({"my_field1": "foo"})
+        assert not form.is_valid()
+        widget = form.fields["my_field2"].widget
+        assert widget.attrs.get("class") is None
+        assert "aria-invalid" not in widget.attrs
+
+    def test_invalid_options_after_validation(self):
+        form = DummyLazyForm({"my_field1": "foo"})
+        assert not form.is_valid()
+        html = str(form["my_field2"])
+        assert 'class="widget invalid"' in html
+        assert form.fields["my_field2"].widget.attrs == {"class": "widget"}
+
+    def test_invalid_options_before_validation(self):
+        form = DummyLazyForm({"my_field1": "foo"})
+        html = form.as_tapeform()
+        assert 'class="widget invalid"' in html
+        assert form.fields["my_field2"].widget.attrs == {"class": "widget"}
+        assert form.fields["my_date"].widget.attrs == {"class": "widget"}
+
+    def test_same_output_as_eager(self):
+        class DummyEagerForm(DummyLazyForm):
+            lazy_init_tapeforms = False
+
+        data = {"my_field1": "foo", "my_date": "2025-01-01"}
+        assert DummyLazyForm(data).as_tapeform() == DummyEagerForm(data).as_tapeform()
+        assert DummyLazyForm().as_tapeform() == DummyEagerForm().as_tapeform()
+
+    def test_custom_bound_field(self):
+        class DummyLazyBoundFieldForm(DummyLazyForm):
+            my_field1 = DummyBoundFieldCharField()
+
+        form = DummyLazyBoundFieldForm({"my_field1": ""})
+        html = str(form["my_field1"])
+        assert 'class="widget invalid"' in html
+        assert form.fields["my_field2"].widget.attrs.get("class") is None
+
+    def test_init_tapeforms(self):
+        form = DummyLazyForm()
+        form.init_tapeforms()
+        str(form["my_field1"])
+        assert form.fields["my_field1"].widget.attrs["class"] == "my-css widget"
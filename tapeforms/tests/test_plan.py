@@ -0,0 +1,153 @@
+from unittest import mock
+
+from django import forms
+
+from tapeforms.mixins import TapeformMixin
+from tapeforms.plan import RenderPlan, get_render_plan, plan_cached
+
+
+class DummyForm(TapeformMixin, forms.Form):
+    my_field1 = forms.CharField()
+    my_field2 = forms.IntegerField()
+
+
+class DummySubclassForm(DummyForm):
+    pass
+
+
+class DummyDynamicForm(DummyForm):
+    def get_widget_css_class(self, field_name, field):
+        return self.prefix
+
+
+class DummyMarkedForm(DummyForm):
+    @plan_cached
+    def get_widget_css_class(self, field_name, field):
+        return "marked"
+
+
+class DummyCountingForm(DummyForm):
+    lookups = 0
+
+    @plan_cached
+    def get_widget_css_class(self, field_name, field):
+        DummyCountingForm.lookups += 1
+        return "counted"
+
+
+class TestRenderPlan:
+    def test_shared_by_instances(self):
+        plan = DummyForm().get_render_plan()
+        assert isinstance(plan, RenderPlan)
+        assert DummyForm().get_render_plan() is plan
+        assert get_render_plan(DummyForm()) is plan
+
+    def test_per_class(self):
+        assert DummySubclassForm().get_render_plan() is not DummyForm().get_render_plan()
+        assert DummySubclassForm().get_render_plan().form_class is DummySubclassForm
+
+    def test_lookups_cached(self):
+        form1 = DummyCountingForm()
+        form2 = DummyCountingForm()
+        assert DummyCountingForm.lookups == 2
+        assert form1.fields["my_field1"].widget.attrs["class"] == "counted"
+        assert form2.fields["my_field2"].widget.attrs["class"] == "counted"
+
+    def test_rebuilt_on_class_change(self):
+        plan = DummySubclassForm().get_render_plan()
+        with mock.patch.object(DummySubclassForm, "widget_css_class", "changed"):
+            form = DummySubclassForm()
+            assert form.get_render_plan() is not plan
+            assert form.fields["my_field1"].widget.attrs["class"] == "changed"
+
+    def test_instance_override(self):
+        plan = DummyForm().get_render_plan()
+        form = DummyForm()
+        form.field_template = "instance-template.html"
+        assert form.get_render_plan() is not plan
+        assert form.get_render_plan().get_field_template(form, form["my_field1"]) == (
+            "instance-template.html"
+        )
+        assert DummyForm().get_render_plan() is plan
+
+    def test_dynamic_override_wins(self):
+        form = DummyDynamicForm(prefix="first")
+        assert form.fields["my_field1"].widget.attrs["class"] == "first"
+        form = DummyDynamicForm(prefix="second")
+        assert form.fields["my_field1"].widget.attrs["class"] == "second"
+
+    def test_marked_override_cached(self):
+        form = DummyMarkedForm()
+        assert form.fields["my_field1"].widget.attrs["class"] == "marked"
+        assert ("get_widget_css_class", "my_field1", forms.CharField, forms.TextInput) in (
+            form.get_render_plan().entries
+        )
+
+    def test_field_label_css_class_error_state(self):
+        class DummyInvalidLabelForm(DummyForm):
+            field_label_invalid_css_class = "invalid"
+
+        form = DummyInvalidLabelForm()
+        plan = form.get_render_plan()
+        assert plan.get_field_label_css_class(form, form["my_field1"]) is None
+
+        form = DummyInvalidLabelForm({})
+        assert plan.get_field_label_css_class(form, form["my_field1"]) == "invalid"
+
+
+class TestGetClassOverride:
+    def test_exact_class(self):
+        form = DummyForm()
+        form.field_template_overrides = {forms.CharField: "char.html"}
+        plan = form.get_render_plan()
+        assert plan.get_class_override(form, "field_template_overrides", forms.CharField) == (
+            "char.html"
+        )
+
+    def test_base_class(self):
+        form = DummyForm()
+        form.widget_template_overrides = {forms.RadioSelect: "radio.html"}
+        plan = form.get_render_plan()
+        assert (
+            plan.get_class_override(
+                form, "widget_template_overrides", forms.CheckboxSelectMultiple
+            )
+            == "radio.html"
+        )
+        assert plan.get_class_override(form, "widget_template_overrides", forms.Select) is None
+
+    def test_closest_base_class(self):
+        form = DummyForm()
+        form.field_template_overrides = {
+            forms.Field: "field.html",
+            forms.CharField: "char.html",
+        }
+        plan = form.get_render_plan()
+        assert plan.get_class_override(form, "field_template_overrides", forms.EmailField) == (
+            "char.html"
+        )
+
+    def test_none_stops_lookup(self):
+        form = DummyForm()
+        form.widget_template_overrides = {
+            forms.SplitDateTimeWidget: "split.html",
+            forms.SplitHiddenDateTimeWidget: None,
+        }
+        plan = form.get_render_plan()
+        assert (
+            plan.get_class_override(
+                form, "widget_template_overrides", forms.SplitHiddenDateTimeWidget
+            )
+            is None
+        )
+
+    def test_memoized(self):
+        class DummyOverridesForm(DummyForm):
+            field_template_overrides = {forms.CharField: "char.html"}
+
+        form = DummyOverridesForm()
+        plan = form.get_render_plan()
+        plan.get_class_override(form, "field_template_overrides", forms.EmailField)
+        assert plan.entries[
+            ("get_class_override", "field_template_overrides", forms.EmailField)
+        ] == ("char.html")
@@ -0,0 +1,96 @@
+from unittest import mock
+
+import pytest
+from django import forms
+from django.http import StreamingHttpResponse
+
+from tapeforms.contrib.bootstrap import Bootstrap5TapeformMixin
+from tapeforms.fieldsets import TapeformFieldsetsMixin
+from tapeforms.formsets import TapeformFormsetMixin
+from tapeforms.mixins import TapeformMixin
+from tapeforms.streaming import FIELD_MARKER, iter_layout
+
+
+class DummyForm(TapeformFieldsetsMixin, TapeformMixin, forms.Form):
+    my_hidden = forms.CharField(widget=forms.HiddenInput)
+    my_field1 = forms.CharField()
+    my_field2 = forms.CharField()
+    my_field3 = forms.BooleanField()
+
+    fieldsets = [
+        {"fields": (("my_field1", "my_field2"),), "title": "First"},
+        {"exclude": ("my_field1", "my_field2")},
+    ]
+
+    def clean(self):
+        raise forms.ValidationError("Non field error!")
+
+
+class DummyBootstrapForm(Bootstrap5TapeformMixin, DummyForm):
+    single_pass_rendering = True
+
+
+class DummyFieldsetsLayoutForm(DummyForm):
+    layout_template = "fieldsets-layout.html"
+
+
+class DummyFormSet(TapeformFormsetMixin, forms.BaseFormSet):
+    pass
+
+
+class TestIterTapeform:
+    @pytest.mark.parametrize("form_class", [DummyForm, DummyBootstrapForm])
+    @pytest.mark.parametrize("data", [None, {"my_field1": "foo"}])
+    def test_form_output(self, form_class, data):
+        form = form_class(data)
+        chunks = list(form.iter_tapeform())
+        assert "".join(chunks) == form_class(data).as_tapeform()
+        assert FIELD_MARKER not in "".join(chunks)
+        assert len(chunks) >= len(form.visible_fields())
+
+    @pytest.mark.parametrize("form_class", [DummyForm, DummyBootstrapForm])
+    def test_fieldset_output(self, form_class):
+        fieldsets = zip(form_class({}).get_fieldsets(), form_class({}).get_fieldsets())
+        for fieldset, other_fieldset in fieldsets:
+            assert "".join(fieldset.iter_tapeform()) == other_fieldset.as_tapeform()
+
+    def test_fieldsets_layout(self):
+        chunks = list(DummyFieldsetsLayoutForm().iter_tapeform())
+        assert "".join(chunks) == DummyFieldsetsLayoutForm().as_tapeform()
+        assert FIELD_MARKER not in "".join(chunks)
+        assert len(chunks) > len(DummyFieldsetsLayoutForm().visible_fields())
+
+    def test_formset(self):
+        formset_class = forms.formset_factory(DummyForm, formset=DummyFormSet, extra=50)
+        chunks = list(formset_class().iter_tapeform())
+        assert "".join(chunks) == formset_class().as_tapeform()
+        assert len(chunks) > 50 * 3
+
+    def test_nested_forms_rendered_lazily(self):
+        formset_class = forms.formset_factory(DummyForm, formset=DummyFormSet, extra=2)
+        with mock.patch(
+            "tapeforms.templatetags.tapeforms.render_to_string", return_value="field"
+        ) as render_mock:
+            chunks = formset_class().iter_tapeform()
+            assert 'name="form-TOTAL_FORMS"' in next(chunks)
+            assert render_mock.call_count == 0
+
+    def test_fields_rendered_lazily(self):
+        form = DummyForm()
+        with mock.patch(
+            "tapeforms.templatetags.tapeforms.render_to_string", return_value="field"
+        ) as render_mock:
+            chunks = form.iter_tapeform()
+            assert "my_hidden" in next(chunks)
+            assert render_mock.call_count == 0
+            assert next(chunks) == "field"
+            assert render_mock.call_count == 1
+
+    def test_streaming_http_response(self):
+        response = StreamingHttpResponse(DummyForm().iter_tapeform())
+        assert b"".join(response.streaming_content).decode() == DummyForm().as_tapeform()
+
+    def test_iter_layout_without_fields(self):
+        chunks = list(iter_layout("tapeforms/includes/errorlist.html", {"errors": ["Foo"]}))
+        assert len(chunks) == 1
+        assert "<li>Foo</li>" in chunks[0]
@@ -4,6 +4,9 @@ import pytest
 from django import forms
 from django.template import Context, Template, TemplateSyntaxError
 
+from tapeforms.contrib.bootstrap import Bootstrap5TapeformMixin
+from tapeforms.contrib.foundation import FoundationTapeformMixin
+from tapeforms.fieldsets import TapeformFieldsetsMixin
 from tapeforms.mixins import TapeformMixin
 
 
@@ -11,6 +14,35 @@ class DummyForm(TapeformMixin, forms.Form):
     my_field1 = forms.CharField()
 
 
+class DummyFullForm(TapeformFieldsetsMixin, TapeformMixin, forms.Form):
+    my_hidden = forms.CharField(widget=forms.HiddenInput)
+    my_field1 = forms.CharField(help_text="Some <b>help</b>")
+    my_field2 = forms.BooleanField()
+    my_field3 = forms.MultipleChoiceField(
+        choices=(("foo", "Foo"), ("bar", "Bar")), widget=forms.CheckboxSelectMultiple
+    )
+    my_field4 = forms.SplitDateTimeField(required=False)
+
+    fieldsets = [
+        {"fields": ("my_field1", ("my_field2", "my_field3")), "title": "First"},
+        {"exclude": ("my_field1", "my_field2", "my_field3")},
+    ]
+
+    def clean(self):
+        raise forms.ValidationError("Non field error!")
+
+
+class DummyBootstrapForm(Bootstrap5TapeformMixin, DummyFullForm):
+    pass
+
+
+class DummyFoundationForm(FoundationTapeformMixin, DummyFullForm):
+    pass
+
+
+FULL_FORM_CLASSES = [DummyFullForm, DummyBootstrapForm, DummyFoundationForm]
+
+
 class TestFormTag:
     @mock.patch("tapeforms.templatetags.tapeforms.render_to_string")
     def test_render(self, render_mock):
@@ -53,6 +85,36 @@ class TestFormTag:
         )
 
 
+class TestSinglePassRendering:
+    def render(self, form_class, single_pass, data=None):
+        form = type(form_class.__name__, (form_class,), {"single_pass_rendering": single_pass})(
+            data
+        )
+        template = Template(
+            "{% load tapeforms %}{% form form %}"
+            "{% for fieldset in form.get_fieldsets %}{% form fieldset %}{% endfor %}"
+        )
+        return template.render(Context({"form": form}))
+
+    @pytest.mark.parametrize("form_class", FULL_FORM_CLASSES)
+    @pytest.mark.parametrize("data", [None, {"my_field1": "<foo>"}])
+    def test_output_identical(self, form_class, data):
+        assert self.render(form_class, True, data) == self.render(form_class, False, data)
+
+    @mock.patch("tapeforms.templatetags.tapeforms.render_to_string")
+    def test_no_nested_render(self, render_mock):
+        output = self.render(DummyFullForm, True)
+        assert render_mock.call_count == 0
+        assert "form-field-my_field1" in output
+
+    def test_context_popped(self):
+        form = type("DummySinglePassForm", (DummyForm,), {"single_pass_rendering": True})()
+        template = Template(
+            "{% load tapeforms %}{% formfield form.my_field1 %}[{{ field_name }}{{ errors }}]"
+        )
+        assert template.render(Context({"form": form})).endswith("[]")
+
+
 class TestFormfieldTag:
     @mock.patch("tapeforms.templatetags.tapeforms.render_to_string")
     def test_render(self, render_mock):
@@ -0,0 +1,133 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django import forms
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory, override_settings
+
+from tapeforms.fieldsets import TapeformFieldsetsMixin
+from tapeforms.mixins import TapeformMixin
+from tapeforms.tokens import (
+    aiter_fill_placeholders,
+    csrf_input_placeholder,
+    fill_placeholders,
+    get_placeholder,
+    get_token_value,
+    iter_fill_placeholders,
+    register_token,
+    token_registry,
+)
+
+
+@pytest.fixture
+def request_token():
+    register_token("request_token", lambda request: "<token>")
+    yield
+    del token_registry["request_token"]
+
+
+class DummyForm(TapeformFieldsetsMixin, TapeformMixin, forms.Form):
+    csrf_token_placeholder = True
+
+    my_field1 = forms.CharField()
+    my_field2 = forms.CharField(widget=forms.HiddenInput)
+
+    fieldsets = [
+        {"fields": ("my_field1",)},
+        {"exclude": ("my_field1",)},
+    ]
+
+
+class TestPlaceholders:
+    def test_get_placeholder(self):
+        placeholder = get_placeholder("csrf_token")
+        assert placeholder.startswith("tapeforms-token-csrf_token-")
+        assert get_placeholder("csrf_token") == placeholder
+
+    def test_get_placeholder_secret_key(self):
+        placeholder = get_placeholder("csrf_token")
+        with override_settings(SECRET_KEY="other"):
+            assert get_placeholder("csrf_token") != placeholder
+        assert get_placeholder("csrf_token") == placeholder
+
+    def test_get_placeholder_unknown(self):
+        with pytest.raises(ImproperlyConfigured):
+            get_placeholder("unknown")
+
+    def test_csrf_input_placeholder(self):
+        assert csrf_input_placeholder() == (
+            '<input type="hidden" name="csrfmiddlewaretoken" '
+            f'value="{get_placeholder("csrf_token")}">'
+        )
+
+    def test_get_token_value(self, request_token):
+        request = RequestFactory().get("/")
+        assert get_token_value("request_token", request) == "&lt;token&gt;"
+        token_registry["request_token"] = lambda request: "changed"
+        assert get_token_value("request_token", request) == "&lt;token&gt;"
+
+
+class TestFillPlaceholders:
+    def test_str(self, request_token):
+        content = f"<p>{get_placeholder('request_token')}</p>"
+        assert fill_placeholders(content, RequestFactory().get("/")) == "<p>&lt;token&gt;</p>"
+
+    def test_bytes(self, request_token):
+        content = f"<p>{get_placeholder('request_token')}</p>".encode()
+        assert fill_placeholders(content, RequestFactory().get("/")) == (
+            b"<p>&lt;token&gt;</p>"
+        )
+
+    def test_lazy_values(self):
+        request = RequestFactory().get("/")
+        assert fill_placeholders("<p></p>", request) == "<p></p>"
+        assert "CSRF_COOKIE" not in request.META
+
+    def test_csrf_token(self):
+        request = RequestFactory().get("/")
+        content = fill_placeholders(csrf_input_placeholder(), request)
+        assert "tapeforms-token" not in content
+        assert request.META["CSRF_COOKIE"]
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+    def test_iter_chunks(self, request_token, chunk_size):
+        content = f"<p>{get_placeholder('request_token')}</p>" * 3
+        chunks = [content[i : i + chunk_size] for i in range(0, len(content), chunk_size)]
+        result = "".join(iter_fill_placeholders(chunks, RequestFactory().get("/")))
+        assert result == "<p>&lt;token&gt;</p>" * 3
+
+    def test_aiter_chunks(self, request_token):
+        content = f"<p>{get_placeholder('request_token')}</p>".encode()
+
+        async def chunks():
+            for i in range(0, len(content), 5):
+                yield content[i : i + 5]
+
+        async def collect():
+            return [chunk async for chunk in aiter_fill_placeholders(chunks(), request)]
+
+        request = RequestFactory().get("/")
+        assert b"".join(async_to_sync(collect)()) == b"<p>&lt;token&gt;</p>"
+
+
+class TestFormTokenPlaceholders:
+    def test_get_token_placeholders(self):
+        assert DummyForm().get_token_placeholders() == (csrf_input_placeholder(),)
+
+    def test_get_token_placeholders_disabled(self):
+        form = DummyForm()
+        form.csrf_token_placeholder = False
+        assert form.get_token_placeholders() == ()
+        assert form.get_layout_context()["hidden_fields"] == form.hidden_fields()
+
+    def test_layout_context(self):
+        form = DummyForm()
+        hidden_fields = form.get_layout_context()["hidden_fields"]
+        assert hidden_fields == [form["my_field2"], csrf_input_placeholder()]
+
+    def test_as_tapeform(self):
+        assert csrf_input_placeholder() in DummyForm().as_tapeform()
+
+    def test_fieldsets(self):
+        fieldsets = list(DummyForm().get_fieldsets())
+        assert csrf_input_placeholder() in fieldsets[0].as_tapeform()
+        assert csrf_input_placeholder() not in fieldsets[1].as_tapeform()
@@ -1,4 +1,6 @@
-from tapeforms.utils import join_css_class
+from django.test import override_settings
+
+from tapeforms.utils import LRUCache, join_css_class
 
 
 class TestJoinCssClass:
@@ -14,6 +16,16 @@ class TestJoinCssClass:
         assert join_css_class("cls1", "cls1") == "cls1"
         assert sorted(join_css_class("cls1", "cls2", "cls1").split(" ")) == ["cls1", "cls2"]
 
+    def test_order_preserved(self):
+        assert join_css_class("cls2", "cls1 cls3", "cls2") == "cls2 cls1 cls3"
+        assert join_css_class("cls3  cls1", "cls2") == "cls3 cls1 cls2"
+
+    def test_memoized(self):
+        join_css_class.cache_clear()
+        join_css_class("cls1", "cls2")
+        join_css_class("cls1", "cls2")
+        assert join_css_class.cache_info().hits == 1
+
     def test_join_multiple(self):
         assert sorted(join_css_class("cls1", "cls2 cls3").split(" ")) == [
             "cls1",
@@ -21,3 +33,49 @@ class TestJoinCssClass:
             "cls3",
         ]
         assert sorted(join_css_class("cls1", "cls1 cls2").split(" ")) == ["cls1", "cls2"]
+
+
+class TestLRUCache:
+    def test_get_set(self):
+        cache = LRUCache(maxsize=2)
+        assert cache.get("foo") is None
+        assert cache.get("foo", "default") == "default"
+        cache.set("foo", 1)
+        assert cache.get("foo") == 1
+        assert "foo" in cache
+        assert cache.hits == 1
+        assert cache.misses == 2
+
+    def test_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("foo", 1)
+        cache.set("bar", 2)
+        cache.get("foo")
+        cache.set("baz", 3)
+        assert len(cache) == 2
+        assert "bar" not in cache
+        assert cache.get("foo") == 1
+
+    def test_disabled(self):
+        cache = LRUCache(maxsize=0)
+        cache.set("foo", 1)
+        assert len(cache) == 0
+
+    def test_delete_clear(self):
+        cache = LRUCache()
+        cache.set("foo", 1)
+        cache.set("bar", 2)
+        cache.delete("foo")
+        cache.delete("missing")
+        assert "foo" not in cache
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.hits == cache.misses == 0
+
+    def test_setting(self):
+        cache = LRUCache(maxsize=2, setting="TAPEFORMS_TEST_CACHE_SIZE")
+        assert cache.get_maxsize() == 2
+        with override_settings(TAPEFORMS_TEST_CACHE_SIZE=1):
+            assert cache.get_maxsize() == 2
+            cache.clear()
+            assert cache.get_maxsize() == 1
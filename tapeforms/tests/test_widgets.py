@@ -0,0 +1,188 @@
+import datetime
+
+import pytest
+from django import forms
+from django.template import Context, Template
+from django.utils import translation
+from django.utils.translation import gettext_lazy
+
+from tapeforms import widgets
+from tapeforms.contrib.bootstrap import Bootstrap5TapeformMixin
+from tapeforms.mixins import TapeformMixin
+
+CHOICES = [
+    ("", "---"),
+    (1, "One"),
+    ("two", "Two & <b>more</b>"),
+    ("Group", [("g1", "Group 1"), ("g2", "Group 2")]),
+]
+
+WIDGETS = [
+    (widgets.Select, forms.Select),
+    (widgets.SelectMultiple, forms.SelectMultiple),
+    (widgets.RadioSelect, forms.RadioSelect),
+    (widgets.CheckboxSelectMultiple, forms.CheckboxSelectMultiple),
+]
+
+
+class DummyForm(TapeformMixin, forms.Form):
+    choice = forms.ChoiceField(choices=CHOICES[1:3], widget=widgets.RadioSelect)
+    choices = forms.MultipleChoiceField(
+        choices=CHOICES[1:3], widget=widgets.CheckboxSelectMultiple
+    )
+
+
+class DummyBootstrapForm(Bootstrap5TapeformMixin, DummyForm):
+    pass
+
+
+class DummyDjangoBootstrapForm(Bootstrap5TapeformMixin, forms.Form):
+    choice = forms.ChoiceField(choices=CHOICES[1:3], widget=forms.RadioSelect)
+    choices = forms.MultipleChoiceField(
+        choices=CHOICES[1:3], widget=forms.CheckboxSelectMultiple
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_option_cache():
+    widgets.option_cache.clear()
+    yield
+    widgets.option_cache.clear()
+
+
+class DummyDateForm(Bootstrap5TapeformMixin, forms.Form):
+    date = forms.DateField(widget=widgets.SelectDateWidget(years=range(2020, 2030)))
+
+
+class DummyDjangoDateForm(Bootstrap5TapeformMixin, forms.Form):
+    date = forms.DateField(widget=forms.SelectDateWidget(years=range(2020, 2030)))
+
+
+class TestWidgets:
+    @pytest.mark.parametrize("widget_class, django_widget_class", WIDGETS)
+    @pytest.mark.parametrize("value", [None, "", "1", ["two", "g2"], 1])
+    def test_same_output_as_django(self, widget_class, django_widget_class, value):
+        attrs = {"id": "id_field", "class": "my-css", "disabled": False, "data-x": True}
+        widget = widget_class(attrs=attrs, choices=CHOICES)
+        django_widget = django_widget_class(attrs=attrs, choices=CHOICES)
+        assert widget.render("field", value) == django_widget.render("field", value)
+
+    @pytest.mark.parametrize("widget_class, django_widget_class", WIDGETS)
+    def test_empty_choices(self, widget_class, django_widget_class):
+        assert widget_class().render("field", None) == django_widget_class().render(
+            "field", None
+        )
+
+    def test_selected_values(self):
+        widget = widgets.SelectMultiple(choices=[(str(i), str(i)) for i in range(100)])
+        optgroups = widget.optgroups("field", [str(i) for i in range(0, 100, 2)])
+        selected = [
+            option["value"]
+            for _group, options, _index in optgroups
+            for option in options
+            if option["selected"]
+        ]
+        assert selected == [str(i) for i in range(0, 100, 2)]
+
+    def test_single_selected_value(self):
+        widget = widgets.Select(choices=[("a", "A"), ("a", "Again")])
+        output = widget.render("field", "a")
+        assert output.count("selected") == 1
+
+    def test_bootstrap_same_output_as_django(self):
+        data = {"choice": "two", "choices": ["1"]}
+        assert DummyBootstrapForm(data).as_tapeform() == (
+            DummyDjangoBootstrapForm(data).as_tapeform()
+        )
+
+
+class TestOptionCache:
+    def test_cached(self):
+        widget = widgets.Select(choices=CHOICES)
+        output = widget.render("field", "two")
+        assert len(widgets.option_cache) == 1
+        assert widgets.Select(choices=list(CHOICES)).render("field", "two") == output
+        assert widgets.option_cache.hits == 1
+        assert 'value="two" selected' in output
+
+    def test_rendered_options_context(self):
+        context = widgets.Select(choices=CHOICES).get_context("field", "1", {})
+        assert "rendered_options" in context["widget"]
+        assert "optgroups" not in context["widget"]
+
+    def test_per_widget_class(self):
+        widgets.Select(choices=CHOICES).render("field", "")
+        widgets.SelectMultiple(choices=CHOICES).render("field", "")
+        assert len(widgets.option_cache) == 2
+
+    def test_per_language(self):
+        widget = widgets.Select(choices=[("1", gettext_lazy("Yes"))])
+        with translation.override("en"):
+            assert ">Yes<" in widget.render("field", "1")
+        with translation.override("de"):
+            assert ">Ja<" in widget.render("field", "1")
+        assert len(widgets.option_cache) == 2
+
+    def test_dynamic_choices_not_cached(self):
+        widget = widgets.Select(choices=lambda: CHOICES)
+        assert widget.render("field", "1") == forms.Select(choices=CHOICES).render("field", "1")
+        assert len(widgets.option_cache) == 0
+
+    def test_disabled(self):
+        widget = widgets.Select(choices=CHOICES)
+        widget.cache_options = False
+        assert "optgroups" in widget.get_context("field", "1", {})["widget"]
+
+    def test_custom_create_option_not_cached(self):
+        class DummySelect(widgets.Select):
+            def create_option(self, *args, **kwargs):
+                option = super().create_option(*args, **kwargs)
+                option["attrs"]["data-option"] = True
+                return option
+
+        assert "data-option" in DummySelect(choices=CHOICES).render("field", "1")
+        assert len(widgets.option_cache) == 0
+
+    def test_equal_values(self):
+        widgets.Select(choices=[(True, "Yes"), (False, "No")]).render("field", True)
+        output = widgets.Select(choices=[(1, "Yes"), (0, "No")]).render("field", 1)
+        assert output == forms.Select(choices=[(1, "Yes"), (0, "No")]).render("field", 1)
+        assert '<option value="1" selected>Yes</option>' in output
+        widgets.Select(choices=[(1.0, "Yes")]).render("field", 1)
+        assert len(widgets.option_cache) == 3
+
+    def test_equal_labels(self):
+        widgets.Select(choices=[("a", 1)]).render("field", "a")
+        assert ">True<" in widgets.Select(choices=[("a", True)]).render("field", "a")
+
+    def test_unhashable_choices(self):
+        widget = widgets.Select(choices=[(1, {"unhashable"})])
+        django_widget = forms.Select(choices=[(1, {"unhashable"})])
+        assert widget.render("field", "1") == django_widget.render("field", "1")
+
+    @pytest.mark.parametrize("value", [None, "", datetime.date(2024, 2, 29), "2021-13-1"])
+    def test_select_date_widget(self, value):
+        widget = widgets.SelectDateWidget(years=range(2020, 2030))
+        django_widget = forms.SelectDateWidget(years=range(2020, 2030))
+        assert widget.render("date", value) == django_widget.render("date", value)
+        assert len(widgets.option_cache) == 3
+
+    def test_select_date_widget_bootstrap(self):
+        data = {"date_year": "2024", "date_month": "2", "date_day": "31"}
+        assert DummyDateForm(data).as_tapeform() == DummyDjangoDateForm(data).as_tapeform()
+
+
+class TestRenderAttrs:
+    def test_render_attrs(self):
+        assert (
+            widgets.render_attrs(
+                {"id": "my-id", "required": True, "disabled": False, "data-x": '"quoted"'}
+            )
+            == ' id="my-id" required data-x="&quot;quoted&quot;"'
+        )
+
+    def test_widget_attrs_tag(self):
+        template = Template("{% load tapeforms %}<input{% widget_attrs attrs %}>")
+        assert template.render(Context({"attrs": {"class": "a&b", "checked": True}})) == (
+            '<input class="a&amp;b" checked>'
+        )
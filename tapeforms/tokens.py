@@ -0,0 +1,162 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.middleware.csrf import get_token
+from django.utils.crypto import salted_hmac
+from django.utils.html import conditional_escape, format_html
+
+#: Per-request tokens which can be rendered as placeholders, mapping token names
+#: to callables which return the token value for a request.
+token_registry = {"csrf_token": get_token}
+
+_placeholders = {}
+
+
+def register_token(name, get_value):
+    """
+    Registers a per-request token which can be rendered as placeholder.
+
+    :param name: Name of the token, should only contain letters, digits and `_`.
+    :param get_value: Callable which takes the request and returns the token value.
+    """
+    token_registry[name] = get_value
+    _placeholders.pop(name, None)
+
+
+def get_placeholder(name):
+    """
+    Returns the placeholder for a registered token. The placeholder is derived
+    from the `SECRET_KEY` to make it impossible to guess for users submitting data.
+
+    :param name: Name of the registered token.
+    :return: Placeholder string, safe to use in HTML without escaping.
+    """
+    try:
+        return _placeholders[name]
+    except KeyError:
+        pass
+
+    if name not in token_registry:
+        raise ImproperlyConfigured(f"Token `{name}` is not registered.")
+
+    digest = salted_hmac("tapeforms.tokens", name).hexdigest()[:20]
+    placeholder = _placeholders[name] = f"tapeforms-token-{name}-{digest}"
+    return placeholder
+
+
+def hidden_input_placeholder(name, input_name):
+    """
+    Returns a hidden input with the placeholder of a registered token as value.
+
+    :param name: Name of the registered token.
+    :param input_name: Name of the hidden input.
+    :return: Hidden input as HTML.
+    """
+    return format_html(
+        '<input type="hidden" name="{}" value="{}">', input_name, get_placeholder(name)
+    )
+
+
+def csrf_input_placeholder():
+    """
+    Returns the placeholder version of the hidden input rendered by ``{% csrf_token %}``.
+    """
+    return hidden_input_placeholder("csrf_token", "csrfmiddlewaretoken")
+
+
+def get_token_value(name, request):
+    """
+    Returns the escaped value of a registered token for the request. The value is
+    only computed once per request.
+    """
+    values = request.__dict__.setdefault("_tapeforms_tokens", {})
+    try:
+        return values[name]
+    except KeyError:
+        value = values[name] = str(conditional_escape(token_registry[name](request)))
+        return value
+
+
+def stream_token_placeholders(response):
+    """
+    Marks a streaming response to have its placeholders replaced by the
+    `TokenPlaceholderMiddleware`. The content of streaming responses is rendered
+    after the middleware is done, so the values of all registered tokens are
+    computed in advance (e.g. setting the CSRF cookie). Streaming responses which
+    are not marked are left untouched.
+
+    :param response: A ``StreamingHttpResponse`` instance.
+    :return: The passed response.
+    """
+    response.tapeforms_token_placeholders = True
+    return response
+
+
+def fill_placeholders(content, request):
+    """
+    Replaces the placeholders of all registered tokens with the token values for
+    the request. Token values are only computed if their placeholder is found.
+
+    :param content: HTML as ``str`` or UTF-8 encoded ``bytes``.
+    :param request: The current request.
+    :return: Content with token values instead of placeholders.
+    """
+    is_bytes = isinstance(content, bytes)
+    for name in token_registry:
+        placeholder = get_placeholder(name)
+        if is_bytes:
+            placeholder = placeholder.encode()
+
+        if placeholder in content:
+            value = get_token_value(name, request)
+            content = content.replace(placeholder, value.encode() if is_bytes else value)
+
+    return content
+
+
+def _fill_chunk(tail, chunk, request):
+    # Hold back the end of the content, it might be the start of a placeholder.
+    content = fill_placeholders(chunk if tail is None else tail + chunk, request)
+    overlap = max(len(get_placeholder(name)) for name in token_registry) - 1
+    split = max(len(content) - overlap, 0)
+    return content[:split], content[split:]
+
+
+def iter_fill_placeholders(chunks, request):
+    """
+    Replaces the placeholders of all registered tokens in an iterable of chunks,
+    e.g. the content of a streaming response. Placeholders spanning multiple
+    chunks are supported.
+
+    :param chunks: Iterable of ``str`` or ``bytes`` chunks.
+    :param request: The current request.
+    :return: Generator which yields the chunks with token values filled in.
+    """
+    tail = None
+    for chunk in chunks:
+        content, tail = _fill_chunk(tail, chunk, request)
+        if content:
+            yield content
+
+    if tail:
+        yield tail
+
+
+async def aiter_fill_placeholders(chunks, request):
+    """
+    Async version of `iter_fill_placeholders` for async iterables of chunks.
+    """
+    tail = None
+    async for chunk in chunks:
+        content, tail = _fill_chunk(tail, chunk, request)
+        if content:
+            yield content
+
+    if tail:
+        yield tail
+
+
+@receiver(setting_changed)
+def clear_placeholders_on_setting_change(setting, **kwargs):
+    if setting == "SECRET_KEY":
+        _placeholders.clear()
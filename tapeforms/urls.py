@@ -0,0 +1,12 @@
+from django.urls import path
+
+from . import defaults
+from .autocomplete import AutocompleteView
+
+urlpatterns = [
+    path(
+        "<str:source>/",
+        AutocompleteView.as_view(),
+        name=defaults.AUTOCOMPLETE_URL_NAME,
+    ),
+]
@@ -1,12 +1,104 @@
+import functools
+import threading
+from collections import OrderedDict
 from itertools import chain
 
+from django.conf import settings
 
+
+@functools.lru_cache(maxsize=1024)
 def join_css_class(css_class, *additional_css_classes):
     """
     Returns the union of one or more CSS classes as a space-separated string.
-    Note that the order will not be preserved.
+
+    The order of the classes is preserved (first occurrence wins), duplicates are
+    removed. This way, the output is the same in every process. The results are
+    memoized, the arguments have to be strings or `None`.
     """
-    css_set = set(
-        chain.from_iterable(c.split(" ") for c in [css_class, *additional_css_classes] if c)
+    css_classes = dict.fromkeys(
+        chain.from_iterable(c.split() for c in (css_class, *additional_css_classes) if c)
     )
-    return " ".join(css_set)
+    return " ".join(css_classes)
+
+
+class LRUCache:
+    """
+    A thread-safe mapping with a bounded size. When the size limit is reached, the
+    least recently used entries are evicted. The cache counts hits and misses.
+
+    If the name of a Django setting is passed, the size is taken from the setting
+    (on first use and again after `clear`), falling back to `maxsize`.
+
+    The `get` and `set` methods are compatible with Django's cache API.
+    """
+
+    def __init__(self, maxsize=128, setting=None):
+        self.maxsize = maxsize
+        self.setting = setting
+        self.hits = 0
+        self.misses = 0
+        self._setting_maxsize = None
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get_maxsize(self):
+        """
+        Returns the maximum number of entries to keep. A size of 0 disables the cache.
+        """
+        if self.setting is None:
+            return self.maxsize
+
+        if self._setting_maxsize is None:
+            self._setting_maxsize = getattr(settings, self.setting, self.maxsize)
+        return self._setting_maxsize
+
+    def get(self, key, default=None):
+        """
+        Returns the value for `key` and marks the entry as recently used.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, timeout=None):
+        """
+        Stores the value for `key` and evicts the least recently used entries if
+        the size limit is exceeded. The `timeout` argument is ignored.
+        """
+        maxsize = self.get_maxsize()
+        if maxsize <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """
+        Removes all entries and resets the hit and miss counters. The size is read
+        from the setting again.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self._setting_maxsize = None
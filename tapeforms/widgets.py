@@ -0,0 +1,336 @@
+from django import forms
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.forms.widgets import ChoiceWidget
+from django.utils.html import conditional_escape
+from django.utils.safestring import SafeString
+from django.utils.translation import get_language
+
+from . import defaults
+from .fastrender import render_value
+from .utils import LRUCache
+
+
+def render_string(value):
+    """
+    Renders a variable the same way the Django template engine does for
+    ``{{ value|stringformat:'s' }}``.
+    """
+    return conditional_escape(format(value, ""))
+
+
+def render_attrs(attrs):
+    """
+    Python version of ``django/forms/widgets/attrs.html``.
+    """
+    output = []
+    for name, value in attrs.items():
+        if value is False:
+            continue
+
+        output.append(f" {conditional_escape(name)}")
+        if value is not True:
+            output.append(f'="{render_string(value)}"')
+
+    return "".join(output)
+
+
+def render_select_option(option):
+    """
+    Python version of ``django/forms/widgets/select_option.html``.
+    """
+    return (
+        f'<option value="{render_string(option["value"])}"{render_attrs(option["attrs"])}>'
+        f"{render_value(option['label'])}</option>\n"
+    )
+
+
+def render_input_option(option):
+    """
+    Python version of ``django/forms/widgets/input_option.html``.
+    """
+    output = []
+    if option["wrap_label"]:
+        label_id = option["attrs"].get("id")
+        output.append(f'<label for="{render_value(label_id)}">' if label_id else "<label>")
+
+    output.append(
+        f'<input type="{render_value(option["type"])}" name="{render_value(option["name"])}"'
+    )
+    if option["value"] is not None:
+        output.append(f' value="{render_string(option["value"])}"')
+    output.append(f"{render_attrs(option['attrs'])}>\n")
+
+    if option["wrap_label"]:
+        output.append(f" {render_value(option['label'])}</label>")
+
+    output.append("\n")
+    return "".join(output)
+
+
+def render_select_options(optgroups):
+    """
+    Renders the options of a select widget like ``django/forms/widgets/select.html``
+    without including a template per option.
+    """
+    output = []
+    for group_name, options, _index in optgroups:
+        if group_name:
+            output.append(f'\n  <optgroup label="{render_value(group_name)}">')
+        for option in options:
+            output.append(f"\n  {render_select_option(option)}")
+        if group_name:
+            output.append("\n  </optgroup>")
+
+    return SafeString("".join(output))
+
+
+def render_input_options(optgroups):
+    """
+    Renders the options of a multiple input widget like
+    ``django/forms/widgets/multiple_input.html`` without including a template per
+    option.
+    """
+    output = []
+    for group_name, options, _index in optgroups:
+        if group_name:
+            output.append(f"\n  <div><label>{render_value(group_name)}</label>")
+        for option in options:
+            # The radio and checkbox option templates include the input option
+            # template and add another line break.
+            output.append(f"<div>\n    {render_input_option(option)}\n</div>")
+        if group_name:
+            output.append("\n  </div>")
+
+    return SafeString("".join(output))
+
+
+def render_widget_options(widget):
+    """
+    Renders the options of a choice widget without including a template per option.
+    Options of select widgets are rendered using `render_select_options`, options of
+    other choice widgets using `render_input_options`.
+
+    :param widget: The widget context as returned by ``get_context``.
+    :return: Rendered options as HTML.
+    """
+    if "rendered_options" in widget:
+        return widget["rendered_options"]
+
+    optgroups = widget["optgroups"]
+    option = next((option for _group, options, _index in optgroups for option in options), None)
+    if option is not None and option["type"] == "select":
+        return render_select_options(optgroups)
+
+    return render_input_options(optgroups)
+
+
+#: The in-process option cache.
+option_cache = LRUCache(defaults.OPTION_CACHE_SIZE, setting="TAPEFORMS_OPTION_CACHE_SIZE")
+
+
+def freeze_choices(choices):
+    """
+    Returns the choices as a hashable ``tuple`` to use as a cache key. Values and
+    labels are keyed by their type and ``str``, this way choices which compare equal
+    but render differently (e.g. ``1`` and ``True`` or ``1`` and ``1.0``) don't
+    share a key.
+    """
+    return tuple(
+        (
+            type(value),
+            str(value),
+            freeze_choices(label)
+            if isinstance(label, (list, tuple))
+            else (type(label), str(label)),
+        )
+        for value, label in choices
+    )
+
+
+def compile_select_options(choices):
+    """
+    Compiles the options of a select widget into markup segments, which only miss
+    the ``selected`` attribute. The markup is the same as rendered by
+    `render_select_options` for options without attributes.
+
+    :param choices: Static choices of the widget.
+    :return: Tuple of the segments and the trailing markup. Every segment is a tuple
+             of the markup before the ``selected`` attribute, the option value as
+             ``str`` and the markup after the ``selected`` attribute.
+    """
+    segments = []
+    # Markup which is added before the next option (or at the end).
+    pending = []
+    for option_value, option_label in choices:
+        if option_value is None:
+            option_value = ""
+
+        if not isinstance(option_label, (list, tuple)):
+            pending.append(f'\n  <option value="{render_string(option_value)}"')
+            segments.append(
+                (
+                    "".join(pending),
+                    str(option_value),
+                    f">{render_value(option_label)}</option>\n",
+                )
+            )
+            pending = []
+            continue
+
+        if option_value:
+            pending.append(f'\n  <optgroup label="{render_value(option_value)}">')
+        for value, label in option_label:
+            pending.append(f'\n  <option value="{render_string(value)}"')
+            segments.append(
+                ("".join(pending), str(value), f">{render_value(label)}</option>\n")
+            )
+            pending = []
+        if option_value:
+            pending.append("\n  </optgroup>")
+
+    return tuple(segments), "".join(pending)
+
+
+def get_compiled_select_options(widget):
+    """
+    Returns the compiled options (see `compile_select_options`) of the passed select
+    widget from the option cache. The options are cached per widget class, choices
+    and active language.
+
+    :param widget: Select widget with static choices (a ``list``).
+    :return: The compiled options or `None` if the choices can't be cached.
+    """
+    try:
+        cache_key = (widget.__class__, freeze_choices(widget.choices), get_language())
+        compiled = option_cache.get(cache_key)
+    except TypeError:
+        # Unhashable choices.
+        return None
+
+    if compiled is None:
+        compiled = compile_select_options(widget.choices)
+        option_cache.set(cache_key, compiled)
+
+    return compiled
+
+
+def render_compiled_select_options(compiled, value, allow_multiple_selected):
+    """
+    Renders compiled options (see `compile_select_options`), marking the options with
+    a value in `value` as selected. Unless `allow_multiple_selected` is set, only the
+    first matching option is selected (like Django does).
+    """
+    segments, tail = compiled
+    selected_values = set(value)
+    has_selected = False
+    output = []
+    for before, option_value, after in segments:
+        output.append(before)
+        if (allow_multiple_selected or not has_selected) and option_value in selected_values:
+            output.append(" selected")
+            has_selected = True
+        output.append(after)
+
+    output.append(tail)
+    return SafeString("".join(output))
+
+
+class IndexedChoiceWidgetMixin:
+    """
+    Mixin for choice widgets which looks up the selected options in a ``set`` of the
+    selected values instead of comparing every option with every selected value.
+    """
+
+    def optgroups(self, name, value, attrs=None):
+        return super().optgroups(name, set(value), attrs)
+
+
+class CachedOptionsSelectMixin(IndexedChoiceWidgetMixin):
+    """
+    Mixin for select widgets which caches the markup of static choices (a ``list``)
+    in the `option_cache`. When rendering, only the selected options are marked. The
+    ``optgroups`` are not part of the widget context in this case.
+
+    Widgets with dynamic choices (e.g. model choices), a customized
+    ``create_option`` method or options inheriting the widget attributes are
+    rendered without the cache.
+    """
+
+    #: Cache the markup of the options if the choices are static.
+    cache_options = True
+
+    def has_cacheable_options(self):
+        return (
+            self.cache_options
+            and isinstance(self.choices, list)
+            and not self.option_inherits_attrs
+            and type(self).create_option is ChoiceWidget.create_option
+        )
+
+    def get_context(self, name, value, attrs):
+        compiled = get_compiled_select_options(self) if self.has_cacheable_options() else None
+        if compiled is None:
+            return super().get_context(name, value, attrs)
+
+        # Skip the ``optgroups`` of `ChoiceWidget.get_context`.
+        context = forms.Widget.get_context(self, name, value, attrs)
+        if self.allow_multiple_selected:
+            context["widget"]["attrs"]["multiple"] = True
+        context["widget"]["rendered_options"] = render_compiled_select_options(
+            compiled, context["widget"]["value"], self.allow_multiple_selected
+        )
+        return context
+
+
+class Select(CachedOptionsSelectMixin, forms.Select):
+    """
+    Select widget which renders the options without including a template per option.
+    The markup of static choices is cached, see `CachedOptionsSelectMixin`.
+    """
+
+    template_name = "tapeforms/widgets/select.html"
+
+
+class SelectMultiple(CachedOptionsSelectMixin, forms.SelectMultiple):
+    """
+    Multiple select widget which renders the options without including a template
+    per option. The markup of static choices is cached, see `CachedOptionsSelectMixin`.
+    """
+
+    template_name = "tapeforms/widgets/select.html"
+
+
+class RadioSelect(IndexedChoiceWidgetMixin, forms.RadioSelect):
+    """
+    Radio select widget which renders the options without including a template per
+    option.
+    """
+
+    template_name = "tapeforms/widgets/multiple_input.html"
+
+
+class CheckboxSelectMultiple(IndexedChoiceWidgetMixin, forms.CheckboxSelectMultiple):
+    """
+    Checkbox select widget which renders the options without including a template
+    per option.
+    """
+
+    template_name = "tapeforms/widgets/multiple_input.html"
+
+
+class SelectDateWidget(forms.SelectDateWidget):
+    """
+    Date widget which renders the year, month and day selects using the tapeforms
+    `Select` widget. This way, the markup of the options is cached.
+    """
+
+    select_widget = Select
+
+
+@receiver(setting_changed)
+def clear_option_cache_on_setting_change(setting, **kwargs):
+    if setting in ("TAPEFORMS_OPTION_CACHE_SIZE", "LANGUAGES", "LANGUAGE_CODE") or (
+        setting.startswith("USE_")
+    ):
+        option_cache.clear()